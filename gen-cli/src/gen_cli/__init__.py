@@ -7,19 +7,31 @@ This package provides tools to build, deploy, and manage Docker images
 for GenSphere pods.
 
 Modules:
-    main: Contains the main CLI entry point.
+    main: Contains the main CLI entry point, which imports command modules on demand.
     build: Handles building and pushing Docker images.
+    build_many: Builds and pushes several projects concurrently.
+    cards: Stores agent cards, queueing the ones that fail in a local outbox.
     deploy: Manages local deployment of containers.
+    proxy: Load-balancing reverse proxy for replicated deployments.
+    warm_pool: Keeps pre-started pod containers ready to hand out.
+    bench: Load-tests a deployed pod.
+    catalog: Lists every repository of the registry with its tags.
     list: Provides commands to list repositories and tags.
+    registry: Helpers for the Docker registry v2 API.
     setup: Handles initial setup of the CLI.
     utils: Contains utility functions used across the CLI.
 
 The CLI supports the following main commands:
     setup: Configure the registry address.
     build: Build and push a Docker image.
+    build-many: Build and push several projects concurrently.
+    flush-cards: Store the agent cards queued by failed registrations.
     list-repositories: List all repositories in the registry.
     list-tags: List tags for a specific repository.
     deploy: Deploy a container locally.
+    warm-pool: Keep pre-started pod containers ready to hand out.
+    bench: Load-test a deployed pod.
+    catalog: List every repository with its tags.
 """
 
 from .main import cli
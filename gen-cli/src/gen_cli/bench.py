@@ -0,0 +1,248 @@
+import datetime
+import json
+import math
+import random
+import threading
+import time
+import click
+import requests
+
+# Words used to fill generated string inputs
+WORDS = ["ai", "agents", "llm", "research", "finance", "jobs", "python", "data",
+         "market", "news", "robotics", "cloud", "security", "health", "energy"]
+
+def generate_payload(expected_inputs, rng):
+    """
+    Generate an /execute payload matching a pod's expected inputs.
+
+    Args:
+        expected_inputs (list): The expected_inputs of the agent card, as name/type dicts
+        rng (random.Random): Random generator, seeded for reproducible runs
+
+    Returns:
+        dict: A value of the declared type for every input
+    """
+    generators = {
+        "str": lambda: " ".join(rng.sample(WORDS, 2)),
+        "int": lambda: rng.randint(1, 100),
+        "float": lambda: round(rng.uniform(0, 100), 2),
+        "bool": lambda: rng.random() < 0.5,
+        "list": lambda: [],
+        "dict": lambda: {},
+    }
+    return {field["name"]: generators.get(field["type"], generators["str"])() for field in expected_inputs}
+
+def load_payloads(path):
+    """
+    Load payloads from a JSON array or a JSON Lines file.
+
+    Raises:
+        click.ClickException: If the file has no payload objects
+    """
+    with open(path, "r") as f:
+        content = f.read().strip()
+    try:
+        payloads = json.loads(content)
+        payloads = payloads if isinstance(payloads, list) else [payloads]
+    except ValueError:
+        payloads = [json.loads(line) for line in content.splitlines() if line.strip()]
+    if not payloads or not all(isinstance(payload, dict) for payload in payloads):
+        raise click.ClickException(f"{path} must contain JSON objects, as an array or one per line")
+    return payloads
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def summarize(latencies, ttfbs, errors, elapsed):
+    """
+    Summarize the measurements of a run.
+
+    Args:
+        latencies (list): Seconds from send (or scheduled send) to the last byte of each successful request
+        ttfbs (list): Seconds from send to the response headers of each successful request
+        errors (dict): Count of failed requests by error
+        elapsed (float): Duration of the run in seconds
+
+    Returns:
+        dict: Counts, throughput, error rate and latency/TTFB percentiles in milliseconds
+    """
+    latencies, ttfbs = sorted(latencies), sorted(ttfbs)
+    total = len(latencies) + sum(errors.values())
+    ms = lambda value: round(value * 1000, 2) if value is not None else None
+    return {
+        "requests": total,
+        "succeeded": len(latencies),
+        "failed": sum(errors.values()),
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1]) if latencies else None,
+        },
+        "ttfb_ms": {
+            "p50": ms(percentile(ttfbs, 50)),
+            "p95": ms(percentile(ttfbs, 95)),
+            "p99": ms(percentile(ttfbs, 99)),
+        },
+    }
+
+def format_report(results, baseline=None):
+    """
+    Format a run as a table, with the change from a baseline run when given.
+    """
+    stats = results["stats"]
+    previous = (baseline or {}).get("stats")
+
+    def row(label, value, previous_value=None, unit=""):
+        text = f"{value}{unit}" if value is not None else "-"
+        if previous_value and value is not None:
+            text += f"  ({(value - previous_value) / previous_value * 100:+.1f}% vs baseline)"
+        return f"  {label:<14} {text}"
+
+    lines = [
+        f"Pod:          {results['url']} ({results['image'] or 'unknown image'})",
+        f"Load:         {results['load']}, {results['duration']}s",
+        row("requests", stats["requests"]),
+        row("failed", stats["failed"], unit=f" ({stats['error_rate'] * 100:.1f}%)"),
+        row("throughput", stats["throughput_rps"], previous and previous["throughput_rps"], " req/s"),
+    ]
+    for metric in ("p50", "p95", "p99"):
+        lines.append(row(f"latency {metric}", stats["latency_ms"][metric], previous and previous["latency_ms"][metric], " ms"))
+    for metric in ("p50", "p95", "p99"):
+        lines.append(row(f"ttfb {metric}", stats["ttfb_ms"][metric], previous and previous["ttfb_ms"][metric], " ms"))
+    for error, count in stats["errors"].items():
+        lines.append(f"  {error}: {count}")
+    return "\n".join(lines)
+
+@click.command()
+@click.option("-u", "--url", default="http://localhost:8000", show_default=True, help="Base URL of the deployed pod (or of a deploy --replicas proxy)")
+@click.option("-c", "--concurrency", default=4, show_default=True, type=click.IntRange(min=1), help="Requests in flight at once")
+@click.option("--rate", type=click.FloatRange(min=0, min_open=True), help="Send requests at this fixed rate per second instead of as fast as the concurrency allows")
+@click.option("-d", "--duration", default=30.0, show_default=True, type=click.FloatRange(min=0, min_open=True), help="Seconds to send requests for")
+@click.option("--inputs", "inputs_path", type=click.Path(exists=True, dir_okay=False), help="JSON array or JSON Lines file of /execute payloads, used in turn")
+@click.option("--seed", default=0, show_default=True, help="Seed of the generated payloads")
+@click.option("--timeout", default=600.0, show_default=True, type=click.FloatRange(min=0, min_open=True), help="Seconds to wait for each response")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, writable=True), help="Write the results as JSON to this file")
+@click.option("--compare", "baseline_path", type=click.Path(exists=True, dir_okay=False), help="JSON results of a previous run to compare with")
+@click.option("--json", "as_json", is_flag=True, help="Print the results as JSON instead of a table")
+@click.pass_context
+def bench(ctx, url, concurrency, rate, duration, inputs_path, seed, timeout, output, baseline_path, as_json):
+    """
+    Load-test a deployed pod's /execute endpoint.
+
+    The pod's /agent_card is read to learn its expected inputs, and payloads are generated
+    for them unless --inputs provides some. Requests are sent for --duration seconds, either
+    with --concurrency requests always in flight (closed loop) or at a fixed --rate with at
+    most --concurrency in flight (open loop; latency then counts from the scheduled send
+    time, so queueing behind a saturated pod shows up in the percentiles).
+
+    Reports throughput, error rate, p50/p95/p99 latency and time to first byte.
+    """
+    url = url.rstrip("/")
+    try:
+        response = requests.get(f"{url}/agent_card", timeout=10)
+        response.raise_for_status()
+        card = response.json()
+    except (requests.RequestException, ValueError) as e:
+        click.echo(f"Error reading {url}/agent_card: {str(e)}", err=True)
+        ctx.exit(1)
+
+    if inputs_path:
+        payloads = load_payloads(inputs_path)
+    else:
+        rng = random.Random(seed)
+        payloads = [generate_payload(card.get("expected_inputs") or [], rng) for _ in range(100)]
+
+    image = f"{card['image']}:{card.get('tag', 'latest')}" if card.get("image") else None
+    load = f"rate {rate:g}/s (max {concurrency} in flight)" if rate else f"concurrency {concurrency}"
+    if not as_json:
+        click.echo(f"Benchmarking {url}/execute ({image or 'unknown image'}) for {duration:g}s at {load}")
+        click.echo(f"Example payload: {json.dumps(payloads[0])}")
+
+    lock = threading.Lock()
+    latencies, ttfbs, errors = [], [], {}
+    counter = [0]
+    started = time.monotonic()
+    deadline = started + duration
+
+    def next_request():
+        # Hand out request numbers and, at a fixed rate, their scheduled send times
+        with lock:
+            index = counter[0]
+            counter[0] += 1
+        scheduled = started + index / rate if rate else time.monotonic()
+        return index, scheduled
+
+    def worker():
+        session = requests.Session()
+        while True:
+            index, scheduled = next_request()
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            sent = time.monotonic()
+            try:
+                response = session.post(f"{url}/execute", json=payloads[index % len(payloads)], stream=True, timeout=timeout)
+                first_byte = time.monotonic()
+                response.content  # Read the whole body
+                finished = time.monotonic()
+                error = None if response.ok else f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                error = type(e).__name__
+            with lock:
+                if error:
+                    errors[error] = errors.get(error, 0) + 1
+                else:
+                    latencies.append(finished - (scheduled if rate else sent))
+                    ttfbs.append(first_byte - sent)
+        session.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        click.echo("Interrupted, reporting the requests completed so far", err=True)
+        deadline = 0
+    elapsed = time.monotonic() - started
+
+    with lock:
+        stats = summarize(latencies, ttfbs, dict(errors), elapsed)
+    results = {
+        "url": url,
+        "image": image,
+        "load": load,
+        "concurrency": concurrency,
+        "rate": rate,
+        "duration": round(elapsed, 3),
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "stats": stats,
+    }
+
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+    else:
+        click.echo(format_report(results, baseline))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        if not as_json:
+            click.echo(f"Results written to {output}")
@@ -3,90 +3,502 @@ import click
 import docker
 import yaml
 import requests
-from .utils import create_dockerfile
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from .utils import (DOCKERFILE_TEMPLATES, create_dockerfile, write_dockerignore, merge_dockerignore, list_context_files,
+                    create_context_archive, compute_context_hash, format_size, get_api_url)
+from .registry import get_image_labels, tag_manifest
+from .cards import register_card, is_rejected, queue_card
 import datetime
 import json
 
+CONTENT_HASH_LABEL = "org.gensphere.content-hash"
+
 @click.command()
 @click.option("-p", "--project-path", required=True, type=click.Path(exists=True), help="Path to the FastAPI project")
 @click.option("-r", "--repository", required=True, help="Repository name")
 @click.option("-i", "--image", required=True, help="Image name")
 @click.option("-t", "--tag", required=True, help="Image tag")
+@click.option("--skip-unchanged", is_flag=True, help="Skip the build and push if the registry image was built from identical content")
+@click.option("--no-cache", is_flag=True, help="Build without reusing cached layers")
+@click.option("--dry-run", is_flag=True, help="Show the build context that would be sent, without building")
+@click.option("--template", type=click.Choice(list(DOCKERFILE_TEMPLATES)), default="standard", show_default=True, help="Dockerfile template to build with")
+@click.option("--compare-templates", is_flag=True, help="Build the image locally with every template and compare size and build time, without pushing")
+@click.option("--extra-tag", "extra_tags", multiple=True, help="Also tag and push the image under this tag (repeatable)")
+@click.option("--api-url", help="Base URL of the agent card API (default: from setup, or port 8000 of the registry host)")
 @click.pass_context
-def build(ctx, project_path, repository, image, tag):
+def build(ctx, project_path, repository, image, tag, skip_unchanged, no_cache, dry_run, template, compare_templates, extra_tags, api_url):
     """
     Build and push a Docker image to the private registry and store agent card in MongoDB.
 
     This command creates a Dockerfile, builds a Docker image with the specified parameters,
     pushes it to the configured private registry, and stores the agent card in MongoDB.
+
+    Every image is labelled with a hash of its build context. With --skip-unchanged, the
+    build and push are skipped when the image already in the registry carries the same hash.
+
+    Only the files not excluded by the project's .dockerignore are sent to Docker; the
+    .dockerignore is created, or completed with gen-cli's defaults, before each build.
+    With --dry-run, the files that would be sent are listed and nothing is built.
+
+    The slim template builds dependency wheels in a separate stage and installs them in a
+    runtime image without compilers; it needs the docker CLI with BuildKit.
+
+    The image is pushed under --tag and every --extra-tag concurrently. The push report
+    lists each layer as uploaded, already in the registry, or mounted from another
+    repository, with the bytes uploaded and the push throughput. When the build is skipped
+    as unchanged, the extra tags are added in the registry without pushing.
+
+    The agent card is stored as soon as the image is pushed, while the extra tags are
+    still pushing, with one retry. If the API still can't be reached, the card is queued locally and the build succeeds; run
+    'gen-cli flush-cards' to store the queued cards later.
     """
     registry_address = ctx.obj['registry_address']
-    client = docker.from_env(timeout=600)
+    if dry_run and compare_templates:
+        raise click.UsageError("--dry-run can't be combined with --compare-templates, which builds every template")
+    # A dry run only reads the project, so it works without a Docker daemon
+    client = None if dry_run else docker.from_env(timeout=600)
     
     try:
-        # Load agent_card.yml
-        agent_card_path = os.path.join(project_path, "agent_card.yml")
-        if not os.path.exists(agent_card_path):
-            raise click.ClickException("agent_card.yml not found in the project root.")
-        
-        click.echo("Loading agent_card.yml...")
-        with open(agent_card_path, 'r') as f:
-            agent_card = yaml.safe_load(f)
-        click.echo("agent_card.yml loaded successfully.")
-        
-        # Create Dockerfile
-        dockerfile_path = create_dockerfile(project_path)
-
-        image_tag = f"{registry_address}/{repository}/{image}:{tag}"
-        build_date = datetime.datetime.now(datetime.UTC).isoformat()
-        
-        # Prepare custom labels
-        labels = {
-            "org.gensphere.img-full-tag": image_tag,
-            "org.gensphere.build-date": build_date
-        }
-        
-        # Build image
-        click.echo(f"Building image: {image_tag}")
-        image, _ = client.images.build(
-            path=project_path,
-            dockerfile=dockerfile_path,
-            tag=image_tag,
-            labels=labels,
-            nocache=True
-        )
-        
-        # Push image to registry
-        click.echo(f"Pushing image: {image_tag}")
-        push_output = client.images.push(image_tag, stream=True, decode=True)
-        for line in push_output:
-            if 'error' in line:
-                raise Exception(f"Push error: {line['error']}")
-        
-        # Store agent card in MongoDB
-        api_url = f"http://{registry_address.split(':')[0]}:8000/agent_card"
-        
-        payload = {
-            "image_full_tag": image_tag,
-            "agent_card": agent_card.get("agent_card", {}),
-            "expected_inputs": agent_card.get("expected_inputs", {}),
-            "expected_output": agent_card.get("expected_output", {}),
-            "build_date": build_date
-        }
-        
-        click.echo("Preparing to store agent card in MongoDB...")
-        click.echo(f"API URL: {api_url}")
-        
-        response = requests.post(api_url, json=payload)
-        click.echo(f"Response content: {response.text}")
-        
-        response.raise_for_status()
-        
-        click.echo(f"Image {image_tag} built and pushed successfully")
-        click.echo("Agent card stored in MongoDB")        
+        if compare_templates:
+            compare_dockerfile_templates(client, project_path, f"{registry_address}/{repository}/{image}:{tag}", no_cache=no_cache)
+            return
+        build_project(client, registry_address, project_path, repository, image, tag,
+                      skip_unchanged=skip_unchanged, no_cache=no_cache, dry_run=dry_run, template=template,
+                      extra_tags=extra_tags, api_url=api_url)
     except requests.exceptions.RequestException as e:
         click.echo(f"Error storing agent card: {str(e)}", err=True)
         ctx.exit(1)
     except Exception as e:
         click.echo(f"Unexpected error: {str(e)}", err=True)
-        ctx.exit(1)
\ No newline at end of file
+        ctx.exit(1)
+
+def build_project(client, registry_address, project_path, repository, image, tag,
+                  skip_unchanged=False, no_cache=False, dry_run=False, template="standard",
+                  extra_tags=(), api_url=None, session=None, echo=click.echo):
+    """
+    Build and push the image of one project and store its agent card.
+
+    Args:
+        client (docker.DockerClient): Docker client to build and push with
+        registry_address (str): Registry host and port
+        project_path (str): Path to the FastAPI project
+        repository (str): Repository name
+        image (str): Image name
+        tag (str): Image tag
+        skip_unchanged (bool): Skip the build and push if the registry image has the same content hash
+        no_cache (bool): Build without reusing cached layers
+        dry_run (bool): Only report the build context, without changing the project or building
+        template (str): Dockerfile template, a key of DOCKERFILE_TEMPLATES
+        extra_tags (iterable): Other tags of the same image to push along with `tag`
+        api_url (str, optional): Base URL of the agent card API, see get_api_url
+        session (requests.Session, optional): Session to reuse connections with
+        echo (callable): Function used to print progress messages
+
+    Returns:
+        dict: The image_tag, build_date, context_size, whether the build was skipped, the
+            push report of push_image (None when skipped), and whether the agent card was
+            "stored" or "queued" in the outbox
+
+    Raises:
+        requests.exceptions.RequestException: If the API rejects the agent card
+        Exception: If the project cannot be built or pushed
+    """
+    # Load agent_card.yml
+    agent_card_path = os.path.join(project_path, "agent_card.yml")
+    if not os.path.exists(agent_card_path):
+        raise click.ClickException("agent_card.yml not found in the project root.")
+    
+    echo("Loading agent_card.yml...")
+    with open(agent_card_path, 'r') as f:
+        agent_card = yaml.safe_load(f)
+    echo("agent_card.yml loaded successfully.")
+    
+    image_tag = f"{registry_address}/{repository}/{image}:{tag}"
+    build_date = datetime.datetime.now(datetime.UTC).isoformat()
+
+    if dry_run:
+        return report_context(project_path, merge_dockerignore(project_path)[0], image_tag, echo)
+
+    # Create Dockerfile and .dockerignore
+    create_dockerfile(project_path, template=template, echo=echo)
+    dockerignore = write_dockerignore(project_path, echo=echo)
+
+    # Hash the build context, which includes the Dockerfile it will be built with
+    context_paths = list_context_files(project_path, dockerignore)
+    context_size = sum(os.lstat(os.path.join(project_path, path)).st_size for path in context_paths
+                       if os.path.isfile(os.path.join(project_path, path)))
+    content_hash = compute_context_hash(project_path, context_paths)
+    echo(f"Build context: {format_size(context_size)}, hash {content_hash}")
+
+    existing_labels = None
+    if skip_unchanged:
+        try:
+            existing_labels = get_image_labels(registry_address, f"{repository}/{image}", tag, session=session)
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            echo(f"Could not check the registry for an existing image, building anyway: {str(e)}")
+
+    skipped = bool(existing_labels) and existing_labels.get(CONTENT_HASH_LABEL) == content_hash
+    if skipped:
+        # Same content already published under this tag: keep its build date
+        build_date = existing_labels.get("org.gensphere.build-date", build_date)
+
+    # The card is only stored once the image is in the registry, so a failed push never
+    # replaces the card of the image already at that tag; a card that can't be stored is queued
+    api_url = get_api_url(registry_address, api_url)
+    payload = {
+        "image_full_tag": image_tag,
+        "agent_card": agent_card.get("agent_card", {}),
+        "expected_inputs": agent_card.get("expected_inputs", {}),
+        "expected_output": agent_card.get("expected_output", {}),
+        "build_date": build_date
+    }
+    card_future = None
+    with ThreadPoolExecutor(max_workers=1) as card_executor:
+        def start_storing_card():
+            nonlocal card_future
+            echo(f"Storing agent card through {api_url}...")
+            card_future = card_executor.submit(store_card, api_url, payload, session=session, echo=echo)
+
+        push = None
+        if skipped:
+            echo(f"Image {image_tag} is up to date (built {build_date}), skipping build and push")
+            start_storing_card()
+            # The image is already in the registry, so extra tags only need its manifest
+            for extra_tag in dict.fromkeys(extra_tags):
+                if extra_tag != tag:
+                    try:
+                        tag_manifest(registry_address, f"{repository}/{image}", tag, extra_tag, session=session)
+                    except requests.exceptions.RequestException as e:
+                        raise Exception(f"Could not tag {image_tag} as {extra_tag}: {str(e)}")
+                    echo(f"Tagged {image_tag} as {extra_tag} in the registry")
+        else:
+            # Prepare custom labels
+            labels = {
+                "org.gensphere.img-full-tag": image_tag,
+                "org.gensphere.build-date": build_date,
+                CONTENT_HASH_LABEL: content_hash
+            }
+
+            # Build image
+            echo(f"Building image: {image_tag}")
+            if template == "standard":
+                build_image(client, project_path, context_paths, image_tag, labels, no_cache=no_cache, echo=echo)
+            else:
+                build_image_with_buildkit(project_path, image_tag, labels, no_cache=no_cache, echo=echo)
+
+            # The card is stored while the extra tags are still pushing
+            push = push_image(client, image_tag, extra_tags=extra_tags, on_pushed=start_storing_card, echo=echo)
+            echo(f"Image {image_tag} built and pushed successfully")
+        card = card_future.result()
+
+    return {"image_tag": image_tag, "build_date": build_date, "context_size": context_size, "skipped": skipped,
+            "push": push, "card": card}
+
+def store_card(api_url, payload, session=None, timeout=5.0, retries=1, echo=click.echo):
+    """
+    Store an agent card, queueing it in the outbox if the API can't be reached.
+
+    The retry budget is kept short, so a down API delays a build by seconds rather than
+    minutes; 'gen-cli flush-cards' stores the queued cards once the API is back.
+
+    Args:
+        api_url (str): Base URL of the agent card API
+        payload (dict): The agent card payload
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each attempt
+        retries (int): Attempts after the first one before the card is queued
+        echo (callable): Function used to print progress messages
+
+    Returns:
+        str: "stored", or "queued" if the card was put in the outbox
+
+    Raises:
+        requests.exceptions.RequestException: If the API rejected the card
+    """
+    try:
+        register_card(api_url, payload, session=session, timeout=timeout, retries=retries)
+    except requests.exceptions.RequestException as e:
+        if is_rejected(e):
+            raise
+        queue_card(api_url, payload, str(e))
+        echo(f"Could not store the agent card ({str(e)}); it was queued, run 'gen-cli flush-cards' to retry")
+        return "queued"
+    echo("Agent card stored in MongoDB")
+    return "stored"
+
+def build_image(client, project_path, context_paths, image_tag, labels, no_cache=False, echo=click.echo):
+    """
+    Build an image from the filtered context tarball with the Docker API.
+
+    Args:
+        client (docker.DockerClient): Docker client to build with
+        project_path (str): Path to the FastAPI project, holding the Dockerfile
+        context_paths (list): Relative paths to send, as returned by list_context_files
+        image_tag (str): Tag of the image to build
+        labels (dict): Labels to set on the image
+        no_cache (bool): Build without reusing cached layers
+        echo (callable): Function used to print progress messages
+
+    Raises:
+        Exception: If the build fails
+    """
+    with create_context_archive(project_path, context_paths) as context:
+        archive_size = os.fstat(context.fileno()).st_size
+        started = time.monotonic()
+        # The daemon reads the whole context before it starts answering
+        output = client.api.build(
+            fileobj=context,
+            custom_context=True,
+            dockerfile="Dockerfile",
+            tag=image_tag,
+            labels=labels,
+            nocache=no_cache,
+            rm=True,
+            decode=True
+        )
+        upload_seconds = time.monotonic() - started
+        echo(f"Sent {format_size(archive_size)} build context in {upload_seconds:.2f}s")
+        for line in output:
+            if 'error' in line:
+                raise Exception(f"Build error: {line['error'].strip()}")
+
+def push_tag(client, image_name, tag):
+    """
+    Push one tag of an image and account for every layer from the push progress.
+
+    Layers the registry already holds are reported as "Layer already exists", and layers
+    it copies from another repository as "Mounted from <repository>"; neither is uploaded.
+
+    Args:
+        client (docker.DockerClient): Docker client to push with
+        image_name (str): Image name including the registry, without a tag
+        tag (str): Tag to push
+
+    Returns:
+        dict: The tag, manifest digest, push seconds, and per-layer status and uploaded bytes
+
+    Raises:
+        Exception: If the push fails
+    """
+    layers = {}
+    digest = None
+    started = time.monotonic()
+    for line in client.api.push(image_name, tag=tag, stream=True, decode=True):
+        if 'error' in line:
+            raise Exception(f"Push error ({tag}): {line['error']}")
+        if 'aux' in line:
+            digest = (line['aux'] or {}).get('Digest') or digest
+        layer_id, status = line.get('id'), line.get('status') or ''
+        if not layer_id or layer_id == tag:
+            continue
+        layer = layers.setdefault(layer_id, {"status": "pending", "bytes": 0})
+        if status == 'Pushing':
+            layer["bytes"] = max(layer["bytes"], (line.get('progressDetail') or {}).get('current') or 0)
+        elif status == 'Pushed':
+            layer["status"] = "pushed"
+        elif status == 'Layer already exists':
+            layer["status"] = "exists"
+        elif status.startswith('Mounted from'):
+            layer["status"] = "mounted"
+            layer["source"] = status[len('Mounted from'):].strip()
+    return {"tag": tag, "digest": digest, "seconds": time.monotonic() - started, "layers": layers}
+
+def push_image(client, image_tag, extra_tags=(), on_pushed=None, echo=click.echo):
+    """
+    Push an image under its tag and any extra tags concurrently, and report every layer.
+
+    The extra tags are first applied locally. The daemon uploads a layer shared by
+    concurrent pushes only once, so extra tags mostly cost a manifest upload each.
+
+    Args:
+        client (docker.DockerClient): Docker client to tag and push with
+        image_tag (str): Full tag of the built image
+        extra_tags (iterable): Other tags to push the same image under
+        on_pushed (callable, optional): Called once the image is in the registry under
+            `image_tag`, while the extra tags may still be pushing
+        echo (callable): Function used to print progress messages
+
+    Returns:
+        dict: The push report of each tag, and the layer count, uploaded bytes, layers
+            skipped by the registry, seconds and throughput over all tags
+
+    Raises:
+        Exception: If a push fails
+    """
+    image_name, tag = image_tag.rsplit(":", 1)
+    tags = [tag] + [extra for extra in dict.fromkeys(extra_tags) if extra != tag]
+    for extra in tags[1:]:
+        client.api.tag(image_tag, image_name, tag=extra)
+
+    echo(f"Pushing image: {image_name} ({', '.join(tags)})")
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(tags)) as executor:
+        futures = [executor.submit(push_tag, client, image_name, t) for t in tags]
+        results = [futures[0].result()]
+        if on_pushed:
+            on_pushed()
+        results += [future.result() for future in futures[1:]]
+    seconds = time.monotonic() - started
+
+    # A layer counts as uploaded if any tag's push sent it
+    layers = {}
+    for result in results:
+        for layer_id, layer in result["layers"].items():
+            merged = layers.setdefault(layer_id, {"status": layer["status"], "bytes": 0})
+            if layer["status"] == "pushed" or merged["status"] != "pushed" and layer["status"] == "mounted":
+                merged.update({key: value for key, value in layer.items() if key != "bytes"})
+            merged["bytes"] = max(merged["bytes"], layer["bytes"])
+
+    for layer_id, layer in sorted(layers.items(), key=lambda item: -item[1]["bytes"]):
+        if layer["status"] == "pushed":
+            echo(f"  {layer_id}  pushed {format_size(layer['bytes'])}")
+        elif layer["status"] == "mounted":
+            echo(f"  {layer_id}  mounted from {layer.get('source') or 'another repository'}")
+        else:
+            echo(f"  {layer_id}  {'already exists' if layer['status'] == 'exists' else layer['status']}")
+
+    pushed_bytes = sum(layer["bytes"] for layer in layers.values() if layer["status"] == "pushed")
+    pushed = sum(1 for layer in layers.values() if layer["status"] == "pushed")
+    throughput = pushed_bytes / seconds if seconds else 0.0
+    echo(f"Pushed {len(tags)} tag{'s' if len(tags) > 1 else ''} in {seconds:.1f}s: {pushed} of {len(layers)} layers uploaded "
+         f"({format_size(pushed_bytes)}, {format_size(throughput)}/s), {len(layers) - pushed} already in the registry")
+    for result in results:
+        digest = f" {result['digest']}" if result["digest"] else ""
+        echo(f"  {image_name}:{result['tag']}{digest} ({result['seconds']:.1f}s)")
+    return {
+        "tags": results,
+        "layers": len(layers),
+        "pushed_layers": pushed,
+        "pushed_bytes": pushed_bytes,
+        "skipped_layers": len(layers) - pushed,
+        "seconds": seconds,
+        "throughput": throughput,
+    }
+
+def build_image_with_buildkit(project_path, image_tag, labels, no_cache=False, echo=click.echo):
+    """
+    Build an image with the docker CLI and BuildKit.
+
+    The Docker API used by build_image runs the classic builder, which doesn't support
+    the cache and bind mounts of the slim template. The CLI applies the same .dockerignore.
+
+    Args:
+        project_path (str): Path to the FastAPI project, holding the Dockerfile
+        image_tag (str): Tag of the image to build
+        labels (dict): Labels to set on the image
+        no_cache (bool): Build without reusing cached layers
+        echo (callable): Function used to print progress messages
+
+    Raises:
+        Exception: If the docker CLI is missing or the build fails
+    """
+    command = ["docker", "build", "--progress=plain", "--file", os.path.join(project_path, "Dockerfile"), "--tag", image_tag]
+    for key, value in labels.items():
+        command += ["--label", f"{key}={value}"]
+    if no_cache:
+        command.append("--no-cache")
+    command.append(project_path)
+
+    echo("Building with BuildKit...")
+    try:
+        result = subprocess.run(command, env={**os.environ, "DOCKER_BUILDKIT": "1"}, capture_output=True, text=True)
+    except FileNotFoundError:
+        raise Exception("The slim template needs the docker CLI on the PATH")
+    if result.returncode != 0:
+        output = "\n".join((result.stderr or result.stdout).strip().splitlines()[-20:])
+        raise Exception(f"Build error:\n{output}")
+
+def compare_dockerfile_templates(client, project_path, image_tag, no_cache=False, echo=click.echo):
+    """
+    Build a project locally with every Dockerfile template and compare the results.
+
+    Each template is built under the image tag suffixed with the template name; nothing
+    is pushed or registered, and the project's Dockerfile is left as it was.
+
+    Args:
+        client (docker.DockerClient): Docker client to build and inspect with
+        project_path (str): Path to the FastAPI project
+        image_tag (str): Base tag of the images to build
+        no_cache (bool): Build without reusing cached layers, to compare cold builds
+        echo (callable): Function used to print progress messages
+
+    Returns:
+        list: Dicts with the template, image_tag, size and build seconds of each build
+    """
+    # The comparison overwrites the project's Dockerfile, which is put back afterwards
+    dockerfile_path = os.path.join(project_path, "Dockerfile")
+    original_dockerfile = None
+    if os.path.exists(dockerfile_path):
+        with open(dockerfile_path, "r") as f:
+            original_dockerfile = f.read()
+
+    results = []
+    try:
+        for template in DOCKERFILE_TEMPLATES:
+            template_tag = f"{image_tag}-{template}"
+            create_dockerfile(project_path, template=template, echo=echo)
+            context_paths = list_context_files(project_path, write_dockerignore(project_path, echo=echo))
+
+            echo(f"Building image: {template_tag}")
+            started = time.monotonic()
+            if template == "standard":
+                build_image(client, project_path, context_paths, template_tag, {}, no_cache=no_cache, echo=echo)
+            else:
+                build_image_with_buildkit(project_path, template_tag, {}, no_cache=no_cache, echo=echo)
+            seconds = time.monotonic() - started
+            size = client.images.get(template_tag).attrs["Size"]
+            results.append({"template": template, "image_tag": template_tag, "size": size, "seconds": seconds})
+    finally:
+        if original_dockerfile is None:
+            if os.path.exists(dockerfile_path):
+                os.remove(dockerfile_path)
+        else:
+            with open(dockerfile_path, "w") as f:
+                f.write(original_dockerfile)
+
+    baseline = results[0]
+    echo("")
+    echo(f"{'TEMPLATE':<10}  {'SIZE':>10}  {'BUILD TIME':>10}  IMAGE")
+    for result in results:
+        echo(f"{result['template']:<10}  {format_size(result['size']):>10}  {result['seconds']:>9.1f}s  {result['image_tag']}")
+    for result in results[1:]:
+        size_change = (result["size"] - baseline["size"]) / baseline["size"] * 100
+        time_change = (result["seconds"] - baseline["seconds"]) / baseline["seconds"] * 100
+        echo(f"{result['template']} vs {baseline['template']}: size {size_change:+.0f}%, build time {time_change:+.0f}%")
+    return results
+
+def report_context(project_path, dockerignore, image_tag, echo=click.echo):
+    """
+    Print the files that a build would send as its context, and what is left out.
+
+    Args:
+        project_path (str): Path to the FastAPI project
+        dockerignore (str): Content of the .dockerignore the build would use
+        image_tag (str): Full tag of the image the build would produce
+        echo (callable): Function used to print the report
+
+    Returns:
+        dict: The image_tag, context_size and skipped=True, as build_project returns
+    """
+    context_paths = set(list_context_files(project_path, dockerignore))
+    context_size = 0
+    excluded_size = 0
+    echo(f"Build context for {image_tag}:")
+    for root, dirs, files in os.walk(project_path):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            relative_path = os.path.relpath(path, project_path)
+            size = os.lstat(path).st_size
+            if relative_path in context_paths:
+                context_size += size
+                echo(f"  {format_size(size):>10}  {relative_path}")
+            else:
+                excluded_size += size
+    if "Dockerfile" not in context_paths:
+        echo(f"  {'':>10}  Dockerfile (generated at build time)")
+    echo(f"Context size: {format_size(context_size)} ({format_size(excluded_size)} excluded by .dockerignore)")
+    return {"image_tag": image_tag, "build_date": None, "context_size": context_size, "skipped": True,
+            "push": None, "card": None}
@@ -0,0 +1,209 @@
+import os
+import glob
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import click
+import docker
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+from .build import build_project
+from .utils import DOCKERFILE_TEMPLATES, format_size
+
+def load_manifest(manifest_path):
+    """
+    Load the projects listed in a manifest file.
+
+    The manifest is a YAML (or JSON) file with optional defaults and a list of projects.
+    Each project is either a path or a mapping with a path and optional repository,
+    image, tag and template; relative paths are resolved from the manifest directory:
+
+        defaults:
+          repository: myrepo
+          tag: latest
+        projects:
+          - example_agents/job_researcher
+          - path: example_agents/other_agent
+            image: other-agent
+
+    Args:
+        manifest_path (str): Path to the manifest file
+
+    Returns:
+        list: Project dicts with a path and any repository, image, tag and template overrides
+
+    Raises:
+        click.ClickException: If the manifest is not valid
+    """
+    with open(manifest_path, "r") as f:
+        manifest = yaml.safe_load(f) or {}
+    if isinstance(manifest, list):
+        manifest = {"projects": manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("projects"), list):
+        raise click.ClickException(f"{manifest_path} must contain a list of projects")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    defaults = manifest.get("defaults") or {}
+    projects = []
+    for entry in manifest["projects"]:
+        project = {"path": entry} if isinstance(entry, str) else dict(entry or {})
+        if not project.get("path"):
+            raise click.ClickException(f"Every project in {manifest_path} needs a path")
+        project["path"] = os.path.join(base_dir, project["path"])
+        projects.append({**defaults, **project})
+    return projects
+
+def default_image_name(project_path):
+    """
+    Derive an image name from the project directory name.
+    """
+    return os.path.basename(os.path.normpath(project_path)).lower()
+
+def format_summary(results):
+    """
+    Format the per-project results as a table.
+
+    Args:
+        results (list): Result dicts with project, image_tag, status, context_size, push, card, seconds and error
+
+    Returns:
+        str: The table, one line per project
+    """
+    headers = ["PROJECT", "IMAGE", "STATUS", "CONTEXT", "PUSHED", "CARD", "TIME"]
+    rows = [[r["project"], r["image_tag"], r["status"],
+             format_size(r["context_size"]) if r["context_size"] is not None else "-",
+             f"{format_size(r['push']['pushed_bytes'])} ({r['push']['pushed_layers']}/{r['push']['layers']} layers)" if r["push"] else "-",
+             r["card"] or "-",
+             f"{r['seconds']:.1f}s"] for r in results]
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in [headers] + rows]
+    for r in results:
+        if r["error"]:
+            lines.append(f"{r['project']}: {r['error']}")
+    return "\n".join(lines)
+
+@click.command()
+@click.option("-p", "--project", "project_paths", multiple=True, type=click.Path(exists=True, file_okay=False), help="Path to a project (repeatable)")
+@click.option("-g", "--glob", "patterns", multiple=True, help="Glob matching project directories, e.g. 'example_agents/*' (repeatable)")
+@click.option("-m", "--manifest", type=click.Path(exists=True, dir_okay=False), help="YAML/JSON file listing the projects to build")
+@click.option("-r", "--repository", help="Repository name for projects that don't set one")
+@click.option("-t", "--tag", default="latest", show_default=True, help="Image tag for projects that don't set one")
+@click.option("-j", "--parallel", default=4, show_default=True, type=click.IntRange(min=1), help="Maximum number of projects built at once")
+@click.option("--skip-unchanged", is_flag=True, help="Skip projects whose registry image was built from identical content")
+@click.option("--no-cache", is_flag=True, help="Build without reusing cached layers")
+@click.option("--template", type=click.Choice(list(DOCKERFILE_TEMPLATES)), default="standard", show_default=True, help="Dockerfile template for projects that don't set one")
+@click.option("--extra-tag", "extra_tags", multiple=True, help="Also tag and push every image under this tag (repeatable)")
+@click.option("--api-url", help="Base URL of the agent card API (default: from setup, or port 8000 of the registry host)")
+@click.pass_context
+def build_many(ctx, project_paths, patterns, manifest, repository, tag, parallel, skip_unchanged, no_cache, template, extra_tags, api_url):
+    """
+    Build and push the images of several projects concurrently.
+
+    Projects come from --project paths, --glob patterns (directories with an
+    agent_card.yml) and/or a --manifest file. Images are named after their project
+    directory unless the manifest sets an image name. Every project goes through the
+    same steps as 'gen-cli build', sharing one Docker client, and a summary with
+    per-project timings and failures is printed at the end.
+
+    The PUSHED column of the summary shows the bytes and layers each project uploaded;
+    layers the registry already had are not counted, so projects that upload a lot on
+    every build are the ones whose layers churn.
+    """
+    registry_address = ctx.obj['registry_address']
+
+    projects = [{"path": path} for path in project_paths]
+    for pattern in patterns:
+        matches = sorted(path for path in glob.glob(pattern)
+                         if os.path.isfile(os.path.join(path, "agent_card.yml")))
+        if not matches:
+            click.echo(f"No projects match {pattern}", err=True)
+        projects.extend({"path": path} for path in matches)
+    if manifest:
+        projects.extend(load_manifest(manifest))
+
+    # The same project listed twice is built once, with the settings of its last listing
+    unique = {}
+    for project in projects:
+        unique.setdefault(os.path.abspath(project["path"]), {}).update(project)
+    projects = list(unique.values())
+
+    if not projects:
+        click.echo("No projects to build. Use --project, --glob or --manifest.", err=True)
+        ctx.exit(1)
+    for project in projects:
+        project.setdefault("image", default_image_name(project["path"]))
+        project.setdefault("tag", tag)
+        project.setdefault("template", template)
+        if project["template"] not in DOCKERFILE_TEMPLATES:
+            click.echo(f"Unknown template {project['template']} for {project['path']}", err=True)
+            ctx.exit(1)
+        project.setdefault("repository", repository)
+        if not project["repository"]:
+            click.echo(f"No repository set for {project['path']}. Use --repository or set it in the manifest.", err=True)
+            ctx.exit(1)
+
+    client = docker.from_env(timeout=600, max_pool_size=parallel)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=parallel)
+    session.mount("http://", adapter)
+
+    lock = threading.Lock()
+    completed = [0]
+
+    def run(project):
+        name = project["image"]
+
+        def echo(message):
+            with lock:
+                click.echo(f"[{name}] {message}")
+
+        started = time.monotonic()
+        result = {
+            "project": project["path"],
+            "image_tag": f"{registry_address}/{project['repository']}/{project['image']}:{project['tag']}",
+            "status": "failed",
+            "context_size": None,
+            "push": None,
+            "card": None,
+            "error": None,
+        }
+        try:
+            built = build_project(client, registry_address, project["path"], project["repository"],
+                                  project["image"], project["tag"], skip_unchanged=skip_unchanged,
+                                  no_cache=no_cache, template=project["template"], extra_tags=extra_tags,
+                                  api_url=api_url, session=session, echo=echo)
+            result["status"] = "skipped" if built["skipped"] else "built"
+            result["context_size"] = built["context_size"]
+            result["push"] = built["push"]
+            result["card"] = built["card"]
+        except Exception as e:
+            result["error"] = str(e)
+        result["seconds"] = time.monotonic() - started
+
+        with lock:
+            completed[0] += 1
+            click.echo(f"[{completed[0]}/{len(projects)}] {name}: {result['status']} in {result['seconds']:.1f}s"
+                       + (f" ({result['error']})" if result["error"] else ""))
+        return result
+
+    click.echo(f"Building {len(projects)} projects, {min(parallel, len(projects))} at a time")
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        futures = {executor.submit(run, project): index for index, project in enumerate(projects)}
+        results = [None] * len(projects)
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    session.close()
+
+    failed = [r for r in results if r["status"] == "failed"]
+    queued = sum(1 for r in results if r["card"] == "queued")
+    pushed_bytes = sum(r["push"]["pushed_bytes"] for r in results if r["push"])
+    click.echo("")
+    click.echo(format_summary(results))
+    click.echo(f"\n{len(results) - len(failed)} succeeded, {len(failed)} failed in {time.monotonic() - started:.1f}s, "
+               f"{format_size(pushed_bytes)} pushed")
+    if queued:
+        click.echo(f"{queued} agent cards could not be stored and were queued; run 'gen-cli flush-cards' to retry")
+    if failed:
+        ctx.exit(1)
@@ -0,0 +1,158 @@
+import datetime
+import json
+import os
+import threading
+import time
+import click
+import requests
+from .utils import get_outbox_file
+
+# Serializes outbox writes of concurrent builds (build-many)
+_outbox_lock = threading.Lock()
+
+def register_card(api_url, payload, session=None, timeout=10.0, retries=3, backoff=0.5):
+    """
+    Store an agent card through the API, retrying transient failures.
+
+    Cards are stored under their image_full_tag, so retrying a request that may have
+    reached the API is safe.
+
+    Args:
+        api_url (str): Base URL of the agent card API
+        payload (dict): The agent card payload of POST /agent_card
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each attempt
+        retries (int): Attempts after the first one
+        backoff (float): Seconds before the first retry, doubled after each retry
+
+    Returns:
+        dict: The API response
+
+    Raises:
+        requests.exceptions.RequestException: If the last attempt fails, or the API rejects the card
+    """
+    http = session or requests
+    for attempt in range(retries + 1):
+        try:
+            response = http.post(f"{api_url}/agent_card", json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            # A rejected card fails the same way every time
+            if attempt == retries or is_rejected(e):
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+def is_rejected(error):
+    """
+    Check whether a registration error is the API rejecting the card, rather than a transient failure.
+    """
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code < 500
+
+def queue_card(api_url, payload, error):
+    """
+    Queue an agent card that could not be stored, for 'gen-cli flush-cards'.
+
+    Args:
+        api_url (str): Base URL of the agent card API the card is meant for
+        payload (dict): The agent card payload
+        error (str): Why the card could not be stored
+    """
+    entry = {
+        "api_url": api_url,
+        "payload": payload,
+        "error": error,
+        "queued_at": datetime.datetime.now(datetime.UTC).isoformat(),
+    }
+    outbox_file = get_outbox_file()
+    with _outbox_lock:
+        os.makedirs(os.path.dirname(outbox_file), exist_ok=True)
+        with open(outbox_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+def read_outbox():
+    """
+    Read the queued agent cards, keeping only the latest entry of each image and API.
+
+    Returns:
+        list: The outbox entries, oldest first
+    """
+    try:
+        with open(get_outbox_file(), "r") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    entries = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # A line cut short by an interrupted write
+        key = (entry["api_url"], entry["payload"]["image_full_tag"])
+        entries.pop(key, None)
+        entries[key] = entry
+    return list(entries.values())
+
+def remove_from_outbox(stored):
+    """
+    Remove stored entries from the outbox, keeping any queued since they were read.
+
+    Args:
+        stored (list): The outbox entries that were stored
+    """
+    stored_keys = {(entry["api_url"], entry["payload"]["image_full_tag"], entry["queued_at"]) for entry in stored}
+    with _outbox_lock:
+        remaining = [entry for entry in read_outbox()
+                     if (entry["api_url"], entry["payload"]["image_full_tag"], entry["queued_at"]) not in stored_keys]
+        with open(get_outbox_file(), "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in remaining)
+
+@click.command()
+@click.option("--api-url", help="Send every queued card to this API instead of the one it was queued for")
+@click.option("--batch-size", default=100, show_default=True, type=click.IntRange(min=1), help="Cards sent per bulk request")
+@click.option("--timeout", default=30.0, show_default=True, type=click.FloatRange(min=0, min_open=True), help="Seconds to wait for each bulk request")
+@click.pass_context
+def flush_cards(ctx, api_url, batch_size, timeout):
+    """
+    Store the agent cards queued by builds that could not reach the API.
+
+    'gen-cli build' queues a card in the local outbox when storing it still fails after
+    its retries. This command sends the queued cards in batches to /agent_cards/bulk and
+    removes the stored ones from the outbox; cards that fail again stay queued.
+    """
+    entries = read_outbox()
+    if not entries:
+        click.echo("No queued agent cards")
+        return
+
+    batches = {}
+    for entry in entries:
+        batches.setdefault(api_url.rstrip("/") if api_url else entry["api_url"], []).append(entry)
+
+    stored, failed = [], 0
+    with requests.Session() as session:
+        for target, target_entries in batches.items():
+            for start in range(0, len(target_entries), batch_size):
+                batch = target_entries[start:start + batch_size]
+                try:
+                    response = session.post(f"{target}/agent_cards/bulk", json=[entry["payload"] for entry in batch], timeout=timeout)
+                    response.raise_for_status()
+                    results = response.json()["results"]
+                except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                    click.echo(f"Error sending {len(batch)} cards to {target}: {str(e)}", err=True)
+                    failed += len(batch)
+                    continue
+                for entry, result in zip(batch, results):
+                    if result.get("status") == "failed":
+                        failed += 1
+                        click.echo(f"Error storing {entry['payload']['image_full_tag']}: {result.get('error', 'unknown error')}", err=True)
+                    else:
+                        stored.append(entry)
+                        click.echo(f"Stored {entry['payload']['image_full_tag']} (queued {entry['queued_at']})")
+
+    if stored:
+        remove_from_outbox(stored)
+    click.echo(f"{len(stored)} agent cards stored, {failed} still queued")
+    if failed:
+        ctx.exit(1)
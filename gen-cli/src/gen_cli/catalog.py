@@ -0,0 +1,152 @@
+import json
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import click
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .registry import DEFAULT_PAGE_SIZE, iter_repositories, iter_tags, get_manifest, get_image_config, get_image_size
+from .utils import format_size
+
+def create_session(pool_size):
+    """
+    Create a requests.Session with a connection pool sized for concurrent registry calls.
+
+    Args:
+        pool_size (int): Maximum pooled connections, usually the number of workers
+
+    Returns:
+        requests.Session: The session, retrying idempotent requests on gateway errors
+    """
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset(["GET", "HEAD"]))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def describe_image(registry_address, repository, tag, session):
+    """
+    Get the catalog details of an image: compressed size, layer count and build date.
+
+    Returns:
+        dict: The size, layers and build_date of the image, or an error message
+    """
+    try:
+        manifest = get_manifest(registry_address, repository, tag, session)
+        if manifest is None:
+            return {"error": "manifest not found"}
+        config = get_image_config(registry_address, repository, manifest["config"]["digest"], session)
+        labels = (config.get("config") or {}).get("Labels") or {}
+        return {
+            "size": get_image_size(manifest),
+            "layers": len(manifest.get("layers", [])),
+            "build_date": labels.get("org.gensphere.build-date") or config.get("created"),
+        }
+    except (requests.RequestException, ValueError, KeyError) as e:
+        return {"error": str(e)}
+
+def format_table(rows, details):
+    """
+    Format catalog rows as an aligned table.
+    """
+    headers = ["REPOSITORY", "TAG"] + (["SIZE", "LAYERS", "BUILD DATE"] if details else [])
+    lines = []
+    for row in rows:
+        line = [row["repository"], row["tag"] or "-"]
+        if details:
+            line += [format_size(row["size"]) if row.get("size") is not None else "-",
+                     str(row["layers"]) if row.get("layers") is not None else "-",
+                     row.get("build_date") or "-"]
+        if row.get("error"):
+            line[-1] = f"{line[-1]}  (error: {row['error']})"
+        lines.append(line)
+    widths = [max(len(line[i]) for line in [headers] + lines) for i in range(len(headers))]
+    return "\n".join("  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip()
+                     for line in [headers] + lines)
+
+@click.command()
+@click.option("--details", is_flag=True, help="Also fetch the size, layer count and build date of every image")
+@click.option("-f", "--format", "output_format", type=click.Choice(["table", "json", "ndjson"]), default="table", show_default=True, help="Output format")
+@click.option("-w", "--workers", default=16, show_default=True, type=click.IntRange(min=1), help="Concurrent registry requests")
+@click.option("--page-size", default=DEFAULT_PAGE_SIZE, show_default=True, type=click.IntRange(min=1), help="Entries fetched per registry listing request")
+@click.pass_context
+def catalog(ctx, details, output_format, workers, page_size):
+    """
+    List every repository of the registry with its tags.
+
+    Tags of all repositories, and with --details the manifest and labels of every image,
+    are fetched concurrently over one pooled session. Output is a table, a JSON array,
+    or NDJSON with one image per line, written as results arrive.
+    """
+    registry_address = ctx.obj['registry_address']
+    session = create_session(workers)
+    started = time.monotonic()
+    failed = 0
+
+    try:
+        repositories = list(iter_repositories(registry_address, page_size, session))
+    except requests.RequestException as e:
+        click.echo(f"Error fetching repositories: {str(e)}", err=True)
+        ctx.exit(1)
+
+    def list_repository_tags(repository):
+        try:
+            return repository, list(iter_tags(registry_address, repository, page_size, session)), None
+        except requests.RequestException as e:
+            return repository, [], str(e)
+
+    def rows():
+        nonlocal failed
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Rows in registry order; with --details an image row waits for its description,
+            # which is fetched over the same pool while later repositories are still listed
+            pending = deque()
+
+            def ready_rows(wait):
+                nonlocal failed
+                while pending and (wait or not isinstance(pending[0], Future) or pending[0].done()):
+                    row = pending.popleft()
+                    if isinstance(row, Future):
+                        row = row.result()
+                        if "error" in row:
+                            failed += 1
+                    yield row
+
+            def describe(repository, tag):
+                return {"repository": repository, "tag": tag, **describe_image(registry_address, repository, tag, session)}
+
+            for repository, tags, error in executor.map(list_repository_tags, repositories):
+                if error:
+                    failed += 1
+                    pending.append({"repository": repository, "tag": None, "error": error})
+                elif not tags:
+                    pending.append({"repository": repository, "tag": None})
+                elif not details:
+                    pending.extend({"repository": repository, "tag": tag} for tag in tags)
+                else:
+                    pending.extend(executor.submit(describe, repository, tag) for tag in tags)
+                yield from ready_rows(wait=False)
+            yield from ready_rows(wait=True)
+
+    # Rows of repositories without tags, or whose tags couldn't be listed, aren't images
+    if output_format == "ndjson":
+        count = 0
+        for row in rows():
+            click.echo(json.dumps(row))
+            count += row["tag"] is not None
+    else:
+        results = list(rows())
+        count = sum(1 for row in results if row["tag"] is not None)
+        if output_format == "json":
+            click.echo(json.dumps(results, indent=2))
+        elif results:
+            click.echo(format_table(results, details))
+    session.close()
+
+    click.echo(f"Listed {count} images from {len(repositories)} repositories in {time.monotonic() - started:.2f}s"
+               + (f", {failed} failed" if failed else ""), err=True)
+    if failed:
+        ctx.exit(1)
@@ -1,6 +1,154 @@
 import click
 import docker
+import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
+from .proxy import Backend, LoadBalancer, ReverseProxy
+from .registry import get_manifest_digest, get_manifest, get_image_size
+from .utils import format_size, record_pull, get_pull_throughput
+
+class PodNotReadyError(Exception):
+    """Raised when a deployed pod doesn't become ready"""
+    pass
+
+def get_host_port(container, container_port="80/tcp"):
+    """
+    Get the host port Docker published for a port of a container.
+
+    Args:
+        container (docker.models.containers.Container): The container, freshly reloaded
+        container_port (str): The container port, e.g. 80/tcp
+
+    Returns:
+        int: The host port
+
+    Raises:
+        PodNotReadyError: If the port isn't published, e.g. because the container already exited
+    """
+    try:
+        return int(container.attrs["NetworkSettings"]["Ports"][container_port][0]["HostPort"])
+    except (KeyError, IndexError, TypeError):
+        raise PodNotReadyError(f"Container {container.name} has no published port for {container_port} (status: {container.status})")
+
+def wait_until_ready(container, url, timeout=60.0, initial_delay=0.1, max_delay=2.0):
+    """
+    Poll a pod endpoint with exponential backoff until it answers.
+
+    Args:
+        container (docker.models.containers.Container): The pod's container
+        url (str): URL to poll, e.g. http://localhost:8000/agent_card
+        timeout (float): Seconds to wait before giving up
+        initial_delay (float): Seconds between the first two checks, doubled after each check
+        max_delay (float): Upper bound of the delay between checks
+
+    Returns:
+        tuple: Seconds until the pod answered, and the number of checks made
+
+    Raises:
+        PodNotReadyError: If the container stops or the pod doesn't answer within the timeout
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = initial_delay
+    checks = 0
+    last_error = "no response"
+    while True:
+        container.reload()
+        if container.status in ("exited", "dead"):
+            exit_code = container.attrs.get("State", {}).get("ExitCode")
+            raise PodNotReadyError(f"Container {container.name} stopped (status {container.status}, exit code {exit_code})")
+
+        checks += 1
+        try:
+            response = requests.get(url, timeout=max(0.1, min(2.0, deadline - time.monotonic())))
+            if response.ok:
+                return time.monotonic() - started, checks
+            last_error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            last_error = type(e).__name__
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise PodNotReadyError(f"Pod at {url} not ready after {timeout:.0f}s and {checks} checks (last error: {last_error})")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+def pull_image(client, registry_address, repository, image, tag, pull="always", echo=click.echo):
+    """
+    Make an image available locally, pulling it only when needed.
+
+    With pull="always", the digest of the local image is compared with the registry
+    manifest digest (a single HEAD request) and the image is only pulled when they
+    differ. With "missing", any local image is used as is. With "never", the image must
+    already be local.
+
+    Args:
+        client (docker.DockerClient): Docker client to inspect and pull with
+        registry_address (str): Registry host and port
+        repository (str): Repository name
+        image (str): Image name
+        tag (str): Image tag
+        pull (str): Pull policy: always, missing or never
+        echo (callable): Function used to print progress messages
+
+    Returns:
+        bool: True if the image was pulled, False if the local image was used
+
+    Raises:
+        docker.errors.ImageNotFound: If the image isn't local and pull is "never"
+        docker.errors.APIError: If the pull fails
+    """
+    image_name = f"{registry_address}/{repository}/{image}"
+    image_tag = f"{image_name}:{tag}"
+    try:
+        local_image = client.images.get(image_tag)
+    except docker.errors.ImageNotFound:
+        local_image = None
+
+    if local_image is None and pull == "never":
+        raise docker.errors.ImageNotFound(f"Image {image_tag} is not available locally and --pull=never")
+    if local_image is not None and pull != "always":
+        echo(f"Using local image {image_tag} (--pull={pull})")
+        return False
+
+    if local_image is not None:
+        try:
+            remote_digest = get_manifest_digest(registry_address, f"{repository}/{image}", tag)
+        except requests.RequestException as e:
+            echo(f"Could not check the registry digest, pulling: {str(e)}")
+            remote_digest = None
+        local_digests = {repo_digest.split("@", 1)[1] for repo_digest in local_image.attrs.get("RepoDigests") or []
+                         if repo_digest.split("@", 1)[0] == image_name}
+        if remote_digest and remote_digest in local_digests:
+            message = f"Local image {image_tag} matches the registry ({remote_digest[:19]}), skipping pull"
+            try:
+                manifest = get_manifest(registry_address, f"{repository}/{image}", remote_digest)
+                size = get_image_size(manifest) if manifest else 0
+            except (requests.RequestException, ValueError, KeyError):
+                size = 0
+            if size:
+                message += f" of {format_size(size)}"
+                throughput = get_pull_throughput()
+                if throughput:
+                    message += f" (~{size / throughput:.1f}s at the recorded pull throughput of {format_size(throughput)}/s)"
+            echo(message)
+            return False
+
+    echo(f"Pulling image: {image_tag}")
+    started = time.monotonic()
+    downloads = {}
+    for line in client.api.pull(image_name, tag=tag, stream=True, decode=True):
+        if 'error' in line:
+            raise docker.errors.APIError(line['error'])
+        # Layers that already exist locally are never reported as downloading
+        if line.get('status') == 'Downloading' and line.get('id'):
+            downloads[line['id']] = (line.get('progressDetail') or {}).get('total') or 0
+    seconds = time.monotonic() - started
+    downloaded = sum(downloads.values())
+    if downloaded:
+        record_pull(downloaded, seconds)
+    echo(f"Pulled {image_tag} in {seconds:.1f}s ({format_size(downloaded)} downloaded, {len(downloads)} layers)")
+    return True
 
 @click.command()
 @click.option("-r", "--repository", required=True, help="Repository name")
@@ -8,12 +156,26 @@ import time
 @click.option("-t", "--tag", required=True, help="Image tag")
 @click.option("-p", "--port", required=True, type=int, help="Port to expose")
 @click.option("-n", "--name", required=True, help="Custom name for the container")
+@click.option("--ready-path", default="/agent_card", show_default=True, help="Pod endpoint polled until the pod answers")
+@click.option("--ready-timeout", default=60.0, show_default=True, type=click.FloatRange(min=0), help="Seconds to wait for the pod to become ready")
+@click.option("--replicas", default=1, show_default=True, type=click.IntRange(min=1), help="Number of containers to run behind a local load-balancing proxy")
+@click.option("--pull", type=click.Choice(["always", "missing", "never"]), default="always", show_default=True, help="always: pull when the registry digest differs from the local image; missing: pull only if there is no local image; never: only use the local image")
 @click.pass_context
-def deploy(ctx, repository, image, tag, port, name):
+def deploy(ctx, repository, image, tag, port, name, ready_path, ready_timeout, replicas, pull):
     """
     Deploy a container locally based on existing repo images.
 
-    This command pulls the specified image from the registry and runs it as a local container.
+    This command pulls the specified image from the registry and runs it as a local container,
+    then polls the pod's --ready-path with exponential backoff until it answers, reporting
+    the time it took. The command fails if the pod isn't ready within --ready-timeout.
+
+    By default the image is only pulled when the local copy's digest differs from the
+    registry's; see --pull.
+
+    With --replicas N, N containers are started on automatically allocated ports and a
+    reverse proxy on --port spreads requests across them, sending each request to the
+    replica with the fewest requests in flight and ejecting replicas that fail health
+    checks. The proxy runs in the foreground; Ctrl+C stops it and removes the replicas.
     """
     registry_address = ctx.obj['registry_address']
     client = docker.from_env()
@@ -21,8 +183,11 @@ def deploy(ctx, repository, image, tag, port, name):
     image_tag = f"{registry_address}/{repository}/{image}:{tag}"
     
     try:
-        click.echo(f"Pulling image: {image_tag}")
-        client.images.pull(image_tag)
+        pull_image(client, registry_address, repository, image, tag, pull=pull)
+
+        if replicas > 1:
+            deploy_replicas(ctx, client, image_tag, port, name, replicas, ready_path, ready_timeout)
+            return
         
         click.echo(f"Running container: {image_tag}")
         container = client.containers.run(
@@ -32,29 +197,101 @@ def deploy(ctx, repository, image, tag, port, name):
             name=name
         )
         
-        # Wait for a short time to allow the container to start
-        time.sleep(2)
-        
-        # Refresh container information
-        container.reload()
-        
-        # Check container status
-        status = container.status
-        if status == 'running':
-            click.echo(f"Container {container.name} is running successfully on port {port}")
-            click.echo(f"Container ID: {container.id}")
-            click.echo(f"Created at: {container.attrs['Created']}")
-            click.echo(f"IP Address: {container.attrs['NetworkSettings']['IPAddress']}")
-        else:
-            click.echo(f"Container {container.name} is not running. Status: {status}", err=True)
+        # Wait until the pod answers HTTP requests, not just until the container is running
+        ready_url = f"http://localhost:{port}/{ready_path.lstrip('/')}"
+        click.echo(f"Waiting for {ready_url} (timeout {ready_timeout:.0f}s)...")
+        try:
+            seconds, checks = wait_until_ready(container, ready_url, timeout=ready_timeout)
+        except PodNotReadyError as e:
+            click.echo(f"Error: {str(e)}", err=True)
+            click.echo("Container logs:", err=True)
+            click.echo(container.logs(tail=50).decode('utf-8'), err=True)
+            click.echo(f"The container was left in place for inspection; remove it with 'docker rm -f {container.name}'", err=True)
+            ctx.exit(1)
+
+        click.echo(f"Container {container.name} is ready on port {port} after {seconds:.2f}s ({checks} checks)")
+        click.echo(f"Container ID: {container.id}")
+        click.echo(f"Created at: {container.attrs['Created']}")
+        click.echo(f"IP Address: {container.attrs['NetworkSettings']['IPAddress']}")
             
         # Display container logs
         click.echo("Container logs:")
         click.echo(container.logs().decode('utf-8'))
         
     except docker.errors.ImageNotFound:
-        click.echo(f"Error: Image {image_tag} not found", err=True)
+        click.echo(f"Error: Image {image_tag} not found" + (" locally (--pull=never)" if pull == "never" else ""), err=True)
         ctx.exit(1)
     except docker.errors.APIError as e:
         click.echo(f"Error deploying container: {str(e)}", err=True)
         ctx.exit(1)
+
+def deploy_replicas(ctx, client, image_tag, port, name, replicas, ready_path, ready_timeout):
+    """
+    Run replicas of a pod behind a local reverse proxy until interrupted.
+
+    Args:
+        ctx (click.Context): The command context
+        client (docker.DockerClient): Docker client to run the containers with
+        image_tag (str): Full tag of the pod image
+        port (int): Port the proxy listens on
+        name (str): Name prefix of the containers (<name>-1, <name>-2, ...)
+        replicas (int): Number of containers to run
+        ready_path (str): Pod endpoint used for readiness and health checks
+        ready_timeout (float): Seconds to wait for each replica to become ready
+    """
+    containers = []
+    try:
+        for index in range(1, replicas + 1):
+            # Docker picks a free host port; replicas are only reachable through the proxy
+            containers.append(client.containers.run(
+                image_tag,
+                detach=True,
+                ports={"80/tcp": ("127.0.0.1", None)},
+                name=f"{name}-{index}",
+                labels={"org.gensphere.deployment": name}
+            ))
+        click.echo(f"Started {replicas} containers: {', '.join(container.name for container in containers)}")
+
+        def start(container):
+            container.reload()
+            host_port = get_host_port(container)
+            seconds, _ = wait_until_ready(container, f"http://127.0.0.1:{host_port}/{ready_path.lstrip('/')}", timeout=ready_timeout)
+            click.echo(f"Replica {container.name} is ready on port {host_port} after {seconds:.2f}s")
+            return Backend(container.name, "127.0.0.1", host_port)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=replicas) as executor:
+            futures = [executor.submit(start, container) for container in containers]
+            backends = []
+            for container, future in zip(containers, futures):
+                try:
+                    backends.append(future.result())
+                except PodNotReadyError as e:
+                    click.echo(f"Error: {str(e)}", err=True)
+                    click.echo(f"Container logs of {container.name}:", err=True)
+                    click.echo(container.logs(tail=50).decode('utf-8'), err=True)
+        if len(backends) < replicas:
+            click.echo(f"{replicas - len(backends)} of {replicas} replicas did not become ready", err=True)
+            ctx.exit(1)
+        click.echo(f"All {replicas} replicas ready after {time.monotonic() - started:.2f}s")
+
+        balancer = LoadBalancer(backends, health_path=ready_path)
+        proxy = ReverseProxy(("0.0.0.0", port), balancer)
+        balancer.start_health_checks()
+        click.echo(f"Proxy listening on http://localhost:{port}, routing to {replicas} replicas (Ctrl+C to stop)")
+        try:
+            proxy.serve_forever()
+        except KeyboardInterrupt:
+            click.echo("\nStopping proxy...")
+        finally:
+            balancer.stop()
+            proxy.server_close()
+            for backend in backends:
+                click.echo(f"  {backend.name}: {backend.requests} requests, {backend.errors} errors")
+    finally:
+        for container in containers:
+            click.echo(f"Removing container {container.name}")
+            try:
+                container.remove(force=True)
+            except docker.errors.APIError as e:
+                click.echo(f"Error removing container {container.name}: {str(e)}", err=True)
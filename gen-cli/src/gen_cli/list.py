@@ -1,26 +1,28 @@
 import click
 import requests
+from .registry import DEFAULT_PAGE_SIZE, iter_repositories, iter_tags
 
 @click.command()
+@click.option("--page-size", default=DEFAULT_PAGE_SIZE, show_default=True, type=click.IntRange(min=1), help="Repositories fetched per registry request")
 @click.pass_context
-def list_repositories(ctx):
+def list_repositories(ctx, page_size):
     """
     List all repositories in the registry.
 
-    This command fetches and displays all repositories available in the configured registry.
+    This command fetches and displays all repositories available in the configured registry,
+    following the registry pagination so large catalogs are not truncated.
     """
     registry_address = ctx.obj['registry_address']
     base_url = f"http://{registry_address}/v2"
-    
+
     try:
         click.echo(f"Fetching repositories from {base_url}")
-        response = requests.get(f"{base_url}/_catalog")
-        response.raise_for_status()
-        repositories = response.json().get("repositories", [])
-        if repositories:
-            click.echo(f"Found {len(repositories)} repositories:")
-            for repo in repositories:
-                click.echo(f"- {repo}")
+        count = 0
+        for repo in iter_repositories(registry_address, page_size):
+            click.echo(f"- {repo}")
+            count += 1
+        if count:
+            click.echo(f"Found {count} repositories.")
         else:
             click.echo("No repositories found.")
     except requests.RequestException as e:
@@ -29,25 +31,26 @@ def list_repositories(ctx):
 
 @click.command()
 @click.option("-r", "--repository", required=True, help="Repository name")
+@click.option("--page-size", default=DEFAULT_PAGE_SIZE, show_default=True, type=click.IntRange(min=1), help="Tags fetched per registry request")
 @click.pass_context
-def list_tags(ctx, repository):
+def list_tags(ctx, repository, page_size):
     """
     List tags for a specific repository.
 
-    This command fetches and displays all tags for the specified repository.
+    This command fetches and displays all tags for the specified repository,
+    following the registry pagination so long tag lists are not truncated.
     """
     registry_address = ctx.obj['registry_address']
     base_url = f"http://{registry_address}/v2"
-    
+
     try:
         click.echo(f"Fetching tags for repository '{repository}' from {base_url}")
-        response = requests.get(f"{base_url}/{repository}/tags/list")
-        response.raise_for_status()
-        tags = response.json().get("tags", [])
-        if tags:
-            click.echo(f"Found {len(tags)} tags for repository '{repository}':")
-            for tag in tags:
-                click.echo(f"- {tag}")
+        count = 0
+        for tag in iter_tags(registry_address, repository, page_size):
+            click.echo(f"- {tag}")
+            count += 1
+        if count:
+            click.echo(f"Found {count} tags for repository '{repository}'.")
         else:
             click.echo(f"No tags found for repository '{repository}'.")
     except requests.RequestException as e:
@@ -1,28 +1,44 @@
+import importlib
 import click
-from .build import build
-from .list import list_repositories, list_tags
-from .deploy import deploy
-from .setup import setup
 from .utils import get_registry_address, is_setup_complete
 
+# Command name -> (module, attribute, short help). Modules are only imported when their
+# command runs, so e.g. list-tags never loads docker and --help loads nothing at all.
+COMMANDS = {
+    'setup': ('setup', 'setup', 'Configure the registry address for the gen-cli tool.'),
+    'build': ('build', 'build', 'Build and push a Docker image to the private registry and store agent card in MongoDB.'),
+    'build-many': ('build_many', 'build_many', 'Build and push the images of several projects concurrently.'),
+    'flush-cards': ('cards', 'flush_cards', 'Store the agent cards queued by builds that could not reach the API.'),
+    'list-repositories': ('list', 'list_repositories', 'List all repositories in the registry.'),
+    'list-tags': ('list', 'list_tags', 'List tags for a specific repository.'),
+    'catalog': ('catalog', 'catalog', 'List every repository of the registry with its tags.'),
+    'deploy': ('deploy', 'deploy', 'Deploy a container locally based on existing repo images.'),
+    'warm-pool': ('warm_pool', 'warm_pool', 'Keep pre-started pod containers ready and hand them out through a local API.'),
+    'bench': ('bench', 'bench', "Load-test a deployed pod's /execute endpoint."),
+}
+
 class PrivateRegistryCLI(click.MultiCommand):
     def list_commands(self, ctx):
-        return ['setup', 'build', 'list-repositories', 'list-tags', 'deploy']
+        return list(COMMANDS)
 
     def get_command(self, ctx, cmd_name):
-        if cmd_name == 'setup':
-            return setup
+        if cmd_name not in COMMANDS:
+            return None
         elif not is_setup_complete() and cmd_name != 'setup':
             click.echo("Please run 'gen-cli setup' first to configure the registry address.", err=True)
             return None
-        elif cmd_name == 'build':
-            return build
-        elif cmd_name == 'list-repositories':
-            return list_repositories
-        elif cmd_name == 'list-tags':
-            return list_tags
-        elif cmd_name == 'deploy':
-            return deploy
+        module_name, attribute, _ = COMMANDS[cmd_name]
+        module = importlib.import_module(f".{module_name}", __package__)
+        return getattr(module, attribute)
+
+    def format_commands(self, ctx, formatter):
+        """
+        List the commands in --help from COMMANDS, without importing their modules.
+        """
+        limit = formatter.width - 6 - max(len(name) for name in COMMANDS)
+        rows = [(name, click.utils.make_default_short_help(short_help, limit)) for name, (_, _, short_help) in COMMANDS.items()]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
 
 @click.command(cls=PrivateRegistryCLI)
 @click.pass_context
@@ -37,7 +53,8 @@ def cli(ctx):
     ctx.ensure_object(dict)
     if is_setup_complete():
         ctx.obj['registry_address'] = get_registry_address()
-        click.echo(f"Using registry address: {ctx.obj['registry_address']}")
+        # Diagnostics go to stderr so JSON output of commands can be piped
+        click.echo(f"Using registry address: {ctx.obj['registry_address']}", err=True)
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -0,0 +1,252 @@
+import http.client
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import click
+
+# Headers that describe a single connection and must not be forwarded
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+                      "te", "trailers", "transfer-encoding", "upgrade"}
+
+class NoBackendAvailable(Exception):
+    """Raised when every backend of the proxy is ejected"""
+    pass
+
+class Backend:
+    """
+    A pod replica behind the proxy, with its routing state.
+    """
+
+    def __init__(self, name, host, port):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.outstanding = 0
+        self.healthy = True
+        self.failures = 0
+        self.requests = 0
+        self.errors = 0
+
+    def __repr__(self):
+        return f"{self.name} ({self.host}:{self.port})"
+
+class LoadBalancer:
+    """
+    Least-outstanding-requests routing with health-based ejection.
+
+    Each request goes to the healthy backend with the fewest requests in flight. A backend
+    is ejected after `max_failures` consecutive failed requests or health checks, and put
+    back in rotation as soon as a health check succeeds again.
+    """
+
+    def __init__(self, backends, health_path="/agent_card", health_interval=2.0, max_failures=2, timeout=2.0):
+        """
+        Initialize the load balancer.
+
+        Args:
+            backends (list): The Backend replicas to route to
+            health_path (str): Path requested by the health checks
+            health_interval (float): Seconds between health check rounds
+            max_failures (int): Consecutive failures before a backend is ejected
+            timeout (float): Health check timeout in seconds
+        """
+        self.backends = backends
+        self.health_path = "/" + health_path.lstrip("/")
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._next = 0
+        self._stopped = threading.Event()
+
+    def acquire(self, exclude=()):
+        """
+        Pick the backend for a request and count it as outstanding.
+
+        Args:
+            exclude (iterable): Backends not to pick, e.g. one that just failed
+
+        Returns:
+            Backend: The healthy backend with the fewest requests in flight
+
+        Raises:
+            NoBackendAvailable: If no healthy backend is left
+        """
+        with self._lock:
+            candidates = [backend for backend in self.backends if backend.healthy and backend not in exclude]
+            if not candidates:
+                raise NoBackendAvailable()
+            # Rotate the starting point so ties don't always go to the first replica
+            self._next = (self._next + 1) % len(candidates)
+            rotated = candidates[self._next:] + candidates[:self._next]
+            backend = min(rotated, key=lambda candidate: candidate.outstanding)
+            backend.outstanding += 1
+            backend.requests += 1
+            return backend
+
+    def release(self, backend, ok):
+        """
+        Finish a request on a backend, recording whether the backend could serve it.
+        """
+        with self._lock:
+            backend.outstanding -= 1
+            self._record(backend, ok)
+
+    def _record(self, backend, ok):
+        if ok:
+            backend.failures = 0
+            if not backend.healthy:
+                backend.healthy = True
+                click.echo(f"Backend {backend} is healthy again")
+        else:
+            backend.failures += 1
+            backend.errors += 1
+            if backend.healthy and backend.failures >= self.max_failures:
+                backend.healthy = False
+                click.echo(f"Backend {backend} ejected after {backend.failures} consecutive failures", err=True)
+
+    def check(self, backend):
+        """
+        Run one health check against a backend and update its state.
+        """
+        connection = http.client.HTTPConnection(backend.host, backend.port, timeout=self.timeout)
+        try:
+            connection.request("GET", self.health_path)
+            response = connection.getresponse()
+            response.read()
+            ok = 200 <= response.status < 400
+        except (OSError, http.client.HTTPException):
+            ok = False
+        finally:
+            connection.close()
+        with self._lock:
+            self._record(backend, ok)
+
+    def start_health_checks(self):
+        """
+        Check every backend every `health_interval` seconds in a daemon thread.
+        """
+        def run():
+            while not self._stopped.wait(self.health_interval):
+                for backend in self.backends:
+                    self.check(backend)
+        threading.Thread(target=run, name="proxy-health-checks", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """
+    Forwards every request to a backend picked by the server's load balancer.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _forward(self):
+        balancer = self.server.balancer
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        headers = {key: value for key, value in self.headers.items() if key.lower() not in HOP_BY_HOP_HEADERS}
+
+        tried = []
+        # A replica that refuses the connection never saw the request, so it can go to another.
+        # Once sent, a request (e.g. a POST /execute) is never retried, to not run it twice.
+        while True:
+            try:
+                backend = balancer.acquire(exclude=tried)
+            except NoBackendAvailable:
+                self._send_error(503, "No healthy replica available")
+                return
+            tried.append(backend)
+
+            connection = http.client.HTTPConnection(backend.host, backend.port, timeout=balancer.timeout)
+            try:
+                connection.connect()
+            except OSError:
+                connection.close()
+                balancer.release(backend, ok=False)
+                continue
+
+            try:
+                connection.sock.settimeout(self.server.backend_timeout)
+                connection.request(self.command, self.path, body=body, headers=headers)
+                response = connection.getresponse()
+            except TimeoutError:
+                connection.close()
+                balancer.release(backend, ok=False)
+                self._send_error(504, f"Replica {backend.name} did not answer in time")
+                return
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                balancer.release(backend, ok=False)
+                self._send_error(502, f"Replica {backend.name} failed to answer")
+                return
+
+            try:
+                self._relay(response)
+                # Application errors don't count against a replica, gateway-style errors do
+                balancer.release(backend, ok=response.status not in (502, 503, 504))
+            except (OSError, http.client.HTTPException):
+                # The client or the backend went away mid-response; the response can't be retried
+                balancer.release(backend, ok=False)
+                self.close_connection = True
+            finally:
+                connection.close()
+            return
+
+    def _relay(self, response):
+        self.send_response(response.status, response.reason)
+        for key, value in response.getheaders():
+            if key.lower() not in HOP_BY_HOP_HEADERS and key.lower() != "content-length":
+                self.send_header(key, value)
+
+        length = response.getheader("Content-Length")
+        if length is None:
+            # Chunked or close-delimited responses are buffered to send a length
+            data = response.read()
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        self.send_header("Content-Length", length)
+        self.end_headers()
+        while chunk := response.read(64 * 1024):
+            self.wfile.write(chunk)
+
+    def _send_error(self, status, message):
+        data = f'{{"detail": "{message}"}}'.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _forward
+
+    def log_message(self, format, *args):
+        pass
+
+class ReverseProxy(ThreadingHTTPServer):
+    """
+    A threaded HTTP reverse proxy in front of pod replicas.
+
+    Usage:
+        proxy = ReverseProxy(("0.0.0.0", 8000), LoadBalancer(backends))
+        proxy.balancer.start_health_checks()
+        proxy.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, balancer, backend_timeout=600.0):
+        """
+        Initialize the proxy.
+
+        Args:
+            address (tuple): Host and port to listen on
+            balancer (LoadBalancer): Routes requests to the replicas
+            backend_timeout (float): Seconds to wait for a replica's response, e.g. a long /execute
+        """
+        super().__init__(address, ProxyHandler)
+        self.balancer = balancer
+        self.backend_timeout = backend_timeout
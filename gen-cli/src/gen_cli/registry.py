@@ -0,0 +1,196 @@
+import requests
+from urllib.parse import urljoin
+
+DEFAULT_PAGE_SIZE = 100
+MANIFEST_MEDIA_TYPE = "application/vnd.docker.distribution.manifest.v2+json"
+# Seconds to wait for the registry to answer a request
+DEFAULT_TIMEOUT = 10.0
+
+def iter_paginated(url, key, page_size=DEFAULT_PAGE_SIZE, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Iterate over a paginated registry listing, following its Link headers.
+
+    Args:
+        url (str): URL of the first page (e.g. http://host/v2/_catalog)
+        key (str): JSON key holding the entries of each page
+        page_size (int): Entries per page (the registry `n` parameter)
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Yields:
+        str: Entries of every page, in registry order
+
+    Raises:
+        requests.RequestException: If a page cannot be fetched
+    """
+    http = session or requests
+    params = {"n": page_size}
+    while url:
+        response = http.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        yield from response.json().get(key) or []
+
+        # The next page URL already carries the n and last parameters
+        next_url = response.links.get("next", {}).get("url")
+        url, params = (urljoin(url, next_url), None) if next_url else (None, None)
+
+def iter_repositories(registry_address, page_size=DEFAULT_PAGE_SIZE, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Iterate over all repositories of a registry, one page at a time.
+
+    Args:
+        registry_address (str): Registry host and port
+        page_size (int): Repositories per request
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Yields:
+        str: Repository names
+    """
+    yield from iter_paginated(f"http://{registry_address}/v2/_catalog", "repositories", page_size, session, timeout)
+
+def iter_tags(registry_address, repository, page_size=DEFAULT_PAGE_SIZE, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Iterate over all tags of a repository, one page at a time.
+
+    Args:
+        registry_address (str): Registry host and port
+        repository (str): Repository name
+        page_size (int): Tags per request
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Yields:
+        str: Tags of the repository
+    """
+    yield from iter_paginated(f"http://{registry_address}/v2/{repository}/tags/list", "tags", page_size, session, timeout)
+
+def get_manifest_digest(registry_address, repository, tag, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Get the manifest digest of an image with a single HEAD request.
+
+    Args:
+        registry_address (str): Registry host and port
+        repository (str): Repository name (e.g. myrepo/myimage)
+        tag (str): Image tag
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Returns:
+        str: The Docker-Content-Digest of the manifest, or None if the tag doesn't exist
+
+    Raises:
+        requests.RequestException: If the registry cannot be queried
+    """
+    http = session or requests
+    response = http.head(f"http://{registry_address}/v2/{repository}/manifests/{tag}",
+                         headers={"Accept": MANIFEST_MEDIA_TYPE}, timeout=timeout)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.headers.get("Docker-Content-Digest")
+
+def get_manifest(registry_address, repository, reference, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Get the manifest of an image.
+
+    Args:
+        registry_address (str): Registry host and port
+        repository (str): Repository name (e.g. myrepo/myimage)
+        reference (str): Image tag or manifest digest
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Returns:
+        dict: The manifest, or None if the image doesn't exist in the registry
+
+    Raises:
+        requests.RequestException: If the registry cannot be queried
+    """
+    http = session or requests
+    response = http.get(f"http://{registry_address}/v2/{repository}/manifests/{reference}",
+                        headers={"Accept": MANIFEST_MEDIA_TYPE}, timeout=timeout)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+def tag_manifest(registry_address, repository, tag, new_tag, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Tag an image of the registry under another tag of the same repository, without pulling it.
+
+    The manifest is copied byte for byte, so both tags share its digest and layers.
+
+    Args:
+        registry_address (str): Registry host and port
+        repository (str): Repository name (e.g. myrepo/myimage)
+        tag (str): Existing tag of the image
+        new_tag (str): Tag to add
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Returns:
+        str: The manifest digest the new tag points to
+
+    Raises:
+        requests.RequestException: If the manifest cannot be read or written
+    """
+    http = session or requests
+    url = f"http://{registry_address}/v2/{repository}/manifests"
+    response = http.get(f"{url}/{tag}", headers={"Accept": MANIFEST_MEDIA_TYPE}, timeout=timeout)
+    response.raise_for_status()
+    media_type = response.headers.get("Content-Type", MANIFEST_MEDIA_TYPE)
+    response = http.put(f"{url}/{new_tag}", data=response.content, headers={"Content-Type": media_type}, timeout=timeout)
+    response.raise_for_status()
+    return response.headers.get("Docker-Content-Digest")
+
+def get_image_size(manifest):
+    """
+    Get the compressed size of an image, as transferred on pull, from its manifest.
+    """
+    return manifest["config"].get("size", 0) + sum(layer.get("size", 0) for layer in manifest.get("layers", []))
+
+def get_image_config(registry_address, repository, config_digest, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Get the config blob of an image, which holds its labels and creation date.
+
+    Args:
+        registry_address (str): Registry host and port
+        repository (str): Repository name (e.g. myrepo/myimage)
+        config_digest (str): Digest of the config blob, from the image manifest
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Returns:
+        dict: The image config
+
+    Raises:
+        requests.RequestException: If the registry cannot be queried
+    """
+    http = session or requests
+    response = http.get(f"http://{registry_address}/v2/{repository}/blobs/{config_digest}", timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+def get_image_labels(registry_address, repository, tag, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Get the labels of an image from its registry config blob.
+
+    Args:
+        registry_address (str): Registry host and port
+        repository (str): Repository name (e.g. myrepo/myimage)
+        tag (str): Image tag
+        session (requests.Session, optional): Session to reuse connections with
+        timeout (float): Seconds to wait for each registry response
+
+    Returns:
+        dict: The image labels, or None if the tag doesn't exist in the registry
+
+    Raises:
+        requests.RequestException: If the registry cannot be queried
+    """
+    manifest = get_manifest(registry_address, repository, tag, session, timeout)
+    if manifest is None:
+        return None
+    config = get_image_config(registry_address, repository, manifest["config"]["digest"], session, timeout)
+    return (config.get("config") or {}).get("Labels") or {}
@@ -1,11 +1,12 @@
 import click
 import os
 import json
-from .utils import get_config_file
+from .utils import get_config_file, load_config
 
 @click.command()
 @click.option("-r", "--registry-address", prompt="Enter the registry address (e.g., localhost:5000)", help="The address of the private Docker registry")
-def setup(registry_address):
+@click.option("--api-url", help="Base URL of the agent card API (default: port 8000 of the registry host)")
+def setup(registry_address, api_url):
     """
     Configure the registry address for the gen-cli tool.
 
@@ -24,12 +25,17 @@ def setup(registry_address):
         
         # Prepare the configuration
         config = {"registry_address": registry_address}
+        if api_url:
+            config["api_url"] = api_url.rstrip("/")
         
         # Write the configuration to file
         with open(config_file, "w") as f:
             json.dump(config, f)
+        load_config.cache_clear()
         
         click.echo(f"Registry address set to: {registry_address}")
+        if api_url:
+            click.echo(f"Agent card API set to: {config['api_url']}")
         click.echo(f"Configuration saved to: {config_file}")
         click.echo("Setup complete. You can now use other gen-cli commands.")
     except IOError as e:
@@ -1,9 +1,33 @@
 import os
 import json
 import click
-import pkg_resources
+import hashlib
+import tempfile
+from functools import lru_cache
+from importlib import resources
 
-def create_dockerfile(project_path):
+# Dockerfile templates selectable with --template
+DOCKERFILE_TEMPLATES = {
+    "standard": "templates/Dockerfile.template",
+    "slim": "templates/Dockerfile.slim.template",
+}
+
+def read_template(name):
+    """
+    Read a file shipped in the package's templates directory.
+
+    Args:
+        name (str): Path of the file, relative to the package (e.g. templates/Dockerfile.template).
+
+    Returns:
+        str: The content of the file.
+    """
+    return resources.files(__package__).joinpath(name).read_text(encoding="utf-8")
+
+# Header of the default patterns gen-cli appends to an existing .dockerignore
+DOCKERIGNORE_MARKER = "# Added by gen-cli"
+
+def create_dockerfile(project_path, template="standard", echo=click.echo):
     """
     Create a Dockerfile in the specified project path.
 
@@ -12,6 +36,8 @@ def create_dockerfile(project_path):
 
     Args:
         project_path (str): The path to the project directory.
+        template (str): Name of the Dockerfile template, a key of DOCKERFILE_TEMPLATES.
+        echo (callable): Function used to print progress messages.
 
     Returns:
         str: The path to the created Dockerfile.
@@ -21,27 +47,200 @@ def create_dockerfile(project_path):
     """
     try:
         # Load Dockerfile template
-        dockerfile_template = pkg_resources.resource_string(__name__, 'templates/Dockerfile.template').decode('utf-8')
+        dockerfile_template = read_template(DOCKERFILE_TEMPLATES[template])
         
         dockerfile_path = os.path.join(project_path, "Dockerfile")
         with open(dockerfile_path, "w") as f:
             f.write(dockerfile_template)
         
-        click.echo(f"Dockerfile created at {dockerfile_path}")
+        echo(f"Dockerfile created at {dockerfile_path} ({template} template)")
         
         # Create requirements.txt if it doesn't exist
         requirements_path = os.path.join(project_path, "requirements.txt")
         if not os.path.exists(requirements_path):
-            default_requirements = pkg_resources.resource_string(__name__, 'templates/default_requirements.txt').decode('utf-8')
+            default_requirements = read_template('templates/default_requirements.txt')
             with open(requirements_path, "w") as f:
                 f.write(default_requirements.strip())
-            click.echo(f"Default requirements.txt created at {requirements_path}")
+            echo(f"Default requirements.txt created at {requirements_path}")
         
         return dockerfile_path
     except IOError as e:
         click.echo(f"Error creating Dockerfile: {str(e)}", err=True)
         raise
 
+def merge_dockerignore(project_path):
+    """
+    Merge the default .dockerignore patterns into the patterns of a project.
+
+    Args:
+        project_path (str): The path to the project directory.
+
+    Returns:
+        tuple: The content of the merged .dockerignore, and whether it differs from
+            the project's current .dockerignore.
+    """
+    template = read_template('templates/dockerignore.template')
+    dockerignore_path = os.path.join(project_path, ".dockerignore")
+    if not os.path.exists(dockerignore_path):
+        return template, True
+
+    with open(dockerignore_path, "r") as f:
+        current = f.read()
+    existing = {line.strip() for line in current.splitlines()}
+    missing = [line for line in template.splitlines() if line and not line.startswith("#") and line not in existing]
+    if not missing:
+        return current, False
+    merged = current.rstrip("\n") + "\n\n" + "\n".join([DOCKERIGNORE_MARKER] + missing) + "\n"
+    return merged, True
+
+def write_dockerignore(project_path, echo=click.echo):
+    """
+    Create the project's .dockerignore, or add the default patterns it is missing.
+
+    Args:
+        project_path (str): The path to the project directory.
+        echo (callable): Function used to print progress messages.
+
+    Returns:
+        str: The content of the .dockerignore.
+    """
+    content, changed = merge_dockerignore(project_path)
+    if changed:
+        dockerignore_path = os.path.join(project_path, ".dockerignore")
+        exists = os.path.exists(dockerignore_path)
+        with open(dockerignore_path, "w") as f:
+            f.write(content)
+        echo(f".dockerignore {'updated' if exists else 'created'} at {dockerignore_path}")
+    return content
+
+def list_context_files(project_path, dockerignore):
+    """
+    List the files of a project that are sent as its build context.
+
+    Args:
+        project_path (str): The path to the project directory.
+        dockerignore (str): Content of the .dockerignore to apply.
+
+    Returns:
+        list: Sorted paths, relative to the project, of the directories and files
+            not excluded by the .dockerignore (the Dockerfile is always included).
+    """
+    # docker is imported here so commands that never build don't pay for it at startup
+    from docker.utils.build import exclude_paths
+
+    patterns = [line.strip() for line in dockerignore.splitlines() if line.strip() and not line.strip().startswith("#")]
+    return sorted(exclude_paths(project_path, patterns, dockerfile="Dockerfile"))
+
+def create_context_archive(project_path, paths):
+    """
+    Write the build context tarball of a project to a temporary file.
+
+    Args:
+        project_path (str): The path to the project directory.
+        paths (list): Relative paths to include, as returned by list_context_files.
+
+    Returns:
+        file: The tarball, positioned at its start; it is deleted when closed.
+    """
+    from docker.utils.build import create_archive
+
+    return create_archive(project_path, files=paths, fileobj=tempfile.TemporaryFile())
+
+def compute_context_hash(project_path, paths, extra=b""):
+    """
+    Compute a content hash of a build context.
+
+    The hash covers the relative path, executable bit, size and content of every file,
+    plus any extra bytes, so identical contexts always produce identical hashes.
+
+    Args:
+        project_path (str): The path to the project directory.
+        paths (list): Relative paths in the context, as returned by list_context_files.
+        extra (bytes): Additional content to include in the hash.
+
+    Returns:
+        str: The hex-encoded sha256 of the context.
+    """
+    digest = hashlib.sha256(extra)
+    for relative_path in sorted(paths):
+        path = os.path.join(project_path, relative_path)
+        if not os.path.isfile(path):
+            continue
+        executable = os.access(path, os.X_OK)
+        size = os.path.getsize(path)
+        digest.update(f"{relative_path.replace(os.sep, '/')}\0{int(executable)}\0{size}\0".encode("utf-8"))
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def format_size(size):
+    """
+    Format a size in bytes for display (e.g. 12.3 MB).
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def get_pull_stats_file():
+    """
+    Get the path to the file recording past image pull throughput.
+
+    Returns:
+        str: The path to the pull statistics file.
+    """
+    return os.path.join(click.get_app_dir("gen-cli"), "pull_stats.json")
+
+def record_pull(size, seconds, max_samples=20):
+    """
+    Record the bytes downloaded by an image pull and how long it took.
+
+    Only the last `max_samples` pulls are kept, so the throughput follows the current network.
+
+    Args:
+        size (int): Bytes downloaded.
+        seconds (float): Duration of the pull.
+        max_samples (int): Number of pulls to keep.
+    """
+    stats_file = get_pull_stats_file()
+    try:
+        with open(stats_file, "r") as f:
+            samples = json.load(f).get("samples", [])
+    except (IOError, ValueError):
+        samples = []
+    samples = (samples + [{"bytes": size, "seconds": seconds}])[-max_samples:]
+    try:
+        os.makedirs(os.path.dirname(stats_file), exist_ok=True)
+        with open(stats_file, "w") as f:
+            json.dump({"samples": samples}, f)
+    except IOError:
+        pass
+
+def get_pull_throughput():
+    """
+    Get the average pull throughput of the recorded pulls.
+
+    Returns:
+        float: Bytes per second, or None if no pull was recorded.
+    """
+    try:
+        with open(get_pull_stats_file(), "r") as f:
+            samples = json.load(f).get("samples", [])
+    except (IOError, ValueError):
+        return None
+    seconds = sum(sample["seconds"] for sample in samples)
+    return sum(sample["bytes"] for sample in samples) / seconds if seconds > 0 else None
+
+def get_outbox_file():
+    """
+    Get the path to the file queuing agent cards that could not be stored.
+
+    Returns:
+        str: The path to the agent card outbox, one JSON entry per line.
+    """
+    return os.path.join(click.get_app_dir("gen-cli"), "outbox.jsonl")
+
 def get_config_file():
     """
     Get the path to the configuration file.
@@ -72,16 +271,41 @@ def get_registry_address():
     Raises:
         SystemExit: If the configuration file is invalid or not found.
     """
-    config_file = get_config_file()
-    
-    if os.path.exists(config_file):
+    if is_setup_complete():
         try:
-            with open(config_file, "r") as f:
-                config = json.load(f)
-            return config.get("registry_address")
+            return load_config().get("registry_address")
         except json.JSONDecodeError:
             click.echo("Error: Invalid configuration file. Please run 'gen-cli setup' again.", err=True)
             exit(1)
     else:
         click.echo("Registry address not configured. Please run 'gen-cli setup' first.", err=True)
         exit(1)
+
+def get_api_url(registry_address, api_url=None):
+    """
+    Get the base URL of the agent card API.
+
+    Args:
+        registry_address (str): The registry address, whose host serves the API by default.
+        api_url (str, optional): URL given on the command line, used first.
+
+    Returns:
+        str: The API base URL, from the argument, the configuration, or port 8000 of the registry host.
+    """
+    api_url = api_url or (load_config().get("api_url") if is_setup_complete() else None)
+    return (api_url or f"http://{registry_address.split(':')[0]}:8000").rstrip("/")
+
+@lru_cache(maxsize=None)
+def load_config():
+    """
+    Load the configuration file, reading it from disk only once per process.
+
+    Returns:
+        dict: The configuration.
+
+    Raises:
+        json.JSONDecodeError: If the configuration file is invalid.
+        IOError: If the configuration file can't be read.
+    """
+    with open(get_config_file(), "r") as f:
+        return json.load(f)
@@ -0,0 +1,393 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import click
+import docker
+from .deploy import PodNotReadyError, get_host_port, pull_image, wait_until_ready
+
+POOL_LABEL = "org.gensphere.warm-pool"
+
+class UnknownImageError(Exception):
+    """Raised when a container is requested for an image the pool doesn't manage"""
+    pass
+
+def parse_image(spec):
+    """
+    Split an image given as repository/image[:tag] into its parts.
+
+    Returns:
+        tuple: The repository, image and tag (latest if omitted)
+    """
+    name, _, tag = spec.partition(":")
+    repository, _, image = name.rpartition("/")
+    if not repository or not image:
+        raise click.BadParameter(f"{spec} is not in the repository/image[:tag] format")
+    return repository, image, tag or "latest"
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def summarize(seconds):
+    """
+    Summarize a list of durations as a count and p50/p95/max in milliseconds.
+    """
+    seconds = sorted(seconds)
+    ms = lambda value: round(value * 1000, 1) if value is not None else None
+    return {"count": len(seconds), "p50_ms": ms(percentile(seconds, 50)),
+            "p95_ms": ms(percentile(seconds, 95)), "max_ms": ms(seconds[-1] if seconds else None)}
+
+class WarmPool:
+    """
+    Keeps pre-started, ready pod containers per image and hands them out on request.
+
+    Each image has a target number of idle containers that answered their readiness check.
+    acquire() hands out an idle container, or cold-starts one when none is left, and the
+    pool is replenished in the background. Images that are not acquired for `idle_timeout`
+    seconds have their idle containers reaped, and are warmed up again on the next acquire.
+    Handed-out containers belong to the caller until release() removes them.
+    """
+
+    def __init__(self, client, images, size=2, idle_timeout=600.0, ready_path="/agent_card",
+                 ready_timeout=120.0, start_workers=4, name_prefix="gen-warm"):
+        """
+        Initialize the pool; call start() to begin warming containers.
+
+        Args:
+            client (docker.DockerClient): Docker client to run the containers with
+            images (list): Full tags of the images to keep warm
+            size (int): Idle containers to keep per image
+            idle_timeout (float): Seconds without an acquire before an image's idle containers are reaped
+            ready_path (str): Pod endpoint polled until a container is ready
+            ready_timeout (float): Seconds to wait for a container to become ready
+            start_workers (int): Containers started at once
+            name_prefix (str): Prefix of the container names, also used to label them
+        """
+        self.client = client
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.ready_path = ready_path
+        self.ready_timeout = ready_timeout
+        self.name_prefix = name_prefix
+        self.pools = {image: {"idle": deque(), "starting": 0, "last_acquired": time.monotonic()} for image in images}
+        self.in_use = {}
+        self.stats = {"cold_start": [], "warm_handout": [], "cold_handout": []}
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=start_workers)
+
+    def _start_container(self, image):
+        """
+        Run a container of an image and wait until it is ready.
+
+        Returns:
+            dict: The container, its name, host port and url
+
+        Raises:
+            PodNotReadyError: If the container doesn't publish its port or doesn't become ready
+        """
+        with self._lock:
+            self._counter += 1
+            name = f"{self.name_prefix}-{self._counter}"
+        started = time.monotonic()
+        container = self.client.containers.run(
+            image,
+            detach=True,
+            ports={"80/tcp": ("127.0.0.1", None)},
+            name=name,
+            labels={POOL_LABEL: self.name_prefix}
+        )
+        try:
+            container.reload()
+            port = get_host_port(container)
+            wait_until_ready(container, f"http://127.0.0.1:{port}/{self.ready_path.lstrip('/')}", timeout=self.ready_timeout)
+        except Exception:
+            self._remove(container)
+            raise
+        seconds = time.monotonic() - started
+        with self._lock:
+            self.stats["cold_start"].append(seconds)
+        return {"container": container, "name": name, "image": image, "port": port,
+                "url": f"http://127.0.0.1:{port}", "cold_start_ms": round(seconds * 1000, 1)}
+
+    def _warm(self, image):
+        try:
+            entry = self._start_container(image)
+        except (PodNotReadyError, docker.errors.APIError) as e:
+            click.echo(f"Failed to warm a container for {image}: {str(e)}", err=True)
+            entry = None
+        with self._lock:
+            self.pools[image]["starting"] -= 1
+            if entry and not self._stopped.is_set():
+                self.pools[image]["idle"].append(entry)
+                entry["ready_at"] = time.monotonic()
+                entry = None
+        if entry:
+            self._remove(entry["container"])
+
+    def _remove(self, container):
+        try:
+            container.remove(force=True)
+        except docker.errors.APIError as e:
+            click.echo(f"Error removing container {container.name}: {str(e)}", err=True)
+
+    def _is_running(self, container):
+        try:
+            container.reload()
+            return container.status == "running"
+        except docker.errors.NotFound:
+            return False
+
+    def remove_stale(self):
+        """
+        Remove containers left behind by a previous pool with the same name prefix.
+
+        Returns:
+            int: The number of containers removed
+        """
+        stale = self.client.containers.list(all=True, filters={"label": f"{POOL_LABEL}={self.name_prefix}"})
+        for container in stale:
+            self._remove(container)
+        return len(stale)
+
+    def _maintain(self):
+        """
+        Replenish the pools and reap idle images until the pool is stopped.
+        """
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            reaped = []
+            with self._lock:
+                for image, pool in self.pools.items():
+                    if now - pool["last_acquired"] > self.idle_timeout:
+                        reaped.extend(pool["idle"])
+                        pool["idle"].clear()
+                        continue
+                    missing = self.size - len(pool["idle"]) - pool["starting"]
+                    for _ in range(max(0, missing)):
+                        pool["starting"] += 1
+                        self._executor.submit(self._warm, image)
+            for entry in reaped:
+                click.echo(f"Reaping idle container {entry['name']} ({entry['image']})")
+                self._remove(entry["container"])
+            self._wake.wait(1.0)
+            self._wake.clear()
+
+    def start(self):
+        """
+        Start warming the pools in a background thread.
+        """
+        threading.Thread(target=self._maintain, name="warm-pool", daemon=True).start()
+
+    def acquire(self, image):
+        """
+        Hand out a ready container of an image.
+
+        Args:
+            image (str): Full tag of the image
+
+        Returns:
+            dict: The name, port and url of the container, whether it came warm from the
+                pool, and the handout latency in milliseconds
+
+        Raises:
+            UnknownImageError: If the pool doesn't manage the image
+            PodNotReadyError: If a cold-started container doesn't become ready
+        """
+        started = time.monotonic()
+        if image not in self.pools:
+            raise UnknownImageError(image)
+        pool = self.pools[image]
+        with self._lock:
+            pool["last_acquired"] = started
+        while True:
+            with self._lock:
+                entry = pool["idle"].popleft() if pool["idle"] else None
+            if entry is None or self._is_running(entry["container"]):
+                break
+            # The container died while waiting in the pool
+            self._remove(entry["container"])
+        self._wake.set()
+
+        warm = entry is not None
+        if not warm:
+            entry = self._start_container(image)
+        seconds = time.monotonic() - started
+        with self._lock:
+            self.stats["warm_handout" if warm else "cold_handout"].append(seconds)
+            self.in_use[entry["name"]] = entry
+        return {"name": entry["name"], "image": image, "port": entry["port"], "url": entry["url"],
+                "warm": warm, "handout_ms": round(seconds * 1000, 1)}
+
+    def release(self, name):
+        """
+        Remove a handed-out container.
+
+        Returns:
+            bool: True if the container was handed out by this pool
+        """
+        with self._lock:
+            entry = self.in_use.pop(name, None)
+        if entry:
+            self._remove(entry["container"])
+        return entry is not None
+
+    def status(self):
+        """
+        Get the pool sizes and the cold-start and handout latencies.
+        """
+        with self._lock:
+            return {
+                "images": {image: {"idle": len(pool["idle"]), "starting": pool["starting"],
+                                   "in_use": sum(1 for entry in self.in_use.values() if entry["image"] == image)}
+                           for image, pool in self.pools.items()},
+                "latency": {name: summarize(values) for name, values in self.stats.items()},
+            }
+
+    def stop(self):
+        """
+        Stop replenishing and remove every container of the pool, idle or handed out.
+        """
+        self._stopped.set()
+        self._wake.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            entries = [entry for pool in self.pools.values() for entry in pool["idle"]] + list(self.in_use.values())
+            for pool in self.pools.values():
+                pool["idle"].clear()
+            self.in_use.clear()
+        for entry in entries:
+            self._remove(entry["container"])
+        return len(entries)
+
+class ControlHandler(BaseHTTPRequestHandler):
+    """
+    JSON control API of the warm pool:
+        POST /acquire {"image": "repository/image:tag"}
+        POST /release {"name": "<container name>"}
+        GET  /status
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            return body if isinstance(body, dict) else {}
+        except ValueError:
+            return {}
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send(200, self.server.pool.status())
+        else:
+            self._send(404, {"detail": "Not found"})
+
+    def do_POST(self):
+        body = self._read_json()
+        if self.path == "/acquire":
+            try:
+                repository, image, tag = parse_image(body.get("image") or "")
+                full_tag = f"{self.server.registry_address}/{repository}/{image}:{tag}"
+                self._send(200, self.server.pool.acquire(full_tag))
+            except click.BadParameter as e:
+                self._send(400, {"detail": e.message})
+            except UnknownImageError:
+                self._send(404, {"detail": f"Image {body.get('image')} is not managed by this pool"})
+            except (PodNotReadyError, docker.errors.APIError) as e:
+                self._send(503, {"detail": str(e)})
+        elif self.path == "/release":
+            if self.server.pool.release(body.get("name")):
+                self._send(200, {"released": body.get("name")})
+            else:
+                self._send(404, {"detail": f"Container {body.get('name')} was not handed out by this pool"})
+        else:
+            self._send(404, {"detail": "Not found"})
+
+    def log_message(self, format, *args):
+        pass
+
+@click.command()
+@click.option("-i", "--image", "images", required=True, multiple=True, help="Image to keep warm, as repository/image[:tag] (repeatable)")
+@click.option("-s", "--size", default=2, show_default=True, type=click.IntRange(min=0), help="Idle containers to keep per image")
+@click.option("-p", "--port", default=8700, show_default=True, type=int, help="Port of the control API")
+@click.option("--idle-timeout", default=600.0, show_default=True, type=click.FloatRange(min=0, min_open=True), help="Seconds without an acquire before an image's idle containers are reaped")
+@click.option("--ready-path", default="/agent_card", show_default=True, help="Pod endpoint polled until a container is ready")
+@click.option("--ready-timeout", default=120.0, show_default=True, type=click.FloatRange(min=0), help="Seconds to wait for a container to become ready")
+@click.option("--start-workers", default=4, show_default=True, type=click.IntRange(min=1), help="Containers started at once")
+@click.option("--pull", type=click.Choice(["always", "missing", "never"]), default="always", show_default=True, help="Pull policy for the images, as in deploy")
+@click.pass_context
+def warm_pool(ctx, images, size, port, idle_timeout, ready_path, ready_timeout, start_workers, pull):
+    """
+    Keep pre-started pod containers ready and hand them out through a local API.
+
+    For every --image, --size containers are started and polled until ready, and the
+    pool is replenished in the background as containers are handed out. Images that
+    are not requested for --idle-timeout seconds have their idle containers reaped.
+
+    The control API on --port hands out containers (POST /acquire with
+    {"image": "repository/image:tag"}), removes them (POST /release with {"name": ...})
+    and reports pool sizes with the cold-start and handout latencies (GET /status).
+    Ctrl+C removes every container of the pool and prints the latencies.
+    """
+    registry_address = ctx.obj['registry_address']
+    client = docker.from_env()
+
+    full_tags = []
+    try:
+        for spec in images:
+            repository, image, tag = parse_image(spec)
+            pull_image(client, registry_address, repository, image, tag, pull=pull)
+            full_tags.append(f"{registry_address}/{repository}/{image}:{tag}")
+    except click.BadParameter as e:
+        click.echo(f"Error: {e.message}", err=True)
+        ctx.exit(1)
+    except docker.errors.APIError as e:
+        click.echo(f"Error pulling image: {str(e)}", err=True)
+        ctx.exit(1)
+
+    pool = WarmPool(client, full_tags, size=size, idle_timeout=idle_timeout, ready_path=ready_path,
+                    ready_timeout=ready_timeout, start_workers=start_workers, name_prefix=f"gen-warm-{port}")
+    server = ThreadingHTTPServer(("127.0.0.1", port), ControlHandler)
+    server.daemon_threads = True
+    server.pool = pool
+    server.registry_address = registry_address
+
+    stale = pool.remove_stale()
+    if stale:
+        click.echo(f"Removed {stale} containers left by a previous warm pool")
+    pool.start()
+    click.echo(f"Warming {size} containers for each of {len(full_tags)} images")
+    click.echo(f"Control API on http://127.0.0.1:{port} (POST /acquire, POST /release, GET /status); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\nStopping warm pool...")
+    finally:
+        server.server_close()
+        status = pool.status()
+        removed = pool.stop()
+        click.echo(f"Removed {removed} containers")
+        for name, stats in status["latency"].items():
+            if stats["count"]:
+                click.echo(f"  {name.replace('_', ' '):<13} {stats['count']:>5}  p50 {stats['p50_ms']} ms  p95 {stats['p95_ms']} ms  max {stats['max_ms']} ms")
@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Modules that only the commands themselves need
+HEAVY_MODULES = ["docker", "requests", "yaml", "gen_cli.build", "gen_cli.build_many", "gen_cli.deploy",
+                 "gen_cli.list", "gen_cli.catalog", "gen_cli.bench", "gen_cli.warm_pool", "gen_cli.cards"]
+
+def run_help(tmp_path):
+    """
+    Run `gen-cli --help` in a fresh interpreter and return the heavy modules it imported.
+    """
+    script = (
+        "import sys, json\n"
+        "from gen_cli.main import cli\n"
+        "try:\n"
+        "    cli(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC, "HOME": str(tmp_path), "XDG_CONFIG_HOME": str(tmp_path)}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+    return result.stdout, json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_help_lists_every_command(tmp_path):
+    from gen_cli.main import COMMANDS
+    output, _ = run_help(tmp_path)
+    for name in COMMANDS:
+        assert name in output
+
+def test_help_imports_no_command_modules(tmp_path):
+    _, imported = run_help(tmp_path)
+    assert imported == []
@@ -10,10 +10,11 @@ setup(
         "pydantic==2.9.2",
         "crewai==0.63.6",
         "uvicorn==0.30.6",
+        "httpx>=0.27.0",
     ],
     author="Daniel Alves",
     author_email="daniel@gensphere.io",
-    description="TO-DO",
+    description="A SDK to build flows of GenSphere pods and Python functions",
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/gen-sdk",
@@ -0,0 +1,26 @@
+"""
+gen_flow_sdk
+
+A SDK to build complex flows from simple blocks: deployed GenSphere pods and
+local Python functions.
+
+A flow is a DAG of nodes whose edges map output fields of a node to input
+fields of another. Edges are validated against each pod's /agent_card schema
+before anything runs, and independent branches run concurrently on asyncio.
+
+Modules:
+    flow: Contains the Flow class that validates and executes a DAG of nodes.
+    nodes: Provides PodNode (a pod called through /execute) and CallableNode (a Python function).
+    exceptions: Defines the errors raised while validating or running a flow.
+
+Classes:
+    Flow: A workflow of nodes and edges.
+    PodNode: A deployed GenSphere pod.
+    CallableNode: A local sync or async Python function.
+"""
+
+from .exceptions import FlowError, FlowValidationError, NodeExecutionError
+from .flow import Flow
+from .nodes import CallableNode, PodNode
+
+__all__ = ['Flow', 'PodNode', 'CallableNode', 'FlowError', 'FlowValidationError', 'NodeExecutionError']
@@ -0,0 +1,21 @@
+class FlowError(Exception):
+    """Base class of the errors raised by gen-flow-sdk"""
+    pass
+
+class FlowValidationError(FlowError):
+    """Raised when a flow is not a valid DAG, or its edges don't match the node schemas"""
+    pass
+
+class NodeExecutionError(FlowError):
+    """Raised when a node of a flow fails"""
+
+    def __init__(self, node, message):
+        """
+        Initialize the error.
+
+        Args:
+            node (str): Name of the node that failed
+            message (str): What went wrong
+        """
+        super().__init__(f"Node '{node}' failed: {message}")
+        self.node = node
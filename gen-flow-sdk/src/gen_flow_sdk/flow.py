@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+import httpx
+from .exceptions import FlowValidationError, NodeExecutionError
+from .nodes import Node, is_compatible
+
+logger = logging.getLogger(__name__)
+
+class Edge:
+    """
+    A dependency between two nodes, mapping output fields of the source to input fields of the target.
+    """
+
+    def __init__(self, source: str, target: str, mapping: Dict[str, str]):
+        self.source = source
+        self.target = target
+        self.mapping = mapping
+
+    def __repr__(self):
+        return f"Edge({self.source!r} -> {self.target!r}, {self.mapping})"
+
+class Flow:
+    """
+    A workflow of pods and Python functions, executed as a DAG on asyncio.
+
+    A node runs as soon as all the nodes it depends on have finished, so independent
+    branches run concurrently, up to `concurrency` nodes at a time.
+
+    Usage:
+        flow = Flow(concurrency=4)
+        flow.add(PodNode("research", "http://localhost:8001"))
+        flow.add(CallableNode("summarize", summarize))
+        flow.connect("research", "summarize", {"report": "text"})
+        results = asyncio.run(flow.run({"research": {"topic": "AI agents"}}))
+    """
+
+    def __init__(self, concurrency: int = 8, timeout: float = 30.0):
+        """
+        Initialize an empty flow.
+
+        Args:
+            concurrency (int): Maximum number of nodes executing at once
+            timeout (float): Seconds to wait for agent cards and connections; PodNode sets
+                its own /execute timeout
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.nodes: Dict[str, Node] = {}
+        self.edges: List[Edge] = []
+
+    def add(self, node: Node) -> Node:
+        """
+        Add a node to the flow.
+
+        Returns:
+            Node: The node, to keep a reference to it
+
+        Raises:
+            FlowValidationError: If the flow already has a node with the same name
+        """
+        if node.name in self.nodes:
+            raise FlowValidationError(f"The flow already has a node named '{node.name}'")
+        self.nodes[node.name] = node
+        return node
+
+    def connect(self, source: str, target: str, mapping: Dict[str, str]) -> Edge:
+        """
+        Feed output fields of a node to input fields of another.
+
+        Args:
+            source (str): Name of the node producing the values
+            target (str): Name of the node consuming them
+            mapping (Dict[str, str]): Output field of the source -> input field of the target
+
+        Returns:
+            Edge: The new edge
+
+        Raises:
+            FlowValidationError: If a node is unknown or the mapping is empty
+        """
+        for name in (source, target):
+            if name not in self.nodes:
+                raise FlowValidationError(f"The flow has no node named '{name}'")
+        if not mapping:
+            raise FlowValidationError(f"The edge {source} -> {target} maps no fields")
+        edge = Edge(source, target, dict(mapping))
+        self.edges.append(edge)
+        return edge
+
+    def topological_order(self) -> List[str]:
+        """
+        Order the nodes so that every node comes after the nodes it depends on.
+
+        Raises:
+            FlowValidationError: If the edges form a cycle
+        """
+        in_degree = {name: 0 for name in self.nodes}
+        dependents = {name: [] for name in self.nodes}
+        for edge in self.edges:
+            in_degree[edge.target] += 1
+            dependents[edge.source].append(edge.target)
+
+        order = [name for name, degree in in_degree.items() if degree == 0]
+        for name in order:
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    order.append(dependent)
+        if len(order) < len(self.nodes):
+            # The nodes left are on a cycle or depend on one
+            blocked = [name for name, degree in in_degree.items() if degree > 0]
+            raise FlowValidationError(f"The flow has a cycle; these nodes can't be ordered: {', '.join(blocked)}")
+        return order
+
+    async def validate(self, inputs: Optional[Dict[str, Dict[str, Any]]] = None,
+                       client: Optional[httpx.AsyncClient] = None) -> List[str]:
+        """
+        Check that the flow is a DAG whose edges and inputs match the node schemas.
+
+        The agent cards of all pods are fetched concurrently. Every mapped field must exist
+        on both nodes with compatible types, no input may be fed twice, and every required
+        input must come from an edge or from `inputs`.
+
+        Args:
+            inputs (Dict[str, Dict[str, Any]], optional): Input values given to nodes, by node name
+            client (httpx.AsyncClient, optional): Client to fetch the agent cards with
+
+        Returns:
+            List[str]: The node names in execution order
+
+        Raises:
+            FlowValidationError: If the flow is not valid
+        """
+        inputs = inputs or {}
+        order = self.topological_order()
+        unknown = set(inputs) - set(self.nodes)
+        if unknown:
+            raise FlowValidationError(f"Inputs were given to unknown nodes: {', '.join(sorted(unknown))}")
+
+        if client is None:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                await asyncio.gather(*(node.load_schema(client) for node in self.nodes.values()))
+        else:
+            await asyncio.gather(*(node.load_schema(client) for node in self.nodes.values()))
+
+        errors = []
+        fed = {name: {field: "flow inputs" for field in inputs.get(name, {})} for name in self.nodes}
+        for edge in self.edges:
+            source, target = self.nodes[edge.source], self.nodes[edge.target]
+            for output_field, input_field in edge.mapping.items():
+                description = f"{edge.source}.{output_field} -> {edge.target}.{input_field}"
+                if output_field not in source.outputs:
+                    errors.append(f"{description}: '{edge.source}' has no output '{output_field}' (outputs: {', '.join(source.outputs)})")
+                elif input_field not in target.inputs and not target.accepts_any_input:
+                    errors.append(f"{description}: '{edge.target}' has no input '{input_field}' (inputs: {', '.join(target.inputs)})")
+                elif not is_compatible(source.outputs[output_field], target.inputs.get(input_field, "Any")):
+                    errors.append(f"{description}: type {source.outputs[output_field]} doesn't match {target.inputs[input_field]}")
+                if input_field in fed[edge.target]:
+                    errors.append(f"{description}: '{input_field}' is already fed by {fed[edge.target][input_field]}")
+                fed[edge.target][input_field] = edge.source
+
+        for name in order:
+            missing = self.nodes[name].required - set(fed[name])
+            if missing:
+                errors.append(f"'{name}' has no value for its required inputs {', '.join(sorted(missing))}")
+        if errors:
+            raise FlowValidationError("Invalid flow:\n  " + "\n  ".join(errors))
+        return order
+
+    async def run(self, inputs: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Validate and execute the flow.
+
+        Each node is started as soon as the nodes it depends on have finished, with at most
+        `concurrency` nodes executing at once. If a node fails, the nodes still running are
+        cancelled and the error is raised.
+
+        Args:
+            inputs (Dict[str, Dict[str, Any]], optional): Input values given to nodes, by node
+                name, for the inputs that no edge feeds
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The outputs of every node, by node name
+
+        Raises:
+            FlowValidationError: If the flow is not valid
+            NodeExecutionError: If a node fails
+        """
+        inputs = inputs or {}
+        incoming = {name: [edge for edge in self.edges if edge.target == name] for name in self.nodes}
+        results: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def execute(name):
+            node = self.nodes[name]
+            await asyncio.gather(*(tasks[edge.source] for edge in incoming[name]))
+            payload = dict(inputs.get(name, {}))
+            for edge in incoming[name]:
+                for output_field, input_field in edge.mapping.items():
+                    payload[input_field] = results[edge.source][output_field]
+
+            async with semaphore:
+                logger.info(f"Running node {name}")
+                started = time.monotonic()
+                output = await node.run(payload, client)
+            logger.info(f"Node {name} finished in {time.monotonic() - started:.2f}s")
+
+            # Dependents read these fields, so a pod that doesn't return them fails here
+            missing = [field for edge in self.edges if edge.source == name for field in edge.mapping if field not in output]
+            if missing:
+                raise NodeExecutionError(name, f"Output is missing the fields {', '.join(sorted(set(missing)))}")
+            results[name] = output
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            order = await self.validate(inputs, client)
+            started = time.monotonic()
+            # Tasks are created in topological order, so the tasks a node waits for already exist
+            for name in order:
+                tasks[name] = asyncio.create_task(execute(name))
+            try:
+                await asyncio.gather(*tasks.values())
+            except BaseException:
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+                raise
+        logger.info(f"Flow of {len(order)} nodes finished in {time.monotonic() - started:.2f}s")
+        return results
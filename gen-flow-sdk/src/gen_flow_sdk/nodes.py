@@ -0,0 +1,207 @@
+import asyncio
+import inspect
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+import httpx
+from .exceptions import FlowValidationError, NodeExecutionError
+
+ANY = "Any"
+
+def type_name(annotation) -> str:
+    """
+    Get the name a schema uses for a type, as pods report it in their agent card (e.g. "str").
+
+    Args:
+        annotation: A type, a type name, or inspect.Parameter.empty
+
+    Returns:
+        str: The type name, or "Any" for missing and generic annotations
+    """
+    if annotation is inspect.Parameter.empty or annotation is Any or annotation is None:
+        return ANY
+    if isinstance(annotation, str):
+        return annotation
+    return getattr(annotation, "__name__", ANY)
+
+def is_compatible(output_type: str, input_type: str) -> bool:
+    """
+    Check whether a value of an output type can be passed to an input type.
+    """
+    return ANY in (output_type, input_type) or output_type == input_type or (output_type, input_type) == ("int", "float")
+
+class Node(ABC):
+    """
+    A step of a flow, with a name and an input/output schema.
+
+    Subclasses implement run, and load_schema if their schema isn't known up front.
+
+    Attributes:
+        name (str): Unique name of the node in its flow
+        inputs (Dict[str, str]): Input field names and type names, None until the schema is loaded
+        required (set): Input fields that must be given a value
+        outputs (Dict[str, str]): Output field names and type names, None until the schema is loaded
+        accepts_any_input (bool): Whether input fields missing from the schema are accepted
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.inputs: Optional[Dict[str, str]] = None
+        self.required: set = set()
+        self.outputs: Optional[Dict[str, str]] = None
+        self.accepts_any_input = False
+
+    async def load_schema(self, client: httpx.AsyncClient):
+        """
+        Load the input/output schema of the node, if it isn't known yet.
+
+        Args:
+            client (httpx.AsyncClient): Client to make HTTP requests with
+        """
+
+    @abstractmethod
+    async def run(self, inputs: Dict[str, Any], client: httpx.AsyncClient) -> Dict[str, Any]:
+        """
+        Execute the node.
+
+        Args:
+            inputs (Dict[str, Any]): Values of the input fields
+            client (httpx.AsyncClient): Client to make HTTP requests with
+
+        Returns:
+            Dict[str, Any]: Values of the output fields
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+class PodNode(Node):
+    """
+    A deployed GenSphere pod, called through its /execute endpoint.
+
+    The schema comes from the pod's /agent_card, whose expected_inputs and
+    expected_output list the fields of /execute as name/type pairs.
+    """
+
+    def __init__(self, name: str, url: str, timeout: float = 600.0):
+        """
+        Initialize the node.
+
+        Args:
+            name (str): Unique name of the node in its flow
+            url (str): Base URL of the pod, e.g. http://localhost:8000
+            timeout (float): Seconds to wait for /execute to answer
+        """
+        super().__init__(name)
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.agent_card: Optional[Dict[str, Any]] = None
+
+    async def load_schema(self, client: httpx.AsyncClient):
+        """
+        Fetch the pod's agent card and read its input and output fields.
+
+        Raises:
+            FlowValidationError: If the agent card can't be fetched or doesn't describe the fields
+        """
+        if self.agent_card is not None:
+            return
+        try:
+            response = await client.get(f"{self.url}/agent_card")
+            response.raise_for_status()
+            card = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise FlowValidationError(f"Could not read the agent card of node '{self.name}' at {self.url}: {str(e)}")
+
+        fields = {}
+        for key in ("expected_inputs", "expected_output"):
+            if not isinstance(card.get(key), list):
+                raise FlowValidationError(f"The agent card of node '{self.name}' at {self.url} has no {key} list")
+            fields[key] = {field["name"]: field.get("type") or ANY for field in card[key]}
+        self.agent_card = card
+        self.inputs = fields["expected_inputs"]
+        # The pod's input model declares every field as required
+        self.required = set(self.inputs)
+        self.outputs = fields["expected_output"]
+
+    async def run(self, inputs: Dict[str, Any], client: httpx.AsyncClient) -> Dict[str, Any]:
+        """
+        Call the pod's /execute endpoint with the inputs.
+
+        Raises:
+            NodeExecutionError: If the pod can't be reached or answers with an error
+        """
+        try:
+            response = await client.post(f"{self.url}/execute", json=inputs, timeout=self.timeout)
+        except httpx.HTTPError as e:
+            raise NodeExecutionError(self.name, f"{type(e).__name__} calling {self.url}/execute")
+        if response.is_error:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise NodeExecutionError(self.name, f"HTTP {response.status_code} from {self.url}/execute: {detail}")
+        try:
+            return response.json()
+        except ValueError:
+            raise NodeExecutionError(self.name, f"{self.url}/execute didn't answer with JSON")
+
+class CallableNode(Node):
+    """
+    A local Python function, sync or async.
+
+    The inputs are the function's parameters, passed as keyword arguments, with types
+    from their annotations. Sync functions run in a worker thread, so they don't block
+    concurrent branches of the flow.
+    """
+
+    def __init__(self, name: str, func: Callable, outputs: Union[Dict[str, Any], Iterable[str], None] = None):
+        """
+        Initialize the node.
+
+        Args:
+            name (str): Unique name of the node in its flow
+            func (Callable): The function to call
+            outputs (dict or list, optional): Output field names, with their types if a dict.
+                Defaults to a single "result" field of the function's return annotation.
+                A function with one output field may return the bare value; otherwise it
+                must return a dict of the output fields.
+        """
+        super().__init__(name)
+        self.func = func
+        signature = inspect.signature(func)
+        parameters = [parameter for parameter in signature.parameters.values()
+                      if parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)]
+        self.inputs = {parameter.name: type_name(parameter.annotation) for parameter in parameters}
+        self.required = {parameter.name for parameter in parameters if parameter.default is parameter.empty}
+        # A **kwargs function accepts any extra input field
+        self.accepts_any_input = any(parameter.kind == parameter.VAR_KEYWORD for parameter in signature.parameters.values())
+
+        if outputs is None:
+            outputs = {"result": signature.return_annotation}
+        if isinstance(outputs, dict):
+            self.outputs = {field: type_name(annotation) for field, annotation in outputs.items()}
+        else:
+            self.outputs = {field: ANY for field in outputs}
+
+    async def run(self, inputs: Dict[str, Any], client: httpx.AsyncClient) -> Dict[str, Any]:
+        """
+        Call the function with the inputs as keyword arguments.
+
+        Raises:
+            NodeExecutionError: If the function raises, or doesn't return its output fields
+        """
+        try:
+            if inspect.iscoroutinefunction(self.func):
+                value = await self.func(**inputs)
+            else:
+                value = await asyncio.to_thread(self.func, **inputs)
+        except Exception as e:
+            raise NodeExecutionError(self.name, f"{type(e).__name__}: {str(e)}") from e
+
+        if len(self.outputs) == 1:
+            field = next(iter(self.outputs))
+            if not (isinstance(value, dict) and field in value):
+                return {field: value}
+        if not isinstance(value, dict):
+            raise NodeExecutionError(self.name, f"Expected a dict with the fields {', '.join(self.outputs)}, got {type(value).__name__}")
+        return value
@@ -1,26 +1,24 @@
-from fastapi import FastAPI, HTTPException
-from pymongo import MongoClient
-from pydantic import BaseModel
-from typing import Dict, Any, List
+from fastapi import FastAPI, HTTPException, Query, Request
+from pydantic import BaseModel, ValidationError
+from typing import Dict, Any, List, Optional
 import os
-from bson.json_util import dumps
 import json
 import logging
 from urllib.parse import unquote
+from storage import create_store_from_env
+from compression import CompressionMiddleware
+from caching import cached_json_response, latest_build_date, parse_build_date
 
 # Configure logging
-logging.basicConfig(level=logging.INFO,
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(),
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.environ.get("COMPRESSION_MIN_SIZE", "1024")))
 
-# MongoDB connection
-mongo_uri = os.environ.get("MONGO_URI", "mongodb://mongodb:27017/")
-logger.info(f"Connecting to MongoDB at: {mongo_uri}")
-mongo_client = MongoClient(mongo_uri)
-db = mongo_client["gensphere"]
-collection = db["agent-card"]
+# Agent card storage (MongoDB by default, see storage.create_store_from_env)
+store = create_store_from_env()
 
 class AgentCard(BaseModel):
     author: str
@@ -36,6 +34,9 @@ class AgentCardPayload(BaseModel):
     expected_output: Dict[str, Any]
     build_date: str
 
+class AgentCardLookup(BaseModel):
+    ids: List[str]
+
 @app.post("/agent_card")
 async def create_agent_card(payload: AgentCardPayload):
     logger.info(f"Received request to create agent card for image: {payload.image_full_tag}")
@@ -48,35 +49,29 @@ async def create_agent_card(payload: AgentCardPayload):
         
         logger.debug(f"Storing agent card: {json.dumps(agent_card_dict, indent=2)}")
         
-        # Store agent card in MongoDB
-        result = collection.replace_one({"_id": payload.image_full_tag}, agent_card_dict, upsert=True)
+        # Store agent card
+        store.put(agent_card_dict)
         
-        if result.acknowledged:
-            logger.info(f"Agent card stored successfully for image: {payload.image_full_tag}")
-            return {"message": "Agent card stored successfully", "id": payload.image_full_tag}
-        else:
-            logger.error(f"Failed to store agent card for image: {payload.image_full_tag}")
-            raise HTTPException(status_code=500, detail="Failed to store agent card")
+        logger.info(f"Agent card stored successfully for image: {payload.image_full_tag}")
+        return {"message": "Agent card stored successfully", "id": payload.image_full_tag}
     except Exception as e:
         logger.exception(f"Error storing agent card: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/agent_card/{image_full_tag:path}")
-async def get_agent_card(image_full_tag: str):
+async def get_agent_card(image_full_tag: str, request: Request):
     logger.info(f"Received request to get agent card for image: {image_full_tag}")
     try:
         # Decode the URL-encoded image_full_tag
         decoded_image_full_tag = unquote(image_full_tag)
         logger.debug(f"Decoded image_full_tag: {decoded_image_full_tag}")
         
-        # Retrieve the agent card from MongoDB
-        agent_card = collection.find_one({"_id": decoded_image_full_tag})
+        # Retrieve the agent card
+        agent_card = store.get(decoded_image_full_tag)
         
         if agent_card:
             logger.info(f"Agent card found for image: {decoded_image_full_tag}")
-            # Convert ObjectId to string for JSON serialization
-            agent_card_json = json.loads(dumps(agent_card))
-            return agent_card_json
+            return cached_json_response(request, agent_card, parse_build_date(agent_card.get("build_date")))
         else:
             logger.warning(f"Agent card not found for image: {decoded_image_full_tag}")
             raise HTTPException(status_code=404, detail=f"Agent card not found for image_full_tag: {decoded_image_full_tag}")
@@ -84,23 +79,99 @@ async def get_agent_card(image_full_tag: str):
         logger.exception(f"Error retrieving agent card: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/agent_cards/bulk")
+async def create_agent_cards_bulk(payloads: List[Any]):
+    logger.info(f"Received request to bulk store {len(payloads)} agent cards")
+    if not payloads:
+        return {"message": "No agent cards to store", "stored": 0, "failed": 0, "results": []}
+
+    # Items are validated one by one, so a malformed card doesn't reject the whole batch
+    results = [None] * len(payloads)
+    agent_cards = []
+    indexes = []
+    for index, item in enumerate(payloads):
+        try:
+            payload = AgentCardPayload.model_validate(item)
+        except ValidationError as e:
+            card_id = item.get("image_full_tag") if isinstance(item, dict) else None
+            results[index] = {"id": card_id, "status": "failed", "error": str(e)}
+            continue
+        agent_card_dict = payload.model_dump()
+        agent_card_dict["_id"] = payload.image_full_tag
+        agent_cards.append(agent_card_dict)
+        indexes.append(index)
+
+    try:
+        # A failing item does not stop the others from being stored
+        stored = store.put_many(agent_cards)
+    except Exception as e:
+        logger.exception(f"Error bulk storing agent cards: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    for index, result in zip(indexes, stored):
+        results[index] = result
+
+    failed = sum(1 for result in results if result["status"] == "failed")
+    logger.info(f"Bulk stored {len(payloads) - failed} agent cards, {failed} failed")
+    return {
+        "message": "Agent cards processed",
+        "stored": len(payloads) - failed,
+        "failed": failed,
+        "results": results
+    }
+
+def _parse_ids(ids: Optional[List[str]]):
+    """
+    Normalize ids given as repeated query parameters and/or comma-separated values.
+    """
+    if ids is None:
+        return None
+    return [unquote(card_id.strip()) for value in ids for card_id in value.split(",") if card_id.strip()]
+
 @app.get("/agent_cards", response_model=List[Dict[str, Any]])
-async def get_all_agent_cards():
-    logger.info("Received request to get all agent cards")
+async def get_all_agent_cards(request: Request, ids: Optional[List[str]] = Query(None), q: Optional[str] = None, limit: int = Query(100, ge=1, le=1000)):
+    requested_ids = _parse_ids(ids)
     try:
-        # Retrieve all agent cards from MongoDB
-        agent_cards = list(collection.find())
-        
-        if agent_cards:
-            logger.info(f"Found {len(agent_cards)} agent cards")
-            # Convert ObjectId to string for JSON serialization
-            agent_cards_json = json.loads(dumps(agent_cards))
-            return agent_cards_json
+        # Retrieve the agent cards in a single query
+        if requested_ids is not None:
+            logger.info(f"Received request to get {len(requested_ids)} agent cards")
+            agent_cards_json = store.get_many(requested_ids)
+        elif q:
+            logger.info(f"Received request to search agent cards for: {q}")
+            agent_cards_json = store.search(q, limit=limit)
+        else:
+            logger.info("Received request to get all agent cards")
+            agent_cards_json = store.list_all()
+
+        if agent_cards_json:
+            logger.info(f"Found {len(agent_cards_json)} agent cards")
         else:
             logger.info("No agent cards found")
-            return []
+        return cached_json_response(request, agent_cards_json, latest_build_date(agent_cards_json))
+    except Exception as e:
+        logger.exception(f"Error retrieving agent cards: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/agent_cards/lookup", response_model=List[Dict[str, Any]])
+async def lookup_agent_cards(lookup: AgentCardLookup):
+    logger.info(f"Received request to look up {len(lookup.ids)} agent cards")
+    try:
+        agent_cards_json = store.get_many(lookup.ids)
+        logger.info(f"Found {len(agent_cards_json)} of {len(lookup.ids)} agent cards")
+        return agent_cards_json
+    except Exception as e:
+        logger.exception(f"Error looking up agent cards: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/catalog", response_model=List[Dict[str, Any]])
+async def get_catalog(request: Request):
+    logger.info("Received request to get the catalog index")
+    try:
+        # Precomputed by indexer.py: one entry per repository:tag with its card summary
+        catalog = store.list_catalog()
+        logger.info(f"Found {len(catalog)} catalog entries")
+        return cached_json_response(request, catalog, latest_build_date(catalog))
     except Exception as e:
-        logger.exception(f"Error retrieving all agent cards: {str(e)}")
+        logger.exception(f"Error retrieving the catalog index: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
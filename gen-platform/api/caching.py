@@ -0,0 +1,91 @@
+"""
+HTTP caching helpers for the API service.
+
+cached_json_response serializes a JSON payload and adds Cache-Control, ETag and
+Last-Modified headers, answering 304 Not Modified when the client's validators
+still match.
+"""
+
+import datetime
+import hashlib
+import os
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+# Seconds clients may reuse a response before revalidating it
+CACHE_MAX_AGE = int(os.environ.get("CACHE_MAX_AGE", "30"))
+
+def parse_build_date(build_date):
+    """
+    Parse an ISO 8601 build date into an aware UTC datetime, or None if invalid.
+    """
+    if not build_date:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(build_date)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.UTC)
+    return parsed.astimezone(datetime.UTC).replace(microsecond=0)
+
+def latest_build_date(agent_cards):
+    """
+    Most recent build date among the given agent cards, or None.
+    """
+    dates = [date for date in (parse_build_date(card.get("build_date")) for card in agent_cards) if date]
+    return max(dates) if dates else None
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" refer to the same representation
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+def _not_modified_since(if_modified_since, last_modified):
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=datetime.UTC)
+    return last_modified <= since
+
+def cached_json_response(request: Request, content, last_modified=None, max_age=None):
+    """
+    Build a JSON response with caching headers, or a 304 if the client copy is current.
+
+    Args:
+        request (Request): The incoming request, for its conditional headers
+        content: JSON-serializable payload
+        last_modified (datetime, optional): When the payload last changed
+        max_age (int, optional): Cache-Control max-age, defaults to CACHE_MAX_AGE
+
+    Returns:
+        Response: A 200 JSONResponse or an empty 304 response
+    """
+    response = JSONResponse(content)
+    # Weak ETag: the representation may be re-encoded by the compression middleware
+    etag = f'W/"{hashlib.sha256(response.body).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={CACHE_MAX_AGE if max_age is None else max_age}",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        not_modified = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,151 @@
+"""
+Negotiated response compression for the API service.
+
+CompressionMiddleware compresses response bodies above a size threshold with the
+best encoding the client accepts. gzip is always available; brotli and zstd are
+used when the optional `brotli` and `zstandard` packages are installed.
+"""
+
+import gzip
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+def available_encodings():
+    """
+    Encodings supported by this installation, in order of server preference.
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header into a dict of encoding -> q-value.
+    """
+    accepted = {}
+    for item in header.split(","):
+        parts = [part.strip() for part in item.split(";")]
+        coding = parts[0].lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+def choose_encoding(header, encodings):
+    """
+    Pick the encoding to use for an Accept-Encoding header, or None for identity.
+
+    The highest q-value wins; ties go to the server preference order.
+    """
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(body, encoding, level=None):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level or 3).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=level or 4)
+    return gzip.compress(body, compresslevel=level or 6)
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses larger than minimum_size bytes.
+
+    Responses are buffered before compression, which suits the JSON bodies of the API
+    service. Responses that already carry a Content-Encoding are left untouched.
+    """
+
+    def __init__(self, app, minimum_size=1024, level=None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.encodings = available_encodings()
+        logger.info(f"Response compression enabled for: {', '.join(self.encodings)}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict((key.decode("latin-1").lower(), value.decode("latin-1")) for key, value in scope["headers"])
+        encoding = choose_encoding(headers.get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        body = []
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            await send_start_and_body(start_message, b"".join(body))
+
+        async def send_start_and_body(start, payload):
+            response_headers = [(key, value) for key, value in start["headers"]]
+            header_names = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in response_headers}
+            content_type = header_names.get("content-type", "")
+
+            should_compress = (
+                len(payload) >= self.minimum_size
+                and "content-encoding" not in header_names
+                and start["status"] not in (204, 304)
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if should_compress:
+                payload = compress(payload, encoding, self.level)
+                response_headers = [(key, value) for key, value in response_headers if key.lower() != b"content-length"]
+                response_headers.append((b"content-encoding", encoding.encode("latin-1")))
+                response_headers.append((b"content-length", str(len(payload)).encode("latin-1")))
+
+            vary = header_names.get("vary")
+            if vary is None:
+                response_headers.append((b"vary", b"Accept-Encoding"))
+            elif "accept-encoding" not in vary.lower():
+                response_headers = [(key, value) for key, value in response_headers if key.lower() != b"vary"]
+                response_headers.append((b"vary", f"{vary}, Accept-Encoding".encode("latin-1")))
+
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": payload})
+
+        await self.app(scope, receive, send_compressed)
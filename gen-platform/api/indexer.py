@@ -0,0 +1,203 @@
+"""
+Background indexer for the GenSphere catalog.
+
+Periodically syncs the registry catalog, the GenSphere image labels and the agent
+cards into a single catalog index held by the agent card store, so the hub can
+read one precomputed view instead of querying the registry and the API per image.
+
+Syncs are incremental: every tag is revalidated with a HEAD request for its
+manifest digest, and manifests and config blobs are only fetched for tags whose
+digest changed since the previous sync.
+
+Run it as a service next to the API (same storage settings):
+    python indexer.py
+"""
+
+import datetime
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from storage import create_store_from_env
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MANIFEST_MEDIA_TYPE = "application/vnd.docker.distribution.manifest.v2+json"
+FULL_TAG_LABEL = "org.gensphere.img-full-tag"
+BUILD_DATE_LABEL = "org.gensphere.build-date"
+
+# Agent card fields copied into the catalog index; the full card stays in the store
+CARD_SUMMARY_FIELDS = ["author", "description", "image", "tag", "url"]
+
+class RegistryIndexer:
+    """
+    Materializes the registry catalog and agent cards into the catalog index.
+    """
+
+    def __init__(self, store, registry_url, page_size=100, workers=16, timeout=10):
+        """
+        Initialize the indexer.
+
+        Args:
+            store (AgentCardStore): Store holding the agent cards and the catalog index
+            registry_url (str): Base URL of the Docker registry
+            page_size (int): Entries per catalog/tags page
+            workers (int): Concurrent registry requests
+            timeout (float): Registry request timeout in seconds
+        """
+        self.store = store
+        self.registry_url = registry_url.rstrip("/")
+        self.page_size = page_size
+        self.workers = workers
+        self.timeout = timeout
+
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(["GET", "HEAD"]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _get(self, url, **kwargs):
+        response = self.session.get(url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _paginate(self, path, key):
+        url, params = f"{self.registry_url}{path}", {"n": self.page_size}
+        while url:
+            response = self._get(url, params=params)
+            yield from response.json().get(key) or []
+            next_url = response.links.get("next", {}).get("url")
+            url, params = (urljoin(url, next_url), None) if next_url else (None, None)
+
+    def list_images(self):
+        """
+        List every (repository, tag) pair of the registry.
+        """
+        repositories = list(self._paginate("/v2/_catalog", "repositories"))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            tags = executor.map(lambda repository: list(self._paginate(f"/v2/{repository}/tags/list", "tags")), repositories)
+            return [(repository, tag) for repository, repository_tags in zip(repositories, tags) for tag in repository_tags]
+
+    def resolve_digest(self, repository, tag):
+        """
+        Get the manifest digest of a tag with a single HEAD request.
+        """
+        response = self.session.head(f"{self.registry_url}/v2/{repository}/manifests/{tag}",
+                                     headers={"Accept": MANIFEST_MEDIA_TYPE}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.headers.get("Docker-Content-Digest")
+
+    def describe_image(self, repository, tag, digest):
+        """
+        Fetch the manifest and config of an image and extract its catalog fields.
+        """
+        manifest = self._get(f"{self.registry_url}/v2/{repository}/manifests/{digest or tag}",
+                             headers={"Accept": MANIFEST_MEDIA_TYPE}).json()
+        config_digest = manifest["config"]["digest"]
+        config = self._get(f"{self.registry_url}/v2/{repository}/blobs/{config_digest}").json()
+        labels = (config.get("config") or {}).get("Labels") or {}
+        return {
+            "_id": f"{repository}:{tag}",
+            "repository": repository,
+            "tag": tag,
+            "digest": digest,
+            "image_full_tag": labels.get(FULL_TAG_LABEL),
+            "build_date": labels.get(BUILD_DATE_LABEL),
+            "size": manifest["config"].get("size", 0) + sum(layer.get("size", 0) for layer in manifest.get("layers", [])),
+            "layers": len(manifest.get("layers", [])),
+        }
+
+    def sync(self):
+        """
+        Run one incremental sync of the catalog index.
+
+        Returns:
+            dict: Counts of added, updated, removed, unchanged and failed entries
+        """
+        started = time.monotonic()
+        existing = {entry["_id"]: entry for entry in self.store.list_catalog()}
+        images = self.list_images()
+
+        def index(image):
+            repository, tag = image
+            entry_id = f"{repository}:{tag}"
+            try:
+                digest = self.resolve_digest(repository, tag)
+                previous = existing.get(entry_id)
+                if previous and digest and previous.get("digest") == digest:
+                    return dict(previous)
+                return self.describe_image(repository, tag, digest)
+            except (requests.RequestException, ValueError, KeyError) as e:
+                logger.warning(f"Failed to index {entry_id}: {str(e)}")
+                # Keep serving the last known entry until the image can be read again
+                return existing.get(entry_id)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            entries = [entry for entry in executor.map(index, images) if entry]
+        failed = len(images) - len(entries)
+
+        # Join the agent cards in one query
+        full_tags = [entry["image_full_tag"] for entry in entries if entry.get("image_full_tag")]
+        cards = {card["_id"]: card for card in self.store.get_many(full_tags)}
+        now = datetime.datetime.now(datetime.UTC).isoformat()
+        changed = []
+        for entry in entries:
+            card = cards.get(entry.get("image_full_tag"))
+            entry["agent_card"] = {field: card["agent_card"].get(field) for field in CARD_SUMMARY_FIELDS} if card else None
+            entry["card_build_date"] = card.get("build_date") if card else None
+
+            previous = existing.get(entry["_id"])
+            comparable = {key: value for key, value in entry.items() if key != "indexed_at"}
+            if previous is None or comparable != {key: value for key, value in previous.items() if key != "indexed_at"}:
+                entry["indexed_at"] = now
+                changed.append(entry)
+
+        # Tags gone from the registry leave the index
+        current = {f"{repository}:{tag}" for repository, tag in images}
+        removed = [entry_id for entry_id in existing if entry_id not in current]
+
+        self.store.put_catalog_entries(changed)
+        self.store.delete_catalog_entries(removed)
+
+        stats = {
+            "added": sum(1 for entry in changed if entry["_id"] not in existing),
+            "updated": sum(1 for entry in changed if entry["_id"] in existing),
+            "removed": len(removed),
+            "unchanged": len(entries) - len(changed),
+            "failed": failed,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        logger.info(f"Catalog sync complete: {json.dumps(stats)}")
+        return stats
+
+    def run_forever(self, interval):
+        """
+        Sync the catalog index every `interval` seconds until interrupted.
+        """
+        logger.info(f"Indexing {self.registry_url} every {interval}s")
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                logger.exception(f"Catalog sync failed: {str(e)}")
+            time.sleep(interval)
+
+if __name__ == "__main__":
+    indexer = RegistryIndexer(
+        create_store_from_env(),
+        os.environ.get("REGISTRY_URL", "http://registry:5000"),
+        page_size=int(os.environ.get("REGISTRY_PAGE_SIZE", "100")),
+        workers=int(os.environ.get("INDEXER_WORKERS", "16")),
+    )
+    indexer.run_forever(float(os.environ.get("INDEXER_INTERVAL", "60")))
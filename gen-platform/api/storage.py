@@ -0,0 +1,405 @@
+"""
+Storage backends for agent cards.
+
+The API service talks to an AgentCardStore instead of a database driver, so the
+same endpoints can run on MongoDB (the default) or on an embedded SQLite file
+for small deployments and CI runs that don't want a Mongo container.
+
+Agent cards are plain dicts keyed by their "_id" (the image full tag). The store
+also holds the catalog index materialized by the background indexer, whose
+entries are keyed by "repository:tag".
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Agent card fields covered by full-text search
+SEARCH_FIELDS = ["author", "description", "image", "tag"]
+
+class StorageError(Exception):
+    """Custom exception for storage backend errors"""
+    pass
+
+class AgentCardStore(ABC):
+    """
+    Interface implemented by every agent card storage backend.
+    """
+
+    @abstractmethod
+    def put(self, agent_card: Dict[str, Any]) -> str:
+        """
+        Insert or replace a single agent card.
+
+        Args:
+            agent_card (dict): Agent card document including its "_id"
+
+        Returns:
+            str: "created" if the card is new, "updated" otherwise
+
+        Raises:
+            StorageError: If the card could not be stored
+        """
+
+    @abstractmethod
+    def put_many(self, agent_cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert or replace many agent cards in one batch.
+
+        A failing card does not prevent the others from being stored.
+
+        Args:
+            agent_cards (list): Agent card documents including their "_id"
+
+        Returns:
+            list: One {"id", "status"[, "error"]} entry per card, in input order
+        """
+
+    @abstractmethod
+    def get(self, card_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single agent card by id, or None if it doesn't exist.
+        """
+
+    @abstractmethod
+    def get_many(self, card_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get many agent cards by id, in the order requested. Unknown ids are skipped.
+        """
+
+    @abstractmethod
+    def list_all(self) -> List[Dict[str, Any]]:
+        """
+        Get every stored agent card.
+        """
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Full-text search over the author, description, image and tag of the cards.
+
+        Every term of the query must match; terms match as prefixes.
+        """
+
+    @abstractmethod
+    def list_catalog(self) -> List[Dict[str, Any]]:
+        """
+        Get every entry of the catalog index, ordered by id.
+        """
+
+    @abstractmethod
+    def put_catalog_entries(self, entries: List[Dict[str, Any]]):
+        """
+        Insert or replace catalog index entries (keyed by their "_id").
+        """
+
+    @abstractmethod
+    def delete_catalog_entries(self, entry_ids: List[str]):
+        """
+        Remove catalog index entries by id.
+        """
+
+    def close(self):
+        """
+        Release the resources held by the backend.
+        """
+
+def _search_terms(query):
+    return re.findall(r"\w+", query.lower())
+
+class MongoAgentCardStore(AgentCardStore):
+    """
+    Agent card storage backed by a MongoDB collection.
+    """
+
+    def __init__(self, uri, database="gensphere", collection="agent-card", catalog_collection="catalog"):
+        from pymongo import MongoClient
+
+        logger.info(f"Connecting to MongoDB at: {uri}")
+        self.client = MongoClient(uri)
+        self.collection = self.client[database][collection]
+        self.catalog = self.client[database][catalog_collection]
+
+    @staticmethod
+    def _to_json(documents):
+        # Convert BSON types (e.g. ObjectId) to plain JSON values
+        from bson.json_util import dumps
+        return json.loads(dumps(documents))
+
+    def put(self, agent_card):
+        result = self.put_many([agent_card])[0]
+        if result["status"] == "failed":
+            raise StorageError(f"Failed to store agent card {agent_card['_id']}: {result['error']}")
+        return result["status"]
+
+    def put_many(self, agent_cards):
+        import bson
+        from pymongo import ReplaceOne
+        from pymongo.errors import BulkWriteError
+
+        if not agent_cards:
+            return []
+
+        # A card that can't be encoded would fail the whole bulk_write, so it fails alone here
+        errors = {}
+        indexes = []
+        for index, card in enumerate(agent_cards):
+            try:
+                bson.encode(card)
+                indexes.append(index)
+            except (bson.errors.InvalidDocument, TypeError, ValueError, OverflowError) as e:
+                errors[index] = str(e)
+
+        # One unordered bulk_write for the whole batch; upserts are matched by _id
+        upserted = set()
+        operations = [ReplaceOne({"_id": agent_cards[index]["_id"]}, agent_cards[index], upsert=True) for index in indexes]
+        try:
+            if operations:
+                result = self.collection.bulk_write(operations, ordered=False)
+                upserted = set(result.upserted_ids.values())
+        except BulkWriteError as e:
+            upserted = {item["_id"] for item in e.details.get("upserted", [])}
+            # Error indexes refer to the operations, not to agent_cards
+            errors.update({indexes[error["index"]]: error.get("errmsg", "Unknown error") for error in e.details.get("writeErrors", [])})
+            logger.warning(f"Bulk write completed with {len(errors)} errors")
+
+        results = []
+        for index, card in enumerate(agent_cards):
+            if index in errors:
+                results.append({"id": card["_id"], "status": "failed", "error": errors[index]})
+            else:
+                results.append({"id": card["_id"], "status": "created" if card["_id"] in upserted else "updated"})
+        return results
+
+    def get(self, card_id):
+        agent_card = self.collection.find_one({"_id": card_id})
+        return self._to_json(agent_card) if agent_card else None
+
+    def get_many(self, card_ids):
+        agent_cards = {card["_id"]: card for card in self.collection.find({"_id": {"$in": list(card_ids)}})}
+        return self._to_json([agent_cards[card_id] for card_id in dict.fromkeys(card_ids) if card_id in agent_cards])
+
+    def list_all(self):
+        return self._to_json(list(self.collection.find().sort("_id")))
+
+    def search(self, query, limit=100):
+        terms = _search_terms(query)
+        if not terms:
+            return []
+        conditions = [
+            {"$or": [{f"agent_card.{field}": {"$regex": f"\\b{re.escape(term)}", "$options": "i"}} for field in SEARCH_FIELDS]}
+            for term in terms
+        ]
+        return self._to_json(list(self.collection.find({"$and": conditions}).limit(limit)))
+
+    def list_catalog(self):
+        return self._to_json(list(self.catalog.find().sort("_id")))
+
+    def put_catalog_entries(self, entries):
+        from pymongo import ReplaceOne
+
+        if entries:
+            self.catalog.bulk_write([ReplaceOne({"_id": entry["_id"]}, entry, upsert=True) for entry in entries], ordered=False)
+
+    def delete_catalog_entries(self, entry_ids):
+        if entry_ids:
+            self.catalog.delete_many({"_id": {"$in": list(entry_ids)}})
+
+    def close(self):
+        self.client.close()
+
+class SQLiteAgentCardStore(AgentCardStore):
+    """
+    Agent card storage embedded in a SQLite file.
+
+    Cards are stored as JSON documents (JSON1) and indexed in an FTS5 table kept in
+    sync by triggers. When the SQLite build lacks FTS5, search falls back to LIKE.
+    """
+
+    def __init__(self, path):
+        logger.info(f"Opening SQLite agent card store at: {path}")
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS agent_cards ("
+            "id TEXT PRIMARY KEY, "
+            "doc TEXT NOT NULL CHECK (json_valid(doc)))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS catalog ("
+            "id TEXT PRIMARY KEY, "
+            "doc TEXT NOT NULL CHECK (json_valid(doc)))"
+        )
+        self.fts_enabled = self._create_fts()
+
+    def _create_fts(self):
+        columns = ", ".join(SEARCH_FIELDS)
+        values = ", ".join(f"json_extract(new.doc, '$.agent_card.{field}')" for field in SEARCH_FIELDS)
+        try:
+            self._conn.executescript(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS agent_cards_fts USING fts5(id UNINDEXED, {columns});
+                CREATE TRIGGER IF NOT EXISTS agent_cards_ai AFTER INSERT ON agent_cards BEGIN
+                    INSERT INTO agent_cards_fts (id, {columns}) VALUES (new.id, {values});
+                END;
+                CREATE TRIGGER IF NOT EXISTS agent_cards_ad AFTER DELETE ON agent_cards BEGIN
+                    DELETE FROM agent_cards_fts WHERE id = old.id;
+                END;
+                CREATE TRIGGER IF NOT EXISTS agent_cards_au AFTER UPDATE ON agent_cards BEGIN
+                    DELETE FROM agent_cards_fts WHERE id = old.id;
+                    INSERT INTO agent_cards_fts (id, {columns}) VALUES (new.id, {values});
+                END;
+            """)
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 not available, falling back to LIKE search: {str(e)}")
+            return False
+
+    def _upsert(self, agent_cards):
+        # Must be called with the lock held and inside a transaction
+        ids = [card["_id"] for card in agent_cards]
+        existing = set()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            existing.update(row[0] for row in self._conn.execute(
+                f"SELECT id FROM agent_cards WHERE id IN ({placeholders})", chunk))
+
+        results = []
+        for card in agent_cards:
+            try:
+                self._conn.execute(
+                    "INSERT INTO agent_cards (id, doc) VALUES (?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET doc = excluded.doc",
+                    (card["_id"], json.dumps(card))
+                )
+                results.append({"id": card["_id"], "status": "updated" if card["_id"] in existing else "created"})
+                existing.add(card["_id"])
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                results.append({"id": card["_id"], "status": "failed", "error": str(e)})
+        return results
+
+    def put(self, agent_card):
+        result = self.put_many([agent_card])[0]
+        if result["status"] == "failed":
+            raise StorageError(f"Failed to store agent card {agent_card['_id']}: {result['error']}")
+        return result["status"]
+
+    def put_many(self, agent_cards):
+        if not agent_cards:
+            return []
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                results = self._upsert(agent_cards)
+                self._conn.execute("COMMIT")
+                return results
+            except sqlite3.Error as e:
+                # BEGIN itself may have failed, leaving no transaction to roll back
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise StorageError(f"Failed to store agent cards: {str(e)}") from e
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [json.loads(row[0]) for row in self._conn.execute(sql, params)]
+
+    def get(self, card_id):
+        rows = self._query("SELECT doc FROM agent_cards WHERE id = ?", (card_id,))
+        return rows[0] if rows else None
+
+    def get_many(self, card_ids):
+        ordered_ids = list(dict.fromkeys(card_ids))
+        agent_cards = {}
+        for start in range(0, len(ordered_ids), 500):
+            chunk = ordered_ids[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for card in self._query(f"SELECT doc FROM agent_cards WHERE id IN ({placeholders})", chunk):
+                agent_cards[card["_id"]] = card
+        return [agent_cards[card_id] for card_id in ordered_ids if card_id in agent_cards]
+
+    def list_all(self):
+        return self._query("SELECT doc FROM agent_cards ORDER BY id")
+
+    def search(self, query, limit=100):
+        terms = _search_terms(query)
+        if not terms:
+            return []
+        if self.fts_enabled:
+            match = " ".join(f'"{term}"*' for term in terms)
+            return self._query(
+                "SELECT a.doc FROM agent_cards_fts f JOIN agent_cards a ON a.id = f.id "
+                "WHERE agent_cards_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                (match, limit)
+            )
+
+        conditions = " AND ".join(
+            "(" + " OR ".join(f"lower(json_extract(doc, '$.agent_card.{field}')) LIKE ?" for field in SEARCH_FIELDS) + ")"
+            for _ in terms
+        )
+        params = [f"%{term}%" for term in terms for _ in SEARCH_FIELDS]
+        # LIKE matches anywhere in a word; keep the cards where every term starts a word, as FTS5 and Mongo do
+        patterns = [re.compile(rf"\b{re.escape(term)}", re.IGNORECASE) for term in terms]
+        matches = [
+            card for card in self._query(f"SELECT doc FROM agent_cards WHERE {conditions}", params)
+            if all(any(pattern.search(str((card.get("agent_card") or {}).get(field) or "")) for field in SEARCH_FIELDS)
+                   for pattern in patterns)
+        ]
+        return matches[:limit]
+
+    def list_catalog(self):
+        return self._query("SELECT doc FROM catalog ORDER BY id")
+
+    def _write_catalog(self, sql, rows):
+        if not rows:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise StorageError(f"Failed to update the catalog: {str(e)}") from e
+
+    def put_catalog_entries(self, entries):
+        self._write_catalog(
+            "INSERT INTO catalog (id, doc) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET doc = excluded.doc",
+            [(entry["_id"], json.dumps(entry)) for entry in entries]
+        )
+
+    def delete_catalog_entries(self, entry_ids):
+        self._write_catalog("DELETE FROM catalog WHERE id = ?", [(entry_id,) for entry_id in entry_ids])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def create_store_from_env():
+    """
+    Create the agent card store selected by the STORAGE_BACKEND environment variable.
+
+    STORAGE_BACKEND=mongo (default) uses MONGO_URI; STORAGE_BACKEND=sqlite uses SQLITE_PATH.
+
+    Returns:
+        AgentCardStore: The configured storage backend
+
+    Raises:
+        StorageError: If the backend name is unknown
+    """
+    backend = os.environ.get("STORAGE_BACKEND", "mongo").lower()
+    if backend == "mongo":
+        return MongoAgentCardStore(os.environ.get("MONGO_URI", "mongodb://mongodb:27017/"))
+    if backend == "sqlite":
+        return SQLiteAgentCardStore(os.environ.get("SQLITE_PATH", "gensphere.db"))
+    raise StorageError(f"Unknown storage backend: {backend}")
@@ -1,11 +1,189 @@
 import streamlit as st
-from utils.registry_client import RegistryClient
-from utils.api import get_agent_card
+from utils import cache
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Page sizes offered by the browse view
+PAGE_SIZES = [25, 50, 100]
+
+def render_agent_card(agent_card, image_full_tag):
+    """
+    Render the full agent card of an image.
+    """
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"**👤 Author:** {agent_card['agent_card']['author']}")
+        st.markdown(f"**🖼️ Image:** {agent_card['agent_card']['image']}")
+        st.markdown(f"**🏷️ Tag:** {agent_card['agent_card']['tag']}")
+    with col2:
+        st.markdown(f"**🔗 URL:** [{agent_card['agent_card']['url']}]({agent_card['agent_card']['url']})")
+        st.markdown(f"**🏗️ Build Date:** {agent_card['build_date']}")
+        st.markdown(f"**🔖 Full Image Tag:** `{image_full_tag}`")
+    
+    st.markdown("**📝 Description:**")
+    st.info(agent_card['agent_card']['description'])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**📥 Expected Inputs:**")
+        st.json(agent_card['expected_inputs'])
+    with col2:
+        st.markdown("**📤 Expected Output:**")
+        st.json(agent_card['expected_output'])
+
+def render_run_command(repository, tag):
+    """
+    Render the gen-cli command that deploys an image.
+    """
+    st.markdown("<h3 class='sub-header'>🚀 How to run this Agent</h3>", unsafe_allow_html=True)
+    st.code(f"gen-cli deploy -r {repository.split('/')[0]} -i {repository.split('/')[1]} -t {tag} -p 8081 -n container_1", language="bash")
+
+def catalog_rows(catalog):
+    """
+    Flatten catalog index entries into table rows for the browse view.
+    """
+    rows = []
+    for entry in catalog:
+        card = entry.get("agent_card") or {}
+        rows.append({
+            "Agent": entry["repository"],
+            "Tag": entry["tag"],
+            "Author": card.get("author") or "",
+            "Description": card.get("description") or "",
+            "Build Date": (entry.get("build_date") or "")[:19].replace("T", " "),
+            "Size (MB)": round(entry.get("size", 0) / (1024 * 1024), 1),
+            "image_full_tag": entry.get("image_full_tag"),
+            # The indexer sets agent_card to None for images without a stored card
+            "has_card": entry.get("agent_card") is not None,
+        })
+    return rows
+
+def filter_rows(rows, query, authors, only_with_card):
+    """
+    Keep the rows matching every search term and the selected filters.
+    """
+    terms = query.lower().split()
+    filtered = []
+    for row in rows:
+        if authors and row["Author"] not in authors:
+            continue
+        if only_with_card and not row["has_card"]:
+            continue
+        haystack = f"{row['Agent']} {row['Tag']} {row['Author']} {row['Description']}".lower()
+        if all(term in haystack for term in terms):
+            filtered.append(row)
+    return filtered
+
+def render_browse():
+    """
+    Render the catalog-wide browse view, fed by the indexer's catalog in one request.
+    """
+    catalog = cache.get_catalog()
+    if catalog is None:
+        st.warning("⚠️ The catalog index is unavailable. Use the repository view instead.")
+        return
+    if not catalog:
+        st.info("ℹ️ The catalog index is empty. New images appear once the indexer has synced the registry.")
+        return
+
+    rows = catalog_rows(catalog)
+    logger.info(f"Loaded {len(rows)} catalog entries")
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        query = st.text_input("🔎 Search agents", placeholder="Search by name, tag, author or description")
+    with col2:
+        authors = st.multiselect("👤 Author", sorted({row["Author"] for row in rows if row["Author"]}))
+    with col3:
+        only_with_card = st.checkbox("With agent card only", value=True)
+
+    filtered = filter_rows(rows, query, authors, only_with_card)
+    if not filtered:
+        st.info("ℹ️ No agents match your search.")
+        return
+
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES)
+    page_count = (len(filtered) + page_size - 1) // page_size
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    with col3:
+        st.caption(f"{len(filtered)} of {len(rows)} agents · page {page} of {page_count}")
+
+    page_rows = filtered[(page - 1) * page_size:page * page_size]
+    event = st.dataframe(
+        page_rows,
+        use_container_width=True,
+        hide_index=True,
+        column_order=["Agent", "Tag", "Author", "Description", "Build Date", "Size (MB)"],
+        on_select="rerun",
+        selection_mode="single-row",
+        key="catalog_table",
+    )
+
+    selected = event.selection.rows if event else []
+    if not selected or selected[0] >= len(page_rows):
+        st.caption("Select a row to see the full agent card.")
+        return
+
+    # Full details are only fetched for the selected row
+    row = page_rows[selected[0]]
+    st.markdown(f"<h3 class='sub-header'>📋 {row['Agent']}:{row['Tag']}</h3>", unsafe_allow_html=True)
+    agent_card = cache.get_agent_card(row["image_full_tag"]) if row["image_full_tag"] else None
+    if agent_card:
+        render_agent_card(agent_card, row["image_full_tag"])
+    else:
+        st.info("ℹ️ No agent card information found for this Agent.")
+    render_run_command(row["Agent"], row["Tag"])
+
+def render_repository_view():
+    """
+    Render the repository/tag picker showing one agent card at a time.
+
+    The details and agent cards of all tags of the selected repository are fetched
+    concurrently in one go, so switching tags doesn't go back to the network.
+    """
+    repositories = cache.list_repositories()
+    logger.info(f"Found {len(repositories)} repositories")
+
+    if repositories:
+        selected_repo = st.selectbox("📦 Select a repository", repositories)
+        tag_cards = cache.get_repository_cards(selected_repo)
+        logger.info(f"Found {len(tag_cards)} tags for repository {selected_repo}")
+
+        if tag_cards:
+            selected_tag = st.selectbox("🏷️ Select a tag", list(tag_cards))
+            labels = tag_cards[selected_tag]["labels"]
+
+            st.markdown("<h3 class='sub-header'>📋 Agent Card</h3>", unsafe_allow_html=True)
+
+            if labels is None:
+                st.warning("⚠️ Failed to fetch the image details of this tag.")
+            elif labels:
+                image_full_tag = labels.get("org.gensphere.img-full-tag")
+                if image_full_tag:
+                    agent_card = tag_cards[selected_tag]["agent_card"]
+                    if agent_card:
+                        render_agent_card(agent_card, image_full_tag)
+                    else:
+                        st.warning("⚠️ Failed to fetch agent card information.")
+                else:
+                    st.warning("⚠️ No org.gensphere.img-full-tag label found for this image.")
+            else:
+                st.info("ℹ️ No agent card information found for this Agent.")
+                logger.warning(f"No labels found for {selected_repo}:{selected_tag}")
+
+            render_run_command(selected_repo, selected_tag)
+        else:
+            st.warning("⚠️ No tags found for this repository.")
+            logger.warning(f"No tags found for repository {selected_repo}")
+    else:
+        st.warning("⚠️ No repositories found in the registry.")
+        logger.warning("No repositories found in the registry")
+
 def main():
     """
     Main function to render the Agent Repository page.
@@ -51,72 +229,20 @@ def main():
 
     st.markdown("<h1 class='main-header'>🤖 AI Agent Hub</h1>", unsafe_allow_html=True)
 
-    client = RegistryClient()
-    try:
-        repositories = client.list_repositories()
-        logger.info(f"Found {len(repositories)} repositories")
-
-        if repositories:
-            selected_repo = st.selectbox("📦 Select a repository", repositories)
-            tags = client.list_tags(selected_repo)
-            logger.info(f"Found {len(tags)} tags for repository {selected_repo}")
-
-            if tags:
-                selected_tag = st.selectbox("🏷️ Select a tag", tags)
-                details = client.get_image_details(selected_repo, selected_tag)
-                logger.info(f"Retrieved details for {selected_repo}:{selected_tag}")
-
-                st.markdown("<h3 class='sub-header'>📋 Agent Card</h3>", unsafe_allow_html=True)
-                
-                # Check for labels in the config
-                labels = None
-                if 'config' in details and 'config' in details['config'] and 'Labels' in details['config']['config']:
-                    labels = details['config']['config']['Labels']
-                
-                if labels and isinstance(labels, dict):
-                    image_full_tag = labels.get("org.gensphere.img-full-tag")
-                    if image_full_tag:
-                        agent_card = get_agent_card(image_full_tag)
-                        if agent_card:
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.markdown(f"**👤 Author:** {agent_card['agent_card']['author']}")
-                                st.markdown(f"**🖼️ Image:** {agent_card['agent_card']['image']}")
-                                st.markdown(f"**🏷️ Tag:** {agent_card['agent_card']['tag']}")
-                            with col2:
-                                st.markdown(f"**🔗 URL:** [{agent_card['agent_card']['url']}]({agent_card['agent_card']['url']})")
-                                st.markdown(f"**🏗️ Build Date:** {agent_card['build_date']}")
-                                st.markdown(f"**🔖 Full Image Tag:** `{image_full_tag}`")
-                            
-                            st.markdown("**📝 Description:**")
-                            st.info(agent_card['agent_card']['description'])
-                            
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.markdown("**📥 Expected Inputs:**")
-                                st.json(agent_card['expected_inputs'])
-                            with col2:
-                                st.markdown("**📤 Expected Output:**")
-                                st.json(agent_card['expected_output'])
-                        else:
-                            st.warning("⚠️ Failed to fetch agent card information.")
-                    else:
-                        st.warning("⚠️ No org.gensphere.img-full-tag label found for this image.")
-                else:
-                    st.info("ℹ️ No agent card information found for this Agent.")
-                    logger.warning(f"No labels found for {selected_repo}:{selected_tag}")
+    # Registry and API results are cached across reruns; this forces fresh data
+    if st.sidebar.button("🔄 Refresh data"):
+        cache.clear_cache()
+        logger.info("Cleared cached registry and API data")
 
-                st.markdown("<h3 class='sub-header'>🚀 How to run this Agent</h3>", unsafe_allow_html=True)
-                st.code(f"gen-cli deploy -r {selected_repo.split('/')[0]} -i {selected_repo.split('/')[1]} -t {selected_tag} -p 8081 -n container_1", language="bash")
-            else:
-                st.warning("⚠️ No tags found for this repository.")
-                logger.warning(f"No tags found for repository {selected_repo}")
-        else:
-            st.warning("⚠️ No repositories found in the registry.")
-            logger.warning("No repositories found in the registry")
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-        logger.error(f"An error occurred while rendering the Agent Repository page: {str(e)}", exc_info=True)
+    browse_tab, repository_tab = st.tabs(["🔎 Browse all agents", "📦 Browse by repository"])
+    # Each tab handles its own errors, so a failure in one still renders the other
+    for tab, render, label in ((browse_tab, render_browse, "browse"), (repository_tab, render_repository_view, "repository")):
+        with tab:
+            try:
+                render()
+            except Exception as e:
+                st.error(f"An error occurred: {str(e)}")
+                logger.error(f"An error occurred while rendering the {label} tab of the Agent Repository page: {str(e)}", exc_info=True)
 
 if __name__ == "__main__":
     main()
@@ -4,9 +4,14 @@ This package contains utility modules for the GenSphere Platform application.
 Modules:
     registry_client: Provides a client for interacting with the Docker registry API.
     api: Provides functions for interacting with the GenSphere API service.
+    blob_cache: Provides a content-addressed disk cache for registry manifests and blobs.
+    async_client: Provides an asyncio client for the registry and API service with bounded concurrency.
+    cache: Provides Streamlit-cached wrappers around the registry and API calls for the pages.
 """
 
 from .registry_client import RegistryClient
-from .api import get_agent_card
+from .blob_cache import BlobCache
+from .async_client import AsyncGenSphereClient
+from .api import get_agent_card, get_catalog
 
-__all__ = ['RegistryClient', 'get_agent_card']
\ No newline at end of file
+__all__ = ['RegistryClient', 'BlobCache', 'AsyncGenSphereClient', 'get_agent_card', 'get_catalog']
\ No newline at end of file
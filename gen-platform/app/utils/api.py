@@ -2,15 +2,35 @@ import os
 import requests
 import logging
 
-def get_agent_card(image_full_tag):
+def get_agent_card(image_full_tag, session=None):
     """
     Fetch agent card information from the API service.
+
+    Pass a requests.Session to reuse pooled connections across calls.
     """
     API_SERVICE_URL = os.environ.get("API_SERVICE_URL", "http://api_service:8000")
+    http = session or requests
     try:
-        response = requests.get(f"{API_SERVICE_URL}/agent_card/{image_full_tag}")
+        response = http.get(f"{API_SERVICE_URL}/agent_card/{image_full_tag}")
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         logging.error(f"Error fetching agent card: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+def get_catalog(session=None):
+    """
+    Fetch the catalog index materialized by the background indexer.
+
+    Returns a list with one entry per repository:tag, including the image labels
+    and a summary of its agent card, or None if the API service is unreachable.
+    """
+    API_SERVICE_URL = os.environ.get("API_SERVICE_URL", "http://api_service:8000")
+    http = session or requests
+    try:
+        response = http.get(f"{API_SERVICE_URL}/catalog")
+        response.raise_for_status()
+        return response.json()
+    except requests.RequestException as e:
+        logging.error(f"Error fetching catalog: {str(e)}")
+        return None
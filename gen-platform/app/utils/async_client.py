@@ -0,0 +1,301 @@
+import os
+import json
+import random
+import asyncio
+import logging
+import httpx
+from .blob_cache import BlobCache
+from .registry_client import MANIFEST_MEDIA_TYPE, RegistryClientError
+
+# Statuses worth retrying: the registry or API is restarting or overloaded
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Image label holding the full tag an image's agent card is stored under
+IMG_FULL_TAG_LABEL = "org.gensphere.img-full-tag"
+
+_DEFAULT_CACHE = object()
+
+class AsyncGenSphereClient:
+    """
+    An asyncio client for the Docker registry v2 API and the GenSphere API service.
+
+    All requests share one pooled HTTP/1.1 keep-alive connection pool and a semaphore
+    bounding the requests in flight, so fan-out operations can overlap their network
+    calls without overwhelming either service. Failed requests are retried with
+    exponential backoff and full jitter.
+
+    Usage:
+        async with AsyncGenSphereClient() as client:
+            details = await client.get_repository_details("my-repository/job-researcher")
+    """
+
+    def __init__(self, registry_url=None, api_url=None, max_concurrency=20, timeout=10.0,
+                 max_retries=3, backoff=0.3, page_size=None, cache=_DEFAULT_CACHE):
+        """
+        Initialize the client with URLs from arguments or environment variables.
+
+        Args:
+            registry_url (str, optional): Registry base URL, defaults to REGISTRY_URL
+            api_url (str, optional): API service base URL, defaults to API_SERVICE_URL
+            max_concurrency (int): Maximum requests in flight (and pooled connections)
+            timeout (float): Request timeout in seconds
+            max_retries (int): Retries for connection errors and 429/5xx gateway responses
+            backoff (float): Base delay in seconds of the exponential backoff
+            page_size (int, optional): Entries per catalog/tags page, defaults to REGISTRY_PAGE_SIZE or 100
+            cache (BlobCache, optional): Digest-keyed cache for manifests and config blobs,
+                defaults to BlobCache.from_env(); pass None to disable caching
+        """
+        self.registry_url = registry_url or os.environ.get("REGISTRY_URL", "http://localhost:5001")
+        self.api_url = api_url or os.environ.get("API_SERVICE_URL", "http://api_service:8000")
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.page_size = page_size or int(os.environ.get("REGISTRY_PAGE_SIZE", "100"))
+        self.cache = BlobCache.from_env() if cache is _DEFAULT_CACHE else cache
+        self.logger = logging.getLogger(__name__)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+
+    async def close(self):
+        """
+        Close the pooled connections of the client.
+        """
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _request(self, method, url, **kwargs):
+        """
+        Make a request with bounded concurrency, retrying transient failures.
+
+        Args:
+            method (str): HTTP method
+            url (str): Absolute URL
+            **kwargs: Additional arguments to pass to httpx.AsyncClient.request
+
+        Returns:
+            httpx.Response: The successful response
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            # Full jitter spreads out the retries of concurrent callers
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    async def _registry_request(self, method, endpoint, **kwargs):
+        try:
+            return await self._request(method, f"{self.registry_url}{endpoint}", **kwargs)
+        except httpx.HTTPError as e:
+            self.logger.error(f"Error making request to {endpoint}: {str(e)}")
+            raise RegistryClientError(f"Failed to communicate with registry: {str(e)}")
+
+    async def _paginate(self, endpoint, key, page_size=None):
+        params = {"n": page_size or self.page_size}
+        while endpoint:
+            response = await self._registry_request("GET", endpoint, params=params)
+            try:
+                data = response.json()
+            except ValueError as e:
+                raise RegistryClientError(f"Invalid response from registry: {str(e)}")
+            for item in data.get(key) or []:
+                yield item
+            # The next page URL already carries the n and last parameters
+            next_url = response.links.get("next", {}).get("url")
+            if next_url:
+                url = httpx.URL(self.registry_url).join(next_url)
+                endpoint, params = url.raw_path.decode("ascii"), None
+            else:
+                endpoint = None
+
+    async def list_repositories(self, page_size=None):
+        """
+        List all repositories in the registry, following pagination.
+
+        Raises:
+            RegistryClientError: If there's an error listing repositories
+        """
+        return [repository async for repository in self._paginate("/v2/_catalog", "repositories", page_size)]
+
+    async def list_tags(self, repository, page_size=None):
+        """
+        List all tags of a repository, following pagination.
+
+        Raises:
+            RegistryClientError: If there's an error listing tags
+        """
+        return [tag async for tag in self._paginate(f"/v2/{repository}/tags/list", "tags", page_size)]
+
+    async def _get_by_digest(self, endpoint, digest, **kwargs):
+        cache = self.cache
+        data = None
+        if cache is not None:
+            try:
+                data = cache.get(digest)
+            except ValueError as e:
+                # A malformed digest can't be a cache key, but its content can still be fetched
+                self.logger.warning(f"Not caching {digest}: {str(e)}")
+                cache = None
+        if data is None:
+            data = (await self._registry_request("GET", endpoint, **kwargs)).content
+            if cache is not None:
+                cache.put(digest, data)
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise RegistryClientError(f"Invalid response from registry: {str(e)}")
+
+    async def get_manifest(self, repository, tag):
+        """
+        Get the manifest of an image, revalidating cached manifests with a HEAD request.
+
+        Raises:
+            RegistryClientError: If there's an error getting the manifest
+        """
+        headers = {"Accept": MANIFEST_MEDIA_TYPE}
+        endpoint = f"/v2/{repository}/manifests/{tag}"
+        if self.cache is not None:
+            digest = (await self._registry_request("HEAD", endpoint, headers=headers)).headers.get("Docker-Content-Digest")
+            if digest:
+                return await self._get_by_digest(f"/v2/{repository}/manifests/{digest}", digest, headers=headers)
+        response = await self._registry_request("GET", endpoint, headers=headers)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise RegistryClientError(f"Invalid response from registry: {str(e)}")
+
+    async def get_image_details(self, repository, tag):
+        """
+        Get the manifest and config of an image, as RegistryClient.get_image_details does.
+
+        Raises:
+            RegistryClientError: If there's an error getting image details
+        """
+        try:
+            manifest = await self.get_manifest(repository, tag)
+            config_digest = manifest['config']['digest']
+            blob = await self._get_by_digest(f"/v2/{repository}/blobs/{config_digest}", config_digest)
+            return {"manifest": manifest, "config": blob}
+        except (RegistryClientError, KeyError, TypeError) as e:
+            self.logger.error(f"Error getting image details for {repository}:{tag}: {str(e)}")
+            raise RegistryClientError(f"Failed to get image details for {repository}:{tag}") from e
+
+    async def get_images_details(self, images, return_exceptions=False):
+        """
+        Get details for many (repository, tag) pairs concurrently.
+
+        Args:
+            images (iterable): (repository, tag) pairs
+            return_exceptions (bool): Store failures as RegistryClientError values
+                instead of raising the first one
+
+        Returns:
+            dict: (repository, tag) -> image details, in input order
+        """
+        images = list(dict.fromkeys(images))
+        results = await asyncio.gather(*(self.get_image_details(*image) for image in images),
+                                       return_exceptions=return_exceptions)
+        return dict(zip(images, results))
+
+    async def get_repository_details(self, repository, return_exceptions=False):
+        """
+        Get details for all tags of a repository concurrently.
+
+        Returns:
+            dict: tag -> image details
+        """
+        tags = await self.list_tags(repository)
+        details = await self.get_images_details([(repository, tag) for tag in tags], return_exceptions)
+        return {tag: value for (_, tag), value in details.items()}
+
+    async def get_agent_card(self, image_full_tag):
+        """
+        Fetch the agent card of an image from the API service, or None on failure.
+        """
+        try:
+            response = await self._request("GET", f"{self.api_url}/agent_card/{image_full_tag}")
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            self.logger.error(f"Error fetching agent card: {str(e)}")
+            return None
+
+    async def get_agent_cards(self, image_full_tags, batch_size=200):
+        """
+        Fetch the agent cards of many images through the bulk lookup endpoint.
+
+        Lookups are split into batches that run concurrently.
+
+        Returns:
+            dict: image_full_tag -> agent card; images without a card are left out
+        """
+        image_full_tags = list(dict.fromkeys(image_full_tags))
+
+        async def lookup(batch):
+            try:
+                response = await self._request("POST", f"{self.api_url}/agent_cards/lookup", json={"ids": batch})
+                return response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                self.logger.error(f"Error fetching agent cards: {str(e)}")
+                return []
+
+        batches = [image_full_tags[start:start + batch_size] for start in range(0, len(image_full_tags), batch_size)]
+        results = await asyncio.gather(*(lookup(batch) for batch in batches))
+        return {card["_id"]: card for cards in results for card in cards}
+
+    async def get_cards_for_images(self, images):
+        """
+        Fetch the agent cards of many (repository, tag) pairs.
+
+        Image labels are resolved concurrently, then all cards are fetched in bulk.
+
+        Returns:
+            dict: (repository, tag) -> agent card, or None when the image has no card
+        """
+        details = await self.get_images_details(images, return_exceptions=True)
+        full_tags = {image: image_labels(value).get(IMG_FULL_TAG_LABEL)
+                     for image, value in details.items() if not isinstance(value, Exception)}
+        cards = await self.get_agent_cards([tag for tag in full_tags.values() if tag])
+        return {image: cards.get(full_tags.get(image)) for image in details}
+
+    async def get_repository_cards(self, repository):
+        """
+        Get the labels and agent card of every tag of a repository.
+
+        Image details are fetched concurrently, then all cards in bulk lookups.
+
+        Returns:
+            dict: tag -> {"labels": image labels, or None if the image details can't be
+                fetched, "agent_card": agent card, or None}, in tag order
+
+        Raises:
+            RegistryClientError: If the tags can't be listed
+        """
+        tags = await self.list_tags(repository)
+        details = await self.get_images_details([(repository, tag) for tag in tags], return_exceptions=True)
+        labels = {tag: None if isinstance(value, Exception) else image_labels(value) for (_, tag), value in details.items()}
+        cards = await self.get_agent_cards([tag_labels[IMG_FULL_TAG_LABEL] for tag_labels in labels.values()
+                                            if tag_labels and tag_labels.get(IMG_FULL_TAG_LABEL)])
+        return {tag: {"labels": tag_labels, "agent_card": cards.get((tag_labels or {}).get(IMG_FULL_TAG_LABEL))}
+                for tag, tag_labels in labels.items()}
+
+def image_labels(details):
+    """
+    Get the labels of an image from its details, or an empty dict if it has none.
+    """
+    labels = ((details.get("config") or {}).get("config") or {}).get("Labels")
+    return labels if isinstance(labels, dict) else {}
@@ -0,0 +1,143 @@
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+
+class BlobCache:
+    """
+    A content-addressed on-disk cache for registry manifests and blobs.
+
+    Entries are keyed by their immutable digest (e.g. "sha256:abc...") so they never
+    need revalidation. The cache is bounded in size and evicts the least recently
+    used entries first, using file modification times as the recency marker.
+    """
+
+    def __init__(self, cache_dir, max_bytes=256 * 1024 * 1024):
+        """
+        Initialize the cache in the given directory.
+
+        Args:
+            cache_dir (str): Directory holding the cached entries
+            max_bytes (int): Maximum total size of the cached entries
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    @classmethod
+    def from_env(cls):
+        """
+        Create the cache configured by REGISTRY_CACHE_DIR and REGISTRY_CACHE_MAX_BYTES.
+
+        Returns:
+            BlobCache: The cache, or None when REGISTRY_CACHE_DIR is set to an empty string
+        """
+        cache_dir = os.environ.get("REGISTRY_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "gensphere", "registry"))
+        if not cache_dir:
+            return None
+        max_bytes = int(os.environ.get("REGISTRY_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+        return cls(cache_dir, max_bytes)
+
+    def _path(self, digest):
+        algorithm, _, value = digest.partition(":")
+        if not value or not algorithm.isalnum() or not value.isalnum():
+            raise ValueError(f"Invalid digest: {digest}")
+        return os.path.join(self.cache_dir, algorithm, value)
+
+    def _entries(self):
+        for algorithm in os.listdir(self.cache_dir):
+            directory = os.path.join(self.cache_dir, algorithm)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.startswith("."):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_mtime, stat.st_size
+
+    def get(self, digest):
+        """
+        Get a cached entry by digest.
+
+        Args:
+            digest (str): Content digest of the entry
+
+        Returns:
+            bytes: The cached content, or None on a miss
+        """
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Mark the entry as recently used
+            os.utime(path)
+            self.hits += 1
+            return data
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+    def put(self, digest, data):
+        """
+        Store an entry under its digest, evicting old entries if the cache is full.
+
+        Content that doesn't match a sha256 digest is not cached.
+
+        Args:
+            digest (str): Content digest of the entry
+            data (bytes): The content
+        """
+        if digest.startswith("sha256:") and hashlib.sha256(data).hexdigest() != digest[len("sha256:"):]:
+            self.logger.warning(f"Not caching {digest}: content does not match its digest")
+            return
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            if os.path.exists(path):
+                # Same digest, same content: just mark it as recently used
+                os.utime(path)
+                return
+            # Write atomically so concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Must be called with the lock held
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self._size = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except FileNotFoundError:
+                pass
+        self.logger.info(f"Evicted registry cache entries, {self._size} bytes remaining")
+
+    def stats(self):
+        """
+        Get hit/miss counters and the current size of the cache.
+
+        Returns:
+            dict: Cache statistics
+        """
+        return {"hits": self.hits, "misses": self.misses, "size_bytes": self._size, "max_bytes": self.max_bytes}
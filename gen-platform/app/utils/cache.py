@@ -0,0 +1,100 @@
+"""
+Cached data layer for the Streamlit pages.
+
+Streamlit reruns the page script on every widget interaction. These wrappers keep
+registry and API results in st.cache_data with a TTL, and share the pooled
+clients across reruns and sessions with st.cache_resource, so repeat views don't
+go back to the network. Call clear_cache() to force fresh data.
+
+Fan-out lookups go through AsyncGenSphereClient so their requests overlap.
+"""
+
+import asyncio
+import os
+
+import requests
+import streamlit as st
+
+from . import api
+from .async_client import AsyncGenSphereClient
+from .registry_client import RegistryClient
+
+# Seconds before listings (repositories, tags, catalog) are refetched
+LISTING_TTL = int(os.environ.get("HUB_LISTING_TTL", "60"))
+# Seconds before image details and agent cards are refetched
+DETAILS_TTL = int(os.environ.get("HUB_DETAILS_TTL", "300"))
+
+class _NotCached(Exception):
+    """Raised inside cached functions so failed lookups are not cached"""
+    pass
+
+@st.cache_resource
+def get_registry_client():
+    """
+    Get the RegistryClient shared by every session, with its pooled connections.
+    """
+    return RegistryClient()
+
+@st.cache_resource
+def get_api_session():
+    """
+    Get the requests.Session shared by every session for API service calls.
+    """
+    return requests.Session()
+
+@st.cache_data(ttl=LISTING_TTL, show_spinner=False)
+def list_repositories():
+    return get_registry_client().list_repositories()
+
+@st.cache_data(ttl=DETAILS_TTL, show_spinner=False)
+def get_repository_cards(repository):
+    """
+    Get the labels and agent card of every tag of a repository, fetched concurrently.
+
+    Returns:
+        dict: tag -> {"labels", "agent_card"}, see AsyncGenSphereClient.get_repository_cards
+    """
+    async def fetch():
+        # The async client's connections belong to the event loop, so each fetch opens its own
+        async with AsyncGenSphereClient() as client:
+            return await client.get_repository_cards(repository)
+    return asyncio.run(fetch())
+
+@st.cache_data(ttl=DETAILS_TTL, show_spinner=False)
+def _get_agent_card(image_full_tag):
+    agent_card = api.get_agent_card(image_full_tag, session=get_api_session())
+    if agent_card is None:
+        raise _NotCached()
+    return agent_card
+
+def get_agent_card(image_full_tag):
+    """
+    Get an agent card, or None if it can't be fetched. Misses are not cached.
+    """
+    try:
+        return _get_agent_card(image_full_tag)
+    except _NotCached:
+        return None
+
+@st.cache_data(ttl=LISTING_TTL, show_spinner=False)
+def _get_catalog():
+    catalog = api.get_catalog(session=get_api_session())
+    if catalog is None:
+        raise _NotCached()
+    return catalog
+
+def get_catalog():
+    """
+    Get the catalog index, or None if it can't be fetched. Failures are not cached.
+    """
+    try:
+        return _get_catalog()
+    except _NotCached:
+        return None
+
+def clear_cache():
+    """
+    Drop every cached registry and API result; pooled clients are kept.
+    """
+    for cached in (list_repositories, get_repository_cards, _get_agent_card, _get_catalog):
+        cached.clear()
@@ -1,73 +1,213 @@
 import os
+import json
 import requests
 import logging
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib.parse import urlsplit
+from urllib3.util.retry import Retry
+from .blob_cache import BlobCache
 
 class RegistryClientError(Exception):
     """Custom exception for RegistryClient errors"""
     pass
 
+# Manifest media types accepted when resolving a tag
+MANIFEST_MEDIA_TYPE = "application/vnd.docker.distribution.manifest.v2+json"
+
+_DEFAULT_CACHE = object()
+
 class RegistryClient:
     """
     A client for interacting with the Docker registry API.
     """
 
-    def __init__(self):
+    def __init__(self, pool_size=None, max_retries=3, timeout=None, page_size=None, cache=_DEFAULT_CACHE):
         """
         Initialize the RegistryClient with the registry URL from environment variables.
+
+        Requests go through a pooled keep-alive session that retries idempotent calls
+        on connection errors and 5xx gateway responses.
+
+        Args:
+            pool_size (int, optional): Maximum pooled connections, defaults to REGISTRY_POOL_SIZE or 10
+            max_retries (int): Retries for failed GET/HEAD requests
+            timeout (float, optional): Request timeout in seconds, defaults to REGISTRY_TIMEOUT or 10
+            page_size (int, optional): Entries per catalog/tags page, defaults to REGISTRY_PAGE_SIZE or 100
+            cache (BlobCache, optional): Digest-keyed cache for manifests and config blobs,
+                defaults to BlobCache.from_env(); pass None to disable caching
         """
         self.registry_url = os.environ.get("REGISTRY_URL", "http://localhost:5001")
         self.logger = logging.getLogger(__name__)
+        self.pool_size = pool_size or int(os.environ.get("REGISTRY_POOL_SIZE", "10"))
+        self.timeout = timeout or float(os.environ.get("REGISTRY_TIMEOUT", "10"))
+        self.page_size = page_size or int(os.environ.get("REGISTRY_PAGE_SIZE", "100"))
+        self.cache = BlobCache.from_env() if cache is _DEFAULT_CACHE else cache
 
-    def _make_request(self, method, endpoint, **kwargs):
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"])
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
         """
-        Make a request to the registry API.
+        Close the pooled connections of the client.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(self, method, endpoint, **kwargs):
+        """
+        Make a request to the registry API and return the raw response.
 
         Args:
             method (str): HTTP method (GET, POST, etc.)
             endpoint (str): API endpoint
-            **kwargs: Additional arguments to pass to requests.request
+            **kwargs: Additional arguments to pass to Session.request
 
         Returns:
-            dict: JSON response from the API
+            requests.Response: The successful response
 
         Raises:
             RegistryClientError: If there's an error communicating with the registry
         """
         try:
-            response = requests.request(method, f"{self.registry_url}{endpoint}", **kwargs)
+            kwargs.setdefault("timeout", self.timeout)
+            response = self.session.request(method, f"{self.registry_url}{endpoint}", **kwargs)
             response.raise_for_status()
-            return response.json()
+            return response
         except RequestException as e:
             self.logger.error(f"Error making request to {endpoint}: {str(e)}")
             raise RegistryClientError(f"Failed to communicate with registry: {str(e)}")
+
+    def _make_request(self, method, endpoint, **kwargs):
+        """
+        Make a request to the registry API.
+
+        Args:
+            method (str): HTTP method (GET, POST, etc.)
+            endpoint (str): API endpoint
+            **kwargs: Additional arguments to pass to Session.request
+
+        Returns:
+            dict: JSON response from the API
+
+        Raises:
+            RegistryClientError: If there's an error communicating with the registry
+        """
+        response = self._request(method, endpoint, **kwargs)
+        try:
+            return response.json()
         except ValueError as e:
             self.logger.error(f"Error parsing JSON response from {endpoint}: {str(e)}")
             raise RegistryClientError(f"Invalid response from registry: {str(e)}")
 
-    def list_repositories(self):
+    def _paginate(self, endpoint, key, page_size=None):
+        """
+        Iterate over a paginated registry listing, following its Link headers.
+
+        Args:
+            endpoint (str): API endpoint of the first page
+            key (str): JSON key holding the entries of each page
+            page_size (int, optional): Entries per page (the `n` parameter)
+
+        Yields:
+            str: Entries of every page, in registry order
+
+        Raises:
+            RegistryClientError: If there's an error fetching a page
+        """
+        params = {"n": page_size or self.page_size}
+        while endpoint:
+            response = self._request("GET", endpoint, params=params)
+            try:
+                data = response.json()
+            except ValueError as e:
+                self.logger.error(f"Error parsing JSON response from {endpoint}: {str(e)}")
+                raise RegistryClientError(f"Invalid response from registry: {str(e)}")
+
+            yield from data.get(key) or []
+
+            # The next page URL already carries the n and last parameters
+            next_url = response.links.get("next", {}).get("url")
+            if next_url:
+                parts = urlsplit(next_url)
+                endpoint, params = f"{parts.path}?{parts.query}" if parts.query else parts.path, None
+            else:
+                endpoint = None
+
+    def iter_repositories(self, page_size=None):
+        """
+        Iterate over all repositories in the registry, one page at a time.
+
+        Args:
+            page_size (int, optional): Repositories per request, defaults to the client page size
+
+        Yields:
+            str: Repository names
+
+        Raises:
+            RegistryClientError: If there's an error listing repositories
+        """
+        try:
+            yield from self._paginate("/v2/_catalog", "repositories", page_size)
+        except RegistryClientError as e:
+            self.logger.error(f"Error listing repositories: {str(e)}")
+            raise RegistryClientError("Failed to list repositories") from e
+
+    def list_repositories(self, page_size=None):
         """
         List all repositories in the registry.
 
+        Args:
+            page_size (int, optional): Repositories per request, defaults to the client page size
+
         Returns:
             list: List of repository names
 
         Raises:
             RegistryClientError: If there's an error listing repositories
         """
+        return list(self.iter_repositories(page_size))
+
+    def iter_tags(self, repository, page_size=None):
+        """
+        Iterate over all tags of a given repository, one page at a time.
+
+        Args:
+            repository (str): Name of the repository
+            page_size (int, optional): Tags per request, defaults to the client page size
+
+        Yields:
+            str: Tags of the repository
+
+        Raises:
+            RegistryClientError: If there's an error listing tags
+        """
         try:
-            data = self._make_request("GET", "/v2/_catalog")
-            return data.get("repositories", [])
+            yield from self._paginate(f"/v2/{repository}/tags/list", "tags", page_size)
         except RegistryClientError as e:
-            self.logger.error(f"Error listing repositories: {str(e)}")
-            raise RegistryClientError("Failed to list repositories") from e
+            self.logger.error(f"Error listing tags for repository {repository}: {str(e)}")
+            raise RegistryClientError(f"Failed to list tags for repository {repository}") from e
 
-    def list_tags(self, repository):
+    def list_tags(self, repository, page_size=None):
         """
         List all tags for a given repository.
 
         Args:
             repository (str): Name of the repository
+            page_size (int, optional): Tags per request, defaults to the client page size
 
         Returns:
             list: List of tags for the repository
@@ -75,12 +215,70 @@ class RegistryClient:
         Raises:
             RegistryClientError: If there's an error listing tags
         """
+        return list(self.iter_tags(repository, page_size))
+
+    def _get_by_digest(self, endpoint, digest, **kwargs):
+        """
+        Fetch immutable content by digest, serving it from the cache when possible.
+
+        Args:
+            endpoint (str): API endpoint addressing the content by digest
+            digest (str): Digest of the content
+            **kwargs: Additional arguments to pass to Session.request
+
+        Returns:
+            dict: Parsed JSON content
+
+        Raises:
+            RegistryClientError: If there's an error fetching or parsing the content
+        """
+        cache = self.cache
+        data = None
+        if cache is not None:
+            try:
+                data = cache.get(digest)
+            except ValueError as e:
+                # A malformed digest can't be a cache key, but its content can still be fetched
+                self.logger.warning(f"Not caching {digest}: {str(e)}")
+                cache = None
+        if data is None:
+            data = self._request("GET", endpoint, **kwargs).content
+            if cache is not None:
+                cache.put(digest, data)
         try:
-            data = self._make_request("GET", f"/v2/{repository}/tags/list")
-            return data.get("tags", [])
-        except RegistryClientError as e:
-            self.logger.error(f"Error listing tags for repository {repository}: {str(e)}")
-            raise RegistryClientError(f"Failed to list tags for repository {repository}") from e
+            return json.loads(data)
+        except ValueError as e:
+            self.logger.error(f"Error parsing JSON content of {digest}: {str(e)}")
+            raise RegistryClientError(f"Invalid response from registry: {str(e)}")
+
+    def get_manifest(self, repository, tag):
+        """
+        Get the manifest of an image.
+
+        With a cache, the tag is revalidated with a HEAD request for its
+        Docker-Content-Digest and the manifest body is only downloaded when that
+        digest isn't cached yet, so unchanged tags cost one cheap request.
+
+        Args:
+            repository (str): Name of the repository
+            tag (str): Tag or digest of the image
+
+        Returns:
+            dict: The image manifest
+
+        Raises:
+            RegistryClientError: If there's an error getting the manifest
+        """
+        headers = {"Accept": MANIFEST_MEDIA_TYPE}
+        endpoint = f"/v2/{repository}/manifests/{tag}"
+        if self.cache is None:
+            return self._make_request("GET", endpoint, headers=headers)
+
+        digest = self._request("HEAD", endpoint, headers=headers).headers.get("Docker-Content-Digest")
+        if not digest:
+            # Registry doesn't report digests: fall back to a plain fetch
+            return self._make_request("GET", endpoint, headers=headers)
+        return self._get_by_digest(f"/v2/{repository}/manifests/{digest}", digest, headers=headers)
 
     def get_image_details(self, repository, tag):
         """
@@ -98,14 +296,13 @@ class RegistryClient:
         """
         try:
             # First, get the manifest
-            headers = {"Accept": "application/vnd.docker.distribution.manifest.v2+json"}
-            manifest = self._make_request("GET", f"/v2/{repository}/manifests/{tag}", headers=headers)
+            manifest = self.get_manifest(repository, tag)
             
             # Extract the config blob digest
             config_digest = manifest['config']['digest']
             
-            # Fetch the config blob
-            blob = self._make_request("GET", f"/v2/{repository}/blobs/{config_digest}")
+            # Fetch the config blob (immutable, so cached by digest)
+            blob = self._get_by_digest(f"/v2/{repository}/blobs/{config_digest}", config_digest)
             
             # Combine manifest and config information
             details = {
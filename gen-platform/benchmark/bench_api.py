@@ -0,0 +1,438 @@
+"""
+Load-test and benchmark harness for the GenSphere API service.
+
+Seeds a configurable number of synthetic agent cards, then drives a mixed
+read/write workload against /agent_card, /agent_card/{tag} and /agent_cards at a
+fixed concurrency. Reports throughput, p50/p95/p99 latency and memory, and stores
+the results as JSON so runs can be compared for regressions.
+
+The API can be a remote deployment (--target) or started locally, either inside
+this process or as a subprocess, on any storage backend (SQLite by default, so
+no Mongo container is needed).
+
+Examples:
+    python bench_api.py --cards 10000 --duration 30 --concurrency 64 --output run.json
+    python bench_api.py --mode subprocess --backend sqlite --mix read=80,write=20
+    python bench_api.py --target http://localhost:8000 --skip-seed --compare run.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import math
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("bench_api")
+logger.setLevel(logging.INFO)
+# Per-request client logs would drown the report and skew the client side of the measurement
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+
+# Operations of the mixed workload and their default weights
+DEFAULT_MIX = "read=70,write=20,lookup=5,search=4,list=1"
+OPERATIONS = ["read", "write", "lookup", "search", "list"]
+
+WORDS = [
+    "job", "research", "finance", "summary", "linkedin", "scraper", "market", "report",
+    "analysis", "agent", "crew", "lead", "sales", "news", "stock", "yahoo", "company",
+    "writer", "translator", "support", "ticket", "code", "review", "data", "pipeline",
+]
+
+def parse_mix(mix):
+    """
+    Parse a workload mix such as "read=70,write=30" into operation weights.
+    """
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        weights[name] = float(weight)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("The workload mix needs at least one operation with a positive weight")
+    return weights
+
+def card_id(index, registry="localhost:5001"):
+    return f"{registry}/bench/agent-{index:07d}:v1"
+
+def make_card(index, rng, io_fields=4):
+    """
+    Build a synthetic agent card payload shaped like the ones sent by gen-cli build.
+    """
+    description = " ".join(rng.choice(WORDS) for _ in range(12))
+    return {
+        "image_full_tag": card_id(index),
+        "agent_card": {
+            "author": f"author-{index % 97}",
+            "description": description,
+            "image": f"bench/agent-{index:07d}",
+            "tag": "v1",
+            "url": "https://gensphere.io",
+        },
+        "expected_inputs": {f"input_{n}": rng.choice(["str", "int", "list"]) for n in range(io_fields)},
+        "expected_output": {f"output_{n}": rng.choice(["str", "dict", "list"]) for n in range(io_fields)},
+        "build_date": datetime.datetime.now(datetime.UTC).isoformat(),
+    }
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "count": count,
+        "errors": errors,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": ms(sum(latencies) / count) if count else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]) if count else None,
+    }
+
+def read_rss_kb(pid="self"):
+    """
+    Current and peak resident set size of a process, in KB (Linux /proc only).
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["VmRSS"].split()[0]), int(fields["VmHWM"].split()[0])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+class MemorySampler:
+    """
+    Samples the RSS of the client and (when local) server processes during a run.
+    """
+
+    def __init__(self, server_pid=None, interval=0.5):
+        self.server_pid = server_pid
+        self.interval = interval
+        self.samples = {"client": [], "server": []}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss, _ = read_rss_kb()
+            if rss is not None:
+                self.samples["client"].append(rss)
+            if self.server_pid is not None:
+                rss, _ = read_rss_kb(self.server_pid)
+                if rss is not None:
+                    self.samples["server"].append(rss)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        report = {"client_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)}
+        for name, values in self.samples.items():
+            if values:
+                report[f"{name}_mean_rss_mb"] = round(sum(values) / len(values) / 1024, 2)
+                report[f"{name}_max_rss_mb"] = round(max(values) / 1024, 2)
+        if self.server_pid is not None:
+            _, peak = read_rss_kb(self.server_pid)
+            if peak is not None:
+                report["server_peak_rss_mb"] = round(peak / 1024, 2)
+        return report
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def storage_env(args):
+    # The service logs several INFO lines per request, which would be measured along with it
+    env = {"STORAGE_BACKEND": args.backend, "LOG_LEVEL": "WARNING"}
+    if args.backend == "sqlite":
+        env["SQLITE_PATH"] = args.sqlite_path
+    else:
+        env["MONGO_URI"] = args.mongo_uri
+    return env
+
+class LocalServer:
+    """
+    Runs api_service locally, either in a thread of this process or as a subprocess.
+    """
+
+    def __init__(self, mode, env):
+        self.mode = mode
+        self.env = env
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.pid = None
+        self._server = None
+        self._thread = None
+        self._process = None
+
+    def start(self):
+        if self.mode == "inprocess":
+            import uvicorn
+
+            os.environ.update(self.env)
+            sys.path.insert(0, API_DIR)
+            from api_service import app
+
+            # The root logger is already configured here, so LOG_LEVEL has no effect on api_service
+            logging.getLogger().setLevel(logging.WARNING)
+            self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+            self._thread = threading.Thread(target=self._server.run, daemon=True)
+            self._thread.start()
+        else:
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "api_service:app", "--host", "127.0.0.1",
+                 "--port", str(self.port), "--log-level", "warning"],
+                cwd=API_DIR,
+                env={**os.environ, **self.env},
+            )
+            self.pid = self._process.pid
+        self._wait_until_ready()
+        logger.info(f"API service ({self.mode}, {self.env['STORAGE_BACKEND']}) listening on {self.url}")
+
+    def _wait_until_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process is not None and self._process.poll() is not None:
+                raise RuntimeError(f"API service exited with code {self._process.returncode}")
+            try:
+                if httpx.get(f"{self.url}/agent_cards", params={"ids": "__ready__"}, timeout=1).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        raise RuntimeError(f"API service did not become ready within {timeout}s")
+
+    def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=10)
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait(timeout=10)
+
+async def seed(client, args, rng):
+    """
+    Seed the API with synthetic agent cards through the bulk ingest endpoint.
+    """
+    logger.info(f"Seeding {args.cards} agent cards in batches of {args.seed_batch}")
+    started = time.perf_counter()
+    starts = iter(range(0, args.cards, args.seed_batch))
+    failed = 0
+
+    async def sender():
+        nonlocal failed
+        # Each sender builds its next batch only once the previous one is sent, so at most
+        # seed_concurrency batches are in memory, whatever the number of cards
+        for start in starts:
+            batch = [make_card(index, rng, args.io_fields) for index in range(start, min(start + args.seed_batch, args.cards))]
+            response = await client.post("/agent_cards/bulk", json=batch)
+            response.raise_for_status()
+            failed += response.json().get("failed", 0)
+
+    await asyncio.gather(*(sender() for _ in range(args.seed_concurrency)))
+    elapsed = time.perf_counter() - started
+    logger.info(f"Seeded {args.cards} cards in {elapsed:.2f}s ({args.cards / elapsed:.0f} cards/s)")
+    return {"cards": args.cards, "failed": failed, "seconds": round(elapsed, 3), "cards_per_second": round(args.cards / elapsed, 2)}
+
+async def run_workload(client, args, rng):
+    """
+    Drive the mixed workload with a fixed number of concurrent workers.
+    """
+    operations = [name for name in args.mix if args.mix[name] > 0]
+    weights = [args.mix[name] for name in operations]
+    latencies = {name: [] for name in operations}
+    errors = {name: 0 for name in operations}
+
+    async def request(operation):
+        if operation == "read":
+            return await client.get(f"/agent_card/{card_id(rng.randrange(args.cards))}")
+        if operation == "write":
+            return await client.post("/agent_card", json=make_card(rng.randrange(args.cards), rng, args.io_fields))
+        if operation == "lookup":
+            ids = [card_id(rng.randrange(args.cards)) for _ in range(args.lookup_size)]
+            return await client.post("/agent_cards/lookup", json={"ids": ids})
+        if operation == "search":
+            return await client.get("/agent_cards", params={"q": rng.choice(WORDS), "limit": 50})
+        return await client.get("/agent_cards")
+
+    async def worker(deadline, remaining):
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            operation = rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await request(operation)
+                await response.aread()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[operation].append(time.perf_counter() - started)
+            else:
+                errors[operation] += 1
+
+    logger.info(f"Running workload {args.mix} at concurrency {args.concurrency} for "
+                f"{f'{args.requests} requests' if args.requests else f'{args.duration}s'}")
+    started = time.perf_counter()
+    deadline = started + (args.duration if not args.requests else float("inf"))
+    remaining = [args.requests] if args.requests else None
+    await asyncio.gather(*(worker(deadline, remaining) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    per_operation = {name: summarize(latencies[name], errors[name], elapsed) for name in operations}
+    overall = summarize([value for values in latencies.values() for value in values], sum(errors.values()), elapsed)
+    overall["seconds"] = round(elapsed, 3)
+    return per_operation, overall
+
+async def benchmark(args, base_url, server_pid):
+    rng = random.Random(args.random_seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        seed_report = None if args.skip_seed else await seed(client, args, rng)
+        sampler = MemorySampler(server_pid)
+        sampler.start()
+        try:
+            per_operation, overall = await run_workload(client, args, rng)
+        finally:
+            memory = sampler.stop()
+    return seed_report, per_operation, overall, memory
+
+def compare(results, baseline, tolerance):
+    """
+    Compare a run against a baseline run and list the regressions found.
+    """
+    regressions = []
+    for name, current in results["operations"].items():
+        previous = baseline.get("operations", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if current.get(metric) and previous.get(metric) and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {previous[metric]} -> {current[metric]}")
+        if previous.get("throughput_rps") and current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}.throughput_rps: {previous['throughput_rps']} -> {current['throughput_rps']}")
+    return regressions
+
+def print_report(results):
+    print(f"\n{'operation':<10} {'count':>8} {'errors':>7} {'rps':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(results["operations"].items()) + [("overall", results["overall"])]
+    for name, stats in rows:
+        fmt = lambda value: f"{value:9.2f}" if value is not None else f"{'-':>9}"
+        print(f"{name:<10} {stats['count']:>8} {stats['errors']:>7} {stats['throughput_rps']:>10.1f} "
+              f"{fmt(stats['p50_ms'])} {fmt(stats['p95_ms'])} {fmt(stats['p99_ms'])}")
+    print("\nmemory: " + ", ".join(f"{key}={value}" for key, value in results["memory"].items()))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GenSphere API service.")
+    parser.add_argument("--target", help="Base URL of a running API service; omit to start one locally")
+    parser.add_argument("--mode", choices=["inprocess", "subprocess"], default="inprocess",
+                        help="How to run the local API service when --target is not given")
+    parser.add_argument("--backend", choices=["sqlite", "mongo"], default="sqlite", help="Storage backend of the local API service")
+    parser.add_argument("--sqlite-path", help="SQLite database file (default: a fresh temporary file)")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/", help="MongoDB URI for the mongo backend")
+    parser.add_argument("--cards", type=int, default=1000, help="Number of synthetic agent cards to seed (1k-1M)")
+    parser.add_argument("--seed-batch", type=int, default=1000, help="Agent cards per bulk ingest request while seeding")
+    parser.add_argument("--seed-concurrency", type=int, default=4, help="Concurrent bulk ingest requests while seeding")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse cards seeded by a previous run")
+    parser.add_argument("--io-fields", type=int, default=4, help="Fields in each synthetic expected_inputs/expected_output")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Workload weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--lookup-size", type=int, default=20, help="Ids per bulk lookup request")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent in-flight requests")
+    parser.add_argument("--duration", type=float, default=30, help="Workload duration in seconds")
+    parser.add_argument("--requests", type=int, help="Run a fixed number of requests instead of a duration")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--random-seed", type=int, default=42, help="Seed for the synthetic data and workload")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression when comparing")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    server = None
+    if args.target:
+        base_url, server_pid = args.target.rstrip("/"), None
+    else:
+        if args.backend == "sqlite" and not args.sqlite_path:
+            args.sqlite_path = os.path.join(tempfile.mkdtemp(prefix="gensphere-bench-"), "bench.db")
+        server = LocalServer(args.mode, storage_env(args))
+        server.start()
+        base_url = server.url
+        server_pid = server.pid if args.mode == "subprocess" else None
+
+    try:
+        seed_report, per_operation, overall, memory = asyncio.run(benchmark(args, base_url, server_pid))
+    finally:
+        if server is not None:
+            server.stop()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+            "target": args.target or f"local-{args.mode}",
+            "backend": None if args.target else args.backend,
+            "cards": args.cards,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "seed": seed_report,
+        "operations": per_operation,
+        "overall": overall,
+        "memory": memory,
+    }
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.compare} (tolerance {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"- {regression}")
+            return 1
+        print(f"\nNo regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
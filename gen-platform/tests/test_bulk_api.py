@@ -0,0 +1,37 @@
+import os
+import pytest
+
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", ":memory:")
+
+from fastapi.testclient import TestClient
+import api_service
+from storage import SQLiteAgentCardStore
+
+def make_payload(image_full_tag):
+    return {
+        "image_full_tag": image_full_tag,
+        "agent_card": {"author": "alice", "description": "Researches job offers", "image": "jobs", "tag": "1", "url": "http://jobs"},
+        "expected_inputs": {"topic": "str"},
+        "expected_output": {"report": "str"},
+        "build_date": "2024-01-01T00:00:00+00:00",
+    }
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api_service, "store", SQLiteAgentCardStore(":memory:"))
+    return TestClient(api_service.app)
+
+def test_bulk_stores_the_valid_cards_of_a_batch_with_invalid_items(client):
+    response = client.post("/agent_cards/bulk", json=[
+        make_payload("r/a:1"), {"image_full_tag": "r/bad:1"}, 5, make_payload("r/c:1")])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["stored"], body["failed"]) == (2, 2)
+    assert [(result["id"], result["status"]) for result in body["results"]] == [
+        ("r/a:1", "created"), ("r/bad:1", "failed"), (None, "failed"), ("r/c:1", "created")]
+    assert "agent_card" in body["results"][1]["error"]
+    assert client.get("/agent_card/r/c:1").status_code == 200
+
+def test_bulk_of_nothing(client):
+    assert client.post("/agent_cards/bulk", json=[]).json()["stored"] == 0
@@ -0,0 +1,103 @@
+"""
+Conformance suite run against every agent card storage backend.
+"""
+
+import pytest
+from storage import MongoAgentCardStore, SQLiteAgentCardStore, StorageError
+
+def make_card(card_id, author="alice", description="Researches job offers", image=None):
+    return {
+        "_id": card_id,
+        "image_full_tag": card_id,
+        "agent_card": {"author": author, "description": description, "image": image or card_id.rsplit(":", 1)[0], "tag": "latest"},
+        "expected_inputs": {"topic": "str"},
+        "expected_output": {"report": "str"},
+        "build_date": "2024-01-01T00:00:00+00:00",
+    }
+
+@pytest.fixture(params=["sqlite", "sqlite-like", "mongo"])
+def store(request, monkeypatch):
+    if request.param == "mongo":
+        pymongo = pytest.importorskip("pymongo")
+        mongomock = pytest.importorskip("mongomock")
+        if pymongo.version_tuple >= (4, 9):
+            # mongomock 4.3 can't run the bulk writes of pymongo 4.9+, which the API pins
+            pytest.skip(f"mongomock {mongomock.__version__} doesn't support pymongo {pymongo.version}; "
+                        "run against a real MongoDB or install pymongo<4.9 to test the Mongo backend")
+        monkeypatch.setattr(pymongo, "MongoClient", mongomock.MongoClient)
+        store = MongoAgentCardStore("mongodb://localhost:27017/")
+    else:
+        store = SQLiteAgentCardStore(":memory:")
+        # Builds without FTS5 search with LIKE, which must match the same cards
+        store.fts_enabled = request.param == "sqlite"
+    yield store
+    store.close()
+
+def test_put_reports_created_then_updated(store):
+    assert store.put(make_card("r/a:1")) == "created"
+    assert store.put(make_card("r/a:1", author="bob")) == "updated"
+    assert store.get("r/a:1")["agent_card"]["author"] == "bob"
+
+def test_get_unknown_card_returns_none(store):
+    assert store.get("r/missing:1") is None
+
+def test_put_many_reports_each_card_in_order(store):
+    store.put(make_card("r/b:1"))
+    results = store.put_many([make_card("r/a:1"), make_card("r/b:1"), make_card("r/c:1")])
+    assert [(result["id"], result["status"]) for result in results] == [
+        ("r/a:1", "created"), ("r/b:1", "updated"), ("r/c:1", "created")]
+
+def test_put_many_stores_the_valid_cards_when_one_fails(store):
+    bad = make_card("r/bad:1")
+    bad["agent_card"]["author"] = object()
+    results = store.put_many([make_card("r/a:1"), bad, make_card("r/c:1")])
+    assert [result["status"] for result in results] == ["created", "failed", "created"]
+    assert results[1]["id"] == "r/bad:1" and results[1]["error"]
+    assert store.get("r/bad:1") is None
+    assert [card["_id"] for card in store.get_many(["r/a:1", "r/c:1"])] == ["r/a:1", "r/c:1"]
+
+def test_put_raises_storage_error_for_an_invalid_card(store):
+    bad = make_card("r/bad:1")
+    bad["agent_card"]["author"] = object()
+    with pytest.raises(StorageError):
+        store.put(bad)
+
+def test_put_many_of_nothing(store):
+    assert store.put_many([]) == []
+
+def test_get_many_keeps_the_requested_order(store):
+    store.put_many([make_card(f"r/{name}:1") for name in "abc"])
+    cards = store.get_many(["r/c:1", "r/missing:1", "r/a:1", "r/c:1", "r/b:1"])
+    assert [card["_id"] for card in cards] == ["r/c:1", "r/a:1", "r/b:1"]
+
+def test_list_all_is_ordered_by_id(store):
+    store.put_many([make_card(f"r/{name}:1") for name in "cab"])
+    assert [card["_id"] for card in store.list_all()] == ["r/a:1", "r/b:1", "r/c:1"]
+
+@pytest.mark.parametrize("query, expected", [
+    ("research", {"r/jobs:1"}),
+    ("RESEARCHES job", {"r/jobs:1"}),
+    ("alice", {"r/jobs:1", "r/news:1"}),
+    ("alice news", {"r/news:1"}),
+    ("earches", set()),
+    ("nothing", set()),
+    ("  ", set()),
+])
+def test_search_matches_every_term_as_a_word_prefix(store, query, expected):
+    store.put_many([
+        make_card("r/jobs:1", description="Researches job offers"),
+        make_card("r/news:1", description="Summarizes the news"),
+        make_card("r/other:1", author="bob", description="Plans trips"),
+    ])
+    assert {card["_id"] for card in store.search(query)} == expected
+
+def test_search_respects_the_limit(store):
+    store.put_many([make_card(f"r/agent{index}:1") for index in range(5)])
+    assert len(store.search("alice", limit=2)) == 2
+
+def test_catalog_entries(store):
+    store.put_catalog_entries([{"_id": "r/b:1", "size": 1}, {"_id": "r/a:1", "size": 2}])
+    store.put_catalog_entries([{"_id": "r/b:1", "size": 3}])
+    assert store.list_catalog() == [{"_id": "r/a:1", "size": 2}, {"_id": "r/b:1", "size": 3}]
+    store.delete_catalog_entries(["r/a:1"])
+    assert [entry["_id"] for entry in store.list_catalog()] == ["r/b:1"]